@@ -2,7 +2,7 @@
 
 from flask import Flask
 from flask_sqlalchemy import SQLAlchemy
-from flask_migrate import Migrate
+from flask_migrate import Migrate, upgrade
 from dotenv import load_dotenv
 import os
 import logging
@@ -15,7 +15,8 @@ logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
 db = SQLAlchemy()
-migrate = Migrate()
+# Absoluut pad, zodat de migraties ook gevonden worden als de app buiten backend/ gestart wordt
+migrate = Migrate(directory=os.path.join(os.path.dirname(os.path.dirname(__file__)), 'migrations'))
 
 def create_app():
     app = Flask(__name__)
@@ -24,9 +25,25 @@ def create_app():
     db.init_app(app)
     migrate.init_app(app, db)
 
+    from .metrics import init_metrics
+    init_metrics(app)
+
+    from .serialization import init_json
+    init_json(app)
+
+    from .routes import bp
+    app.register_blueprint(bp)
+
     with app.app_context():
-        from . import routes
-        db.create_all()
+        # Brengt nieuwe én bestaande databases naar de laatste revisie; db.create_all()
+        # voegt geen kolommen toe aan tabellen die al bestaan
+        upgrade()
+
+        from .jobs import init_search_jobs
+        init_search_jobs(app)
+
+        from .outreach import init_outreach
+        init_outreach(app)
 
     logger.info("Flask-applicatie succesvol geïnitialiseerd.")
     return app
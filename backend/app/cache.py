@@ -0,0 +1,274 @@
+# ai-contact-finder/backend/app/cache.py
+
+import os
+import json
+import time
+import sqlite3
+import hashlib
+import logging
+import threading
+from collections import OrderedDict, defaultdict
+
+logger = logging.getLogger(__name__)
+
+# Backend voor de responscache: 'sqlite' (standaard), 'memory' of 'none'
+CACHE_BACKEND = os.getenv("RESPONSE_CACHE_BACKEND", "sqlite")
+CACHE_PATH = os.getenv(
+    "RESPONSE_CACHE_PATH",
+    os.path.join(os.path.dirname(__file__), "database", "cache.sqlite")
+)
+CACHE_MAX_ENTRIES = int(os.getenv("RESPONSE_CACHE_MAX_ENTRIES", 50000))
+
+_MISSING = object()
+
+class CacheStats:
+    """Thread-safe hit/miss tellers per namespace."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._hits = defaultdict(int)
+        self._misses = defaultdict(int)
+
+    def record(self, namespace, hit):
+        with self._lock:
+            if hit:
+                self._hits[namespace] += 1
+            else:
+                self._misses[namespace] += 1
+
+    def snapshot(self):
+        with self._lock:
+            namespaces = set(self._hits) | set(self._misses)
+            return {
+                ns: {"hits": self._hits[ns], "misses": self._misses[ns]}
+                for ns in sorted(namespaces)
+            }
+
+class NullCache:
+    """Cache die niets bewaart; handig om caching uit te schakelen."""
+
+    def get(self, key):
+        return _MISSING
+
+    def set(self, key, value, ttl):
+        pass
+
+    def clear(self):
+        pass
+
+class MemoryCache:
+    """In-process LRU-cache met TTL per item."""
+
+    def __init__(self, max_entries=CACHE_MAX_ENTRIES):
+        self.max_entries = max_entries
+        self._lock = threading.Lock()
+        self._items = OrderedDict()
+
+    def get(self, key):
+        with self._lock:
+            item = self._items.get(key)
+            if item is None:
+                return _MISSING
+            expires_at, value = item
+            if expires_at < time.time():
+                del self._items[key]
+                return _MISSING
+            self._items.move_to_end(key)
+            return value
+
+    def set(self, key, value, ttl):
+        with self._lock:
+            self._items[key] = (time.time() + ttl, value)
+            self._items.move_to_end(key)
+            while len(self._items) > self.max_entries:
+                self._items.popitem(last=False)
+
+    def clear(self):
+        with self._lock:
+            self._items.clear()
+
+class SQLiteCache:
+    """
+    Persistente cache in een SQLite-bestand, zodat responses een herstart overleven.
+
+    Waarden worden als JSON opgeslagen. Bij overschrijding van `max_entries` worden
+    eerst verlopen items en daarna de items die het eerst verlopen verwijderd.
+    """
+
+    # Aantal schrijfacties tussen twee opruimrondes
+    EVICT_EVERY = 100
+
+    def __init__(self, path=CACHE_PATH, max_entries=CACHE_MAX_ENTRIES):
+        self.path = path
+        self.max_entries = max_entries
+        self._lock = threading.Lock()
+        self._writes = 0
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self._conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS response_cache ("
+            " key TEXT PRIMARY KEY,"
+            " value TEXT NOT NULL,"
+            " expires_at REAL NOT NULL)"
+        )
+        self._conn.execute(
+            "CREATE INDEX IF NOT EXISTS ix_response_cache_expires_at ON response_cache (expires_at)"
+        )
+
+    def get(self, key):
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT value, expires_at FROM response_cache WHERE key = ?", (key,)
+            ).fetchone()
+        if row is None or row[1] < time.time():
+            return _MISSING
+        return json.loads(row[0])
+
+    def set(self, key, value, ttl):
+        payload = json.dumps(value)
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO response_cache (key, value, expires_at) VALUES (?, ?, ?)",
+                (key, payload, time.time() + ttl)
+            )
+            self._writes += 1
+            if self._writes % self.EVICT_EVERY == 0:
+                self._evict()
+
+    def _evict(self):
+        self._conn.execute("DELETE FROM response_cache WHERE expires_at < ?", (time.time(),))
+        (count,) = self._conn.execute("SELECT COUNT(*) FROM response_cache").fetchone()
+        overflow = count - self.max_entries
+        if overflow > 0:
+            self._conn.execute(
+                "DELETE FROM response_cache WHERE key IN ("
+                " SELECT key FROM response_cache ORDER BY expires_at LIMIT ?)",
+                (overflow,)
+            )
+
+    def clear(self):
+        with self._lock:
+            self._conn.execute("DELETE FROM response_cache")
+
+class _Call:
+    def __init__(self):
+        self.event = threading.Event()
+        self.value = None
+        self.error = None
+
+class SingleFlight:
+    """
+    Voegt gelijktijdige aanroepen met dezelfde sleutel samen tot één uitvoering.
+
+    De eerste aanroeper voert `fn()` uit; wie tijdens die uitvoering met dezelfde sleutel
+    binnenkomt, wacht en krijgt hetzelfde resultaat (of dezelfde fout). Er wordt niets
+    bewaard nadat de uitvoering klaar is; combineer het daarvoor met de responscache.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._calls = {}
+
+    def do(self, key, fn):
+        with self._lock:
+            call = self._calls.get(key)
+            leader = call is None
+            if leader:
+                call = self._calls[key] = _Call()
+        if not leader:
+            call.event.wait()
+            if call.error is not None:
+                raise call.error
+            return call.value
+
+        try:
+            call.value = fn()
+        except Exception as e:
+            call.error = e
+            raise
+        finally:
+            with self._lock:
+                del self._calls[key]
+            call.event.set()
+        return call.value
+
+def _create_cache():
+    if CACHE_BACKEND == "none":
+        return NullCache()
+    if CACHE_BACKEND == "memory":
+        return MemoryCache()
+    try:
+        return SQLiteCache()
+    except Exception as e:
+        logger.error(f"Fout bij openen van responscache {CACHE_PATH}, val terug op geheugen: {e}")
+        return MemoryCache()
+
+_cache = None
+_cache_lock = threading.Lock()
+stats = CacheStats()
+
+def get_cache():
+    global _cache
+    if _cache is None:
+        with _cache_lock:
+            if _cache is None:
+                _cache = _create_cache()
+    return _cache
+
+def set_cache(cache):
+    """Vervangt de actieve cache, bijvoorbeeld door een MemoryCache of NullCache."""
+    global _cache
+    with _cache_lock:
+        _cache = cache
+
+def peek(namespace, *key_parts):
+    """Geeft de gecachete waarde terug zonder iets aan te roepen, of None; telt mee als hit/miss."""
+    try:
+        value = get_cache().get(make_key(namespace, *key_parts))
+    except Exception as e:
+        logger.error(f"Fout bij lezen uit responscache ({namespace}): {e}")
+        value = _MISSING
+    stats.record(namespace, hit=value is not _MISSING)
+    return None if value is _MISSING else value
+
+def store(namespace, key_parts, value, ttl):
+    try:
+        get_cache().set(make_key(namespace, *key_parts), value, ttl)
+    except Exception as e:
+        logger.error(f"Fout bij schrijven naar responscache ({namespace}): {e}")
+
+def make_key(namespace, *parts):
+    raw = json.dumps(parts, sort_keys=True, default=str)
+    return f"{namespace}:{hashlib.sha256(raw.encode('utf-8')).hexdigest()}"
+
+def cached_call(namespace, key_parts, ttl, fn, should_cache=bool):
+    """
+    Geeft de gecachete waarde voor `key_parts` terug, of roept `fn()` aan en cachet het resultaat.
+
+    Alleen resultaten waarvoor `should_cache(value)` waar is worden bewaard; standaard worden
+    lege resultaten (None, lege lijst of dict) overgeslagen, zodat een mislukte aanroep de
+    volgende keer opnieuw geprobeerd wordt.
+    """
+    cache = get_cache()
+    key = make_key(namespace, *key_parts)
+    try:
+        value = cache.get(key)
+    except Exception as e:
+        logger.error(f"Fout bij lezen uit responscache ({namespace}): {e}")
+        value = _MISSING
+    if value is not _MISSING:
+        stats.record(namespace, hit=True)
+        return value
+
+    stats.record(namespace, hit=False)
+    value = fn()
+    if should_cache(value):
+        try:
+            cache.set(key, value, ttl)
+        except Exception as e:
+            logger.error(f"Fout bij schrijven naar responscache ({namespace}): {e}")
+    return value
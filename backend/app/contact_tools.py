@@ -1,50 +1,80 @@
 # ai-contact-finder/backend/app/contact_tools.py
 
 import logging
-import requests
-from twilio.rest import Client
-from config.settings import (
-    TWILIO_SID,
-    TWILIO_AUTH_TOKEN,
-    TWILIO_PHONE_NUMBER,
-    LINKEDIN_API_KEY,
-    TWITTER_API_KEY,
-    TELEGRAM_API_KEY
-)
+import threading
+from config.settings import get_secret
+from .http_client import get_twilio_http_client
+from .records import CompanyRecord
+from .metrics import timed
 
 # Setup logging
 logger = logging.getLogger(__name__)
 
-# Initialiseren van Twilio Client
-try:
-    client = Client(TWILIO_SID, TWILIO_AUTH_TOKEN)
-except Exception as e:
-    logger.error(f"Fout bij initialiseren van Twilio Client: {e}")
-    client = None
+# Ondersteunde contactmethodes en het kanaal (de rate limiter) waarlangs ze verstuurd worden
+METHOD_CHANNELS = {
+    'email': 'email',
+    'whatsapp': 'twilio',
+    'call': 'twilio',
+    'sms': 'twilio',
+    'contact_form': 'web',
+    'live_chat': 'web',
+    'linkedin': 'linkedin',
+    'twitter': 'twitter',
+    'telegram': 'telegram',
+}
+CONTACT_METHODS = frozenset(METHOD_CHANNELS)
 
-def initiate_contact(company: dict, method: str):
+_twilio_client = None
+_twilio_credentials = None
+_twilio_lock = threading.Lock()
+
+def get_twilio_client():
+    """
+    Geeft de gedeelde Twilio Client terug, of None als die niet aangemaakt kan worden.
+
+    De client (en het twilio-pakket) wordt pas bij het eerste bericht geladen, zodat
+    processen die alleen scrapen Twilio nooit importeren. Na `reload_secrets()` met
+    andere inloggegevens wordt automatisch een nieuwe client gebouwd.
+    """
+    global _twilio_client, _twilio_credentials
+    credentials = (get_secret("TWILIO_SID"), get_secret("TWILIO_AUTH_TOKEN"))
+    if _twilio_client is not None and credentials == _twilio_credentials:
+        return _twilio_client
+    with _twilio_lock:
+        if _twilio_client is None or credentials != _twilio_credentials:
+            try:
+                from twilio.rest import Client
+                _twilio_client = Client(*credentials, http_client=get_twilio_http_client())
+            except Exception as e:
+                logger.error(f"Fout bij initialiseren van Twilio Client: {e}")
+                _twilio_client = None
+            _twilio_credentials = credentials
+    return _twilio_client
+
+def initiate_contact(company: CompanyRecord, method: str):
     method = method.lower()
-    logger.info(f"Initiëren van contact via {method} voor bedrijf {company.get('name')}")
+    logger.info(f"Initiëren van contact via {method} voor bedrijf {company.name}")
     
     if method == 'email':
-        send_email(company.get('contact'))
+        send_email(company.contact)
     elif method == 'whatsapp':
-        send_whatsapp(company.get('contact'))
+        send_whatsapp(company.contact)
     elif method == 'call':
-        make_call(company.get('contact'))
+        make_call(company.contact)
     elif method in {'contact_form', 'live_chat'}:
-        open_contact_form(company.get('live_chat_url') or company.get('contact_form_url'))
+        open_contact_form(company.live_chat_url or company.contact_form_url)
     elif method == 'linkedin':
-        send_linkedin_message(company.get('linkedin_profile'))
+        send_linkedin_message(company.linkedin_profile)
     elif method == 'twitter':
-        send_twitter_dm(company.get('twitter_handle'))
+        send_twitter_dm(company.twitter_handle)
     elif method == 'sms':
-        send_sms(company.get('contact'))  # Zorg ervoor dat 'contact' het telefoonnummer bevat
+        send_sms(company.contact)  # Zorg ervoor dat 'contact' het telefoonnummer bevat
     elif method == 'telegram':
-        send_telegram_message(company.get('telegram_handle'))
+        send_telegram_message(company.telegram_handle)
     else:
         raise ValueError(f"Onbekende contactmethode: {method}")
 
+@timed("contact_email")
 def send_email(email: str):
     if not email:
         raise ValueError("Geen e-mailadres beschikbaar.")
@@ -52,16 +82,18 @@ def send_email(email: str):
     # Implementatie voor het verzenden van een e-mail
     pass
 
+@timed("contact_whatsapp")
 def send_whatsapp(number: str):
     if not number:
         raise ValueError("Geen WhatsApp-nummer beschikbaar.")
+    client = get_twilio_client()
     if not client:
         raise ValueError("Twilio Client is niet geïnitialiseerd.")
     
     try:
         message = client.messages.create(
             body="Hallo, wij bieden IT-diensten aan die uw bedrijf kunnen helpen...",
-            from_='whatsapp:' + TWILIO_PHONE_NUMBER,
+            from_='whatsapp:' + get_secret("TWILIO_PHONE_NUMBER"),
             to='whatsapp:' + number
         )
         logger.info(f"WhatsApp-bericht verzonden naar {number}: SID {message.sid}")
@@ -69,16 +101,18 @@ def send_whatsapp(number: str):
         logger.error(f"Fout bij verzenden van WhatsApp-bericht naar {number}: {e}")
         raise
 
+@timed("contact_call")
 def make_call(number: str):
     if not number:
         raise ValueError("Geen telefoonnummer beschikbaar.")
+    client = get_twilio_client()
     if not client:
         raise ValueError("Twilio Client is niet geïnitialiseerd.")
     
     try:
         call = client.calls.create(
             url='http://demo.twilio.com/docs/voice.xml',
-            from_=TWILIO_PHONE_NUMBER,
+            from_=get_secret("TWILIO_PHONE_NUMBER"),
             to=number
         )
         logger.info(f"Telefoongesprek gestart naar {number}: Call SID {call.sid}")
@@ -86,16 +120,18 @@ def make_call(number: str):
         logger.error(f"Fout bij maken van telefoongesprek naar {number}: {e}")
         raise
 
+@timed("contact_sms")
 def send_sms(number: str):
     if not number:
         raise ValueError("Geen SMS-nummer beschikbaar.")
+    client = get_twilio_client()
     if not client:
         raise ValueError("Twilio Client is niet geïnitialiseerd.")
     
     try:
         message = client.messages.create(
             body="Hallo, wij bieden IT-diensten aan die uw bedrijf kunnen helpen...",
-            from_=TWILIO_PHONE_NUMBER,
+            from_=get_secret("TWILIO_PHONE_NUMBER"),
             to=number
         )
         logger.info(f"SMS verzonden naar {number}: SID {message.sid}")
@@ -103,6 +139,7 @@ def send_sms(number: str):
         logger.error(f"Fout bij verzenden van SMS naar {number}: {e}")
         raise
 
+@timed("contact_linkedin")
 def send_linkedin_message(profile_url: str):
     if not profile_url:
         raise ValueError("Geen LinkedIn profiel URL beschikbaar.")
@@ -110,6 +147,7 @@ def send_linkedin_message(profile_url: str):
     # Implementatie voor het sturen van een LinkedIn bericht via de API
     pass
 
+@timed("contact_twitter")
 def send_twitter_dm(twitter_handle: str):
     if not twitter_handle:
         raise ValueError("Geen Twitter handle beschikbaar.")
@@ -117,6 +155,7 @@ def send_twitter_dm(twitter_handle: str):
     # Implementatie voor het sturen van een Twitter DM via de API
     pass
 
+@timed("contact_telegram")
 def send_telegram_message(telegram_handle: str):
     if not telegram_handle:
         raise ValueError("Geen Telegram handle beschikbaar.")
@@ -124,6 +163,7 @@ def send_telegram_message(telegram_handle: str):
     # Implementatie voor het sturen van een Telegram bericht via de API
     pass
 
+@timed("contact_form")
 def open_contact_form(url: str):
     if not url:
         raise ValueError("Geen contactformulier of live chat URL beschikbaar.")
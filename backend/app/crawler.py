@@ -0,0 +1,150 @@
+# ai-contact-finder/backend/app/crawler.py
+
+import os
+import time
+import logging
+from collections import namedtuple
+from urllib.parse import urlparse, urldefrag
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+from .http_client import fetch_page, host_slot
+from .extraction import extract_contact_links
+from .host_health import health
+
+logger = logging.getLogger(__name__)
+
+# Budget per domein: maximaal aantal pagina's (inclusief de landingspagina),
+# maximale tijd in seconden en het aantal pagina's dat tegelijk opgehaald wordt
+CRAWL_MAX_PAGES = int(os.getenv("SCRAPER_CRAWL_MAX_PAGES", 4))
+CRAWL_TIME_BUDGET = float(os.getenv("SCRAPER_CRAWL_TIME_BUDGET", 15))
+CRAWL_WORKERS = int(os.getenv("SCRAPER_CRAWL_WORKERS", 3))
+
+CONTACT_FIELDS = (
+    "contact_form_url",
+    "linkedin_profile",
+    "twitter_handle",
+    "telegram_handle",
+    "live_chat_url",
+)
+
+def normalize_url(url):
+    """Normaliseert een URL voor deduplicatie: zonder fragment en afsluitende slash."""
+    url, _ = urldefrag(url)
+    return url.rstrip("/")
+
+def _site_host(url):
+    host = (urlparse(url).hostname or "").lower()
+    return host[4:] if host.startswith("www.") else host
+
+def site_key(url):
+    """
+    Sleutel waaronder een website gedeeld wordt: host zonder www, poort en pad, zonder
+    schema en afsluitende slash. Zo delen http://www.x.nl/ en https://x.nl één resultaat.
+    """
+    parsed = urlparse(normalize_url(url.strip()))
+    port = f":{parsed.port}" if parsed.port else ""
+    query = f"?{parsed.query}" if parsed.query else ""
+    return f"{_site_host(url)}{port}{parsed.path.rstrip('/')}{query}"
+
+# Resultaat van crawl_site; `not_modified` betekent dat de landingspagina een 304 gaf
+CrawlResult = namedtuple("CrawlResult", ["found", "etag", "last_modified", "not_modified"])
+
+def _fetch_page(url, timeout, etag=None, last_modified=None):
+    # Bekende dode of trage hosts direct overslaan (HostUnavailable)
+    host = _site_host(url)
+    health.check(host)
+    with host_slot(url):
+        start = time.monotonic()
+        try:
+            page = fetch_page(url, timeout=health.timeout(host, timeout), etag=etag,
+                              last_modified=last_modified)
+        except Exception as e:
+            health.record_failure(host, e)
+            raise
+        health.record_success(host, time.monotonic() - start)
+    candidates = []
+    found = extract_contact_links(page.html, url, candidates=candidates) if page.html else {}
+    return page, found, candidates
+
+def crawl_contact_links(url, max_pages=None, time_budget=None):
+    """
+    Zoekt contactlinks op de landingspagina en op waarschijnlijke contactpagina's van hetzelfde domein.
+
+    Returns:
+        dict: De gevonden contactvelden; zie `crawl_site`.
+    """
+    return crawl_site(url, max_pages=max_pages, time_budget=time_budget).found
+
+def crawl_site(url, max_pages=None, time_budget=None, etag=None, last_modified=None):
+    """
+    Zoekt contactlinks op de landingspagina en op waarschijnlijke contactpagina's van hetzelfde domein.
+
+    De landingspagina wordt altijd opgehaald; fouten daarbij worden doorgegeven, net als
+    HostUnavailable voor hosts die volgens `host_health` onbereikbaar zijn. Met `etag` of
+    `last_modified` gebeurt dat conditioneel, en bij een 304 wordt niet verder gecrawld. Daarna
+    worden interne links die op een contact- of over-ons-pagina lijken gelijktijdig opgehaald,
+    binnen het pagina- en tijdbudget van het domein. Elke URL wordt maar één keer bezocht en het
+    crawlen stopt zodra alle velden gevonden zijn. Waarden van de landingspagina gaan voor.
+
+    Args:
+        url (str): De website van het bedrijf.
+        max_pages (int): Maximaal aantal pagina's, inclusief de landingspagina (standaard `CRAWL_MAX_PAGES`).
+        time_budget (float): Maximale tijd in seconden (standaard `CRAWL_TIME_BUDGET`).
+        etag (str): ETag van de vorige keer dat de landingspagina opgehaald werd.
+        last_modified (str): Last-Modified van de vorige keer.
+
+    Returns:
+        CrawlResult: De gevonden contactvelden en de validators van de landingspagina.
+    """
+    max_pages = CRAWL_MAX_PAGES if max_pages is None else max_pages
+    time_budget = CRAWL_TIME_BUDGET if time_budget is None else time_budget
+    deadline = time.monotonic() + time_budget
+
+    page, found, candidates = _fetch_page(url, min(10, time_budget), etag, last_modified)
+    if page.status == 304:
+        return CrawlResult({}, page.etag, page.last_modified, True)
+    result = CrawlResult(found, page.etag, page.last_modified, False)
+    visited = {normalize_url(url)}
+    host = _site_host(url)
+
+    queue = []
+    for candidate in candidates:
+        normalized = normalize_url(candidate)
+        if normalized in visited or _site_host(candidate) != host:
+            continue
+        if urlparse(candidate).scheme not in ("http", "https"):
+            continue
+        visited.add(normalized)
+        queue.append(candidate)
+    queue = queue[:max(max_pages - 1, 0)]
+    if not queue or all(field in found for field in CONTACT_FIELDS):
+        return result
+
+    executor = ThreadPoolExecutor(max_workers=min(CRAWL_WORKERS, len(queue)), thread_name_prefix="crawl")
+    try:
+        pending = {}
+        for page_url in queue:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            pending[executor.submit(_fetch_page, page_url, min(10, remaining))] = page_url
+
+        while pending:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                logger.info(f"Crawlbudget verbruikt voor {host}")
+                break
+            done, _ = wait(pending, timeout=remaining, return_when=FIRST_COMPLETED)
+            for future in done:
+                page_url = pending.pop(future)
+                try:
+                    _, page_found, _ = future.result()
+                except Exception as e:
+                    logger.info(f"Fout bij crawlen van {page_url}: {e}")
+                    continue
+                for field, value in page_found.items():
+                    found.setdefault(field, value)
+            if all(field in found for field in CONTACT_FIELDS):
+                break
+    finally:
+        executor.shutdown(wait=False, cancel_futures=True)
+    return result
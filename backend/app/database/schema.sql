@@ -1,19 +1,54 @@
 CREATE TABLE company (
     id INTEGER PRIMARY KEY AUTOINCREMENT,
+    place_id VARCHAR(255),
     name VARCHAR(100) NOT NULL,
     contact VARCHAR(100),
     contact_form_url VARCHAR(255),
     linkedin_profile VARCHAR(255),
     twitter_handle VARCHAR(100),
     telegram_handle VARCHAR(100),
-    live_chat_url VARCHAR(255)
+    live_chat_url VARCHAR(255),
+    website VARCHAR(255),
+    website_etag VARCHAR(255),
+    website_last_modified VARCHAR(64),
+    content_hash VARCHAR(64),
+    last_enriched_at DATETIME,
+    city VARCHAR(100),
+    industry VARCHAR(100)
 );
 
+CREATE UNIQUE INDEX ix_company_place_id ON company (place_id);
+CREATE INDEX ix_company_name ON company (name);
+CREATE INDEX ix_company_last_enriched_at ON company (last_enriched_at);
+CREATE INDEX ix_company_city_industry_id ON company (city, industry, id);
+CREATE INDEX ix_company_city_id ON company (city, id);
+CREATE INDEX ix_company_industry_id ON company (industry, id);
+
 CREATE TABLE contact (
     id INTEGER PRIMARY KEY AUTOINCREMENT,
     company_id INTEGER NOT NULL,
     method VARCHAR(50) NOT NULL,
     status VARCHAR(50) NOT NULL,
+    batch_id VARCHAR(32),
+    error TEXT,
     timestamp DATETIME DEFAULT CURRENT_TIMESTAMP,
     FOREIGN KEY (company_id) REFERENCES company(id)
 );
+
+CREATE INDEX ix_contact_batch_id ON contact (batch_id);
+
+CREATE TABLE search_job (
+    id VARCHAR(32) PRIMARY KEY,
+    status VARCHAR(20) NOT NULL,
+    params TEXT NOT NULL,
+    processed INTEGER NOT NULL DEFAULT 0,
+    total INTEGER,
+    results TEXT,
+    error TEXT,
+    trace_id VARCHAR(64),
+    timing TEXT,
+    worker_id VARCHAR(128),
+    heartbeat_at DATETIME,
+    created_at DATETIME DEFAULT CURRENT_TIMESTAMP,
+    updated_at DATETIME DEFAULT CURRENT_TIMESTAMP
+);
@@ -0,0 +1,179 @@
+# ai-contact-finder/backend/app/export.py
+
+import io
+import os
+import csv
+import logging
+from datetime import datetime
+from itertools import islice
+from . import db
+from .models import Company, Contact
+from .storage import filter_companies
+from .serialization import dumps
+from .metrics import stage
+
+logger = logging.getLogger(__name__)
+
+# Aantal rijen dat per keer uit de database gehaald en als één blok weggeschreven wordt
+EXPORT_BATCH_SIZE = int(os.getenv("EXPORT_BATCH_SIZE", 1000))
+
+# Exporteerbare tabellen; alle kolommen worden in tabelvolgorde geëxporteerd
+EXPORT_TABLES = {
+    'companies': Company,
+    'contacts': Contact,
+}
+EXPORT_MIMETYPES = {
+    'csv': 'text/csv',
+    'ndjson': 'application/x-ndjson',
+    'parquet': 'application/vnd.apache.parquet',
+}
+# Tekens waarmee een spreadsheet een CSV-cel als formule leest (zie de OWASP-richtlijn over CSV-injectie)
+CSV_FORMULA_PREFIXES = ('=', '+', '-', '@', '\t', '\r')
+
+def table_columns(table):
+    return [column.key for column in EXPORT_TABLES[table].__table__.columns]
+
+def parquet_available():
+    """Parquet vereist het optionele pakket pyarrow."""
+    try:
+        import pyarrow  # noqa: F401
+        return True
+    except ImportError:
+        return False
+
+def _filtered_query(table, columns, filters):
+    model = EXPORT_TABLES[table]
+    query = db.session.query(*[getattr(model, column) for column in columns])
+    if table == 'companies':
+        query = filter_companies(query, filters.get('city'), filters.get('industry'),
+                                 filters.get('name'), filters.get('has', ()))
+    else:
+        for column in ('company_id', 'method', 'status', 'batch_id'):
+            if filters.get(column) is not None:
+                query = query.filter(getattr(Contact, column) == filters[column])
+        if filters.get('since') is not None:
+            query = query.filter(Contact.timestamp >= filters['since'])
+    return query.order_by(model.id)
+
+def _iter_batches(table, columns, filters):
+    # yield_per haalt de rijen met een server-side cursor per blok op, zodat het
+    # geheugengebruik niet met de grootte van de tabel meegroeit
+    rows = iter(_filtered_query(table, columns, filters).yield_per(EXPORT_BATCH_SIZE))
+    total = 0
+    while True:
+        with stage("db_export"):
+            batch = list(islice(rows, EXPORT_BATCH_SIZE))
+        if not batch:
+            break
+        total += len(batch)
+        yield batch
+    logger.info(f"Export van {table} afgerond: {total} rijen")
+
+def _csv_value(value):
+    if value is None:
+        return ''
+    if isinstance(value, datetime):
+        return value.isoformat()
+    # Gescrapete tekst kan met een formule beginnen; een apostrof laat de spreadsheet het als tekst tonen
+    if isinstance(value, str) and value.startswith(CSV_FORMULA_PREFIXES):
+        return "'" + value
+    return value
+
+def _iter_csv(columns, batches):
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow(columns)
+    yield buffer.getvalue()
+    for batch in batches:
+        buffer.seek(0)
+        buffer.truncate()
+        writer.writerows([_csv_value(value) for value in row] for row in batch)
+        yield buffer.getvalue()
+
+def _iter_ndjson(columns, batches):
+    for batch in batches:
+        yield "".join(dumps(dict(zip(columns, row))) + "\n" for row in batch)
+
+class _ChunkSink:
+    """Bestandsachtig doel voor de ParquetWriter dat de geschreven bytes per blok doorgeeft."""
+
+    def __init__(self):
+        self._chunks = []
+        self._position = 0
+        self.closed = False
+
+    def write(self, data):
+        self._chunks.append(bytes(data))
+        self._position += len(data)
+        return len(data)
+
+    def tell(self):
+        return self._position
+
+    def flush(self):
+        pass
+
+    def close(self):
+        self.closed = True
+
+    def drain(self):
+        data = b"".join(self._chunks)
+        self._chunks.clear()
+        return data
+
+def _parquet_schema(table, columns):
+    import pyarrow as pa
+    model_columns = EXPORT_TABLES[table].__table__.columns
+    types = []
+    for column in columns:
+        python_type = model_columns[column].type.python_type
+        if python_type is int:
+            types.append(pa.int64())
+        elif python_type is datetime:
+            types.append(pa.timestamp("us"))
+        else:
+            types.append(pa.string())
+    return pa.schema(list(zip(columns, types)))
+
+def _iter_parquet(table, columns, batches):
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+    schema = _parquet_schema(table, columns)
+    sink = _ChunkSink()
+    writer = pq.ParquetWriter(sink, schema)
+    try:
+        # Elk blok rijen wordt een eigen row group
+        for batch in batches:
+            arrays = [pa.array(values, type=field.type) for values, field in zip(zip(*batch), schema)]
+            writer.write_table(pa.Table.from_arrays(arrays, schema=schema))
+            yield sink.drain()
+    finally:
+        writer.close()
+    yield sink.drain()
+
+def iter_export(table, export_format, fields=None, filters=None):
+    """
+    Streamt een tabel als CSV, NDJSON of Parquet, in blokken van `EXPORT_BATCH_SIZE` rijen.
+
+    De rijen worden op id gesorteerd en met een server-side cursor opgehaald; er staat
+    nooit meer dan één blok in het geheugen. Moet binnen een app context (bij een
+    Flask-response via `stream_with_context`) geconsumeerd worden.
+
+    Args:
+        table (str): 'companies' of 'contacts'.
+        export_format (str): 'csv', 'ndjson' of 'parquet' (vereist pyarrow).
+        fields (list): Optionele deelverzameling van de kolommen; standaard alle kolommen.
+        filters (dict): Voor companies `city`, `industry`, `name` en `has` (zie GET /companies),
+            voor contacts `company_id`, `method`, `status`, `batch_id` en `since` (datetime).
+
+    Returns:
+        generator: Stukken str (CSV, NDJSON) of bytes (Parquet). In CSV krijgen tekstwaarden
+            die met een van `CSV_FORMULA_PREFIXES` beginnen een apostrof ervoor.
+    """
+    columns = list(fields or table_columns(table))
+    batches = _iter_batches(table, columns, filters or {})
+    if export_format == 'csv':
+        return _iter_csv(columns, batches)
+    if export_format == 'ndjson':
+        return _iter_ndjson(columns, batches)
+    return _iter_parquet(table, columns, batches)
@@ -0,0 +1,147 @@
+# ai-contact-finder/backend/app/extraction.py
+
+import os
+import re
+import logging
+from html.parser import HTMLParser
+from urllib.parse import urljoin
+
+logger = logging.getLogger(__name__)
+
+try:
+    import lxml.html
+    from lxml import etree
+except ImportError:  # lxml is optioneel; de stdlib-tokenizer werkt altijd
+    lxml = None
+
+# Voorgecompileerde matchers per categorie, toegepast op de href in kleine letters.
+# Een anker dat op geen enkele categorie lijkt wordt met één regex overgeslagen.
+_ANY_MATCH = re.compile(r"contact|linkedin\.com|twitter\.com|t\.me|telegram\.me|live-?chat")
+_CONTACT = re.compile(r"contact")
+_FORM = re.compile(r"form")
+_LINKEDIN = re.compile(r"linkedin\.com")
+_TWITTER = re.compile(r"twitter\.com")
+_TELEGRAM = re.compile(r"t\.me|telegram\.me")
+_LIVE_CHAT = re.compile(r"live-?chat")
+
+# Interne links die waarschijnlijk naar een contact- of over-ons-pagina leiden
+_CRAWL_HINT = re.compile(
+    r"contact|over-?ons|about|klantenservice|bereikbaarheid|service|support|impressum|team"
+)
+
+def classify_link(href, get_text, base_url, found, candidates=None):
+    """
+    Werkt `found` bij met de categorieën waar `href` onder valt.
+
+    `get_text` wordt alleen aangeroepen als de ankertekst nodig is (voor het
+    contactformulier). Net als voorheen wint de laatste match per categorie.
+    Als `candidates` een lijst is, worden links die op een contactpagina lijken
+    daaraan toegevoegd.
+    """
+    lower_href = href.lower()
+    if candidates is not None and _CRAWL_HINT.search(lower_href):
+        candidates.append(urljoin(base_url, href))
+    if not _ANY_MATCH.search(lower_href):
+        return
+    absolute = None
+    if _CONTACT.search(lower_href) and (_FORM.search(lower_href) or "contact" in get_text().lower()):
+        absolute = urljoin(base_url, href)
+        found["contact_form_url"] = absolute
+    if _LINKEDIN.search(lower_href):
+        absolute = absolute or urljoin(base_url, href)
+        found["linkedin_profile"] = absolute
+    if _TWITTER.search(lower_href):
+        absolute = absolute or urljoin(base_url, href)
+        found["twitter_handle"] = absolute
+    if _TELEGRAM.search(lower_href):
+        absolute = absolute or urljoin(base_url, href)
+        found["telegram_handle"] = absolute
+    if _LIVE_CHAT.search(lower_href):
+        absolute = absolute or urljoin(base_url, href)
+        found["live_chat_url"] = absolute
+
+class _AnchorTokenizer(HTMLParser):
+    """Streaming tokenizer die alleen naar <a href>-tags en hun tekst kijkt."""
+
+    def __init__(self, base_url, candidates=None):
+        super().__init__(convert_charrefs=True)
+        self.base_url = base_url
+        self.candidates = candidates
+        self.found = {}
+        self._href = None
+        self._text = []
+
+    def _finish_anchor(self):
+        if self._href is not None:
+            text = "".join(self._text)
+            classify_link(self._href, lambda: text, self.base_url, self.found, self.candidates)
+        self._href = None
+        self._text = []
+
+    def handle_starttag(self, tag, attrs):
+        if tag != "a":
+            return
+        self._finish_anchor()
+        for name, value in attrs:
+            if name == "href" and value is not None:
+                self._href = value
+                break
+
+    def handle_endtag(self, tag):
+        if tag == "a":
+            self._finish_anchor()
+
+    def handle_data(self, data):
+        if self._href is not None:
+            self._text.append(data)
+
+    def close(self):
+        super().close()
+        self._finish_anchor()
+
+def extract_links_htmlparser(html, base_url, candidates=None):
+    tokenizer = _AnchorTokenizer(base_url, candidates)
+    tokenizer.feed(html)
+    tokenizer.close()
+    return tokenizer.found
+
+def extract_links_lxml(html, base_url, candidates=None):
+    try:
+        doc = lxml.html.fromstring(html)
+    except ValueError:
+        # Strings met een XML-encodingdeclaratie moeten als bytes geparsed worden
+        doc = lxml.html.fromstring(html.encode("utf-8"))
+    except etree.ParserError:
+        return {}
+    found = {}
+    for anchor in doc.iter("a"):
+        href = anchor.get("href")
+        if href is not None:
+            classify_link(href, anchor.text_content, base_url, found, candidates)
+    return found
+
+ENGINES = {"htmlparser": extract_links_htmlparser}
+if lxml is not None:
+    ENGINES["lxml"] = extract_links_lxml
+
+DEFAULT_ENGINE = os.getenv("LINK_EXTRACTOR", "lxml" if lxml is not None else "htmlparser")
+
+def extract_contact_links(html, base_url, engine=None, candidates=None):
+    """
+    Zoekt in één doorgang contactformulier-, LinkedIn-, Twitter-, Telegram- en live chat-links.
+
+    Args:
+        html (str): De HTML van de pagina.
+        base_url (str): De URL van de pagina, om relatieve links op te lossen.
+        engine (str): 'lxml' of 'htmlparser'; standaard `LINK_EXTRACTOR` of lxml indien beschikbaar.
+        candidates (list): Optioneel; hierin worden links naar mogelijke contactpagina's verzameld.
+
+    Returns:
+        dict: Alleen de gevonden categorieën, met absolute URLs.
+    """
+    name = engine or DEFAULT_ENGINE
+    extractor = ENGINES.get(name)
+    if extractor is None:
+        logger.warning(f"Onbekende link-extractor '{name}', val terug op htmlparser.")
+        extractor = extract_links_htmlparser
+    return extractor(html, base_url, candidates)
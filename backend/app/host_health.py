@@ -0,0 +1,183 @@
+# ai-contact-finder/backend/app/host_health.py
+
+import os
+import time
+import socket
+import logging
+import threading
+import requests
+from collections import OrderedDict
+from urllib3.exceptions import MaxRetryError, ReadTimeoutError, ConnectTimeoutError, NewConnectionError
+from .cache import peek, store
+from .metrics import Counter, register
+
+logger = logging.getLogger(__name__)
+
+# Aantal opeenvolgende fouten waarna een host wordt overgeslagen, en de (verdubbelende) wachttijd
+BREAKER_THRESHOLD = int(os.getenv("HOST_BREAKER_THRESHOLD", 3))
+BREAKER_COOLDOWN = float(os.getenv("HOST_BREAKER_COOLDOWN", 300))
+BREAKER_MAX_COOLDOWN = float(os.getenv("HOST_BREAKER_MAX_COOLDOWN", 6 * 3600))
+
+# Hoe lang een host na één fout van deze soort als onbereikbaar geldt (seconden)
+NEGATIVE_TTLS = {
+    "dns": int(os.getenv("HOST_NEGATIVE_TTL_DNS", 24 * 3600)),
+    "refused": int(os.getenv("HOST_NEGATIVE_TTL_REFUSED", 3600)),
+    "timeout": int(os.getenv("HOST_NEGATIVE_TTL_TIMEOUT", 900)),
+}
+
+# Adaptieve timeout: een veelvoud van de gemeten latentie, begrensd tussen minimum en maximum
+TIMEOUT_FACTOR = float(os.getenv("HOST_TIMEOUT_FACTOR", 4))
+MIN_TIMEOUT = float(os.getenv("HOST_MIN_TIMEOUT", 2))
+MAX_TIMEOUT = float(os.getenv("HOST_MAX_TIMEOUT", 10))
+# Gewicht van een nieuwe meting in het voortschrijdend gemiddelde
+LATENCY_ALPHA = 0.3
+# Maximaal aantal hosts waarvan de staat in het geheugen bewaard wordt (minst recent gebruikt valt af)
+MAX_TRACKED_HOSTS = int(os.getenv("HOST_HEALTH_MAX_HOSTS", 10000))
+
+HOST_SKIPS = register(Counter(
+    "caesar_host_skips_total", "Aantal overgeslagen verzoeken naar onbereikbare hosts.", ("reason",)))
+HOST_FAILURES = register(Counter(
+    "caesar_host_failures_total", "Aantal mislukte verzoeken naar websites per soort fout.", ("kind",)))
+
+class HostUnavailable(Exception):
+    """De host staat in de negatieve cache of de circuit breaker staat open."""
+
+def failure_kind(exc):
+    """
+    Bepaalt de soort fout voor de gezondheid van een host.
+
+    Returns:
+        str: 'dns', 'refused', 'timeout', 'connection' of 'server_error', of None als de
+        fout niets over de bereikbaarheid van de host zegt (bijv. een 404).
+    """
+    if isinstance(exc, requests.exceptions.Timeout):
+        return "timeout"
+    if isinstance(exc, requests.exceptions.HTTPError):
+        response = exc.response
+        return "server_error" if response is not None and response.status_code >= 500 else None
+    if isinstance(exc, requests.exceptions.ConnectionError):
+        # De oorzaak zit genest in urllib3-excepties; loop de keten en de tekst na
+        seen = exc
+        while seen is not None:
+            if isinstance(seen, socket.gaierror):
+                return "dns"
+            if isinstance(seen, ConnectionRefusedError):
+                return "refused"
+            seen = seen.__cause__ or seen.__context__
+        # De web-sessie probeert reads niet opnieuw, waardoor urllib3 een timeout als
+        # MaxRetryError verpakt en requests er een ConnectionError van maakt
+        reason = exc.args[0] if exc.args else None
+        if isinstance(reason, MaxRetryError):
+            reason = reason.reason
+        # NewConnectionError erft in urllib3 1.x van ConnectTimeoutError
+        if isinstance(reason, (ReadTimeoutError, ConnectTimeoutError)) and not isinstance(reason, NewConnectionError):
+            return "timeout"
+        text = str(exc)
+        if "NameResolutionError" in text or "Name or service not known" in text or "getaddrinfo" in text:
+            return "dns"
+        if "Connection refused" in text or "ConnectionRefusedError" in text:
+            return "refused"
+        if "timed out" in text:
+            return "timeout"
+        return "connection"
+    return None
+
+class _HostState:
+    __slots__ = ("failures", "open_until", "cooldown", "probing", "latency")
+
+    def __init__(self):
+        self.failures = 0
+        self.open_until = 0.0
+        self.cooldown = BREAKER_COOLDOWN
+        self.probing = False
+        self.latency = None
+
+class HostHealth:
+    """
+    Houdt per host fouten en latentie bij.
+
+    - Circuit breaker: na `BREAKER_THRESHOLD` opeenvolgende fouten wordt de host tijdens de
+      cooldown overgeslagen. Daarna mag één verzoek proberen (half-open); slaagt dat, dan
+      sluit de breaker, anders gaat hij met een verdubbelde cooldown weer open.
+    - Negatieve cache: DNS-fouten, geweigerde verbindingen en timeouts markeren de host
+      direct als onbereikbaar, met een verlooptijd per soort fout. Dit loopt via de
+      responscache, zodat het ook tussen processen en na een herstart geldt.
+    - Adaptieve timeout: een veelvoud van de gemeten latentie van de host.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._hosts = OrderedDict()
+
+    def _state(self, host):
+        # Aanroepen onder self._lock
+        state = self._hosts.get(host)
+        if state is None:
+            state = self._hosts[host] = _HostState()
+            if len(self._hosts) > MAX_TRACKED_HOSTS:
+                self._hosts.popitem(last=False)
+        else:
+            self._hosts.move_to_end(host)
+        return state
+
+    def check(self, host):
+        """Gooit HostUnavailable als de host nu overgeslagen moet worden."""
+        reason = peek("host_negative", host)
+        if reason:
+            HOST_SKIPS.inc(reason=reason)
+            raise HostUnavailable(f"{host} is onbereikbaar ({reason})")
+        with self._lock:
+            state = self._state(host)
+            if state.failures < BREAKER_THRESHOLD:
+                return
+            if time.monotonic() < state.open_until or state.probing:
+                HOST_SKIPS.inc(reason="breaker")
+                raise HostUnavailable(f"Circuit breaker open voor {host}")
+            # Half-open: dit verzoek is de proef
+            state.probing = True
+
+    def timeout(self, host, cap=MAX_TIMEOUT):
+        """De timeout voor een verzoek naar `host`, hooguit `cap` seconden."""
+        with self._lock:
+            latency = self._state(host).latency
+        if latency is None:
+            return min(MAX_TIMEOUT, cap)
+        return min(max(latency * TIMEOUT_FACTOR, MIN_TIMEOUT), MAX_TIMEOUT, cap)
+
+    def record_success(self, host, elapsed):
+        with self._lock:
+            state = self._state(host)
+            state.latency = elapsed if state.latency is None else (
+                LATENCY_ALPHA * elapsed + (1 - LATENCY_ALPHA) * state.latency)
+            state.failures = 0
+            state.probing = False
+            state.cooldown = BREAKER_COOLDOWN
+
+    def record_failure(self, host, exc):
+        kind = failure_kind(exc)
+        if kind is None:
+            # De host antwoordt; dat telt als bereikbaar
+            with self._lock:
+                state = self._state(host)
+                state.failures = 0
+                state.probing = False
+            return
+        HOST_FAILURES.inc(kind=kind)
+        if kind in NEGATIVE_TTLS:
+            store("host_negative", (host,), kind, NEGATIVE_TTLS[kind])
+            logger.info(f"{host} als onbereikbaar gemarkeerd ({kind}) voor {NEGATIVE_TTLS[kind]} seconden")
+        with self._lock:
+            state = self._state(host)
+            if state.probing:
+                state.cooldown = min(state.cooldown * 2, BREAKER_MAX_COOLDOWN)
+            state.failures += 1
+            state.probing = False
+            if state.failures >= BREAKER_THRESHOLD:
+                state.open_until = time.monotonic() + state.cooldown
+                logger.info(f"Circuit breaker open voor {host} ({state.cooldown:.0f} seconden)")
+
+    def reset(self):
+        with self._lock:
+            self._hosts.clear()
+
+health = HostHealth()
@@ -0,0 +1,233 @@
+# ai-contact-finder/backend/app/http_client.py
+
+import os
+import codecs
+import logging
+import threading
+import requests
+import googlemaps
+from contextlib import contextmanager
+from collections import namedtuple
+from urllib.parse import urlparse
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+logger = logging.getLogger(__name__)
+
+# Aantal hosts waarvoor een connectiepool bewaard wordt, en het aantal
+# keep-alive connecties per host
+POOL_CONNECTIONS = int(os.getenv("HTTP_POOL_CONNECTIONS", 100))
+POOL_MAXSIZE = int(os.getenv("HTTP_POOL_MAXSIZE", 16))
+
+# Maximaal aantal gelijktijdige verzoeken naar dezelfde host
+PER_HOST_LIMIT = int(os.getenv("SCRAPER_PER_HOST_LIMIT", 4))
+
+# Maximaal aantal bytes dat per pagina gedownload wordt, en de grootte van de leesblokken
+MAX_PAGE_BYTES = int(os.getenv("SCRAPER_MAX_PAGE_BYTES", 2 * 1024 * 1024))
+FETCH_CHUNK_SIZE = 64 * 1024
+HTML_CONTENT_TYPES = ("text/html", "application/xhtml+xml")
+
+# Alternatieve basis-URL voor de Maps API, bijvoorbeeld een lokale stand-in voor benchmarks
+GOOGLE_MAPS_BASE_URL = os.getenv("GOOGLE_MAPS_BASE_URL")
+# Tijd (seconden) waarbinnen googlemaps.Client zelf 5xx-responses opnieuw probeert. Kort gehouden,
+# zodat call_with_retries (met de gedeelde rate limiter) de enige echte retrylaag is.
+GOOGLE_MAPS_RETRY_TIMEOUT = float(os.getenv("GOOGLE_MAPS_RETRY_TIMEOUT", 1))
+
+# Retry-instellingen per soort verkeer. Websites krijgen geen connect-retry,
+# zodat een dode site niet meerdere keren de volledige timeout kost.
+_SESSION_PROFILES = {
+    "web": {
+        "retries": Retry(total=1, connect=0, read=0, status=1,
+                         status_forcelist=(502, 503, 504),
+                         allowed_methods=frozenset(["GET", "HEAD"]),
+                         raise_on_status=False),
+        "headers": {}
+    },
+    "search": {
+        "retries": Retry(total=2, connect=2, read=0, status=0),
+        "headers": {
+            "User-Agent": "Mozilla/5.0",
+            "Accept-Language": "nl-NL,nl;q=0.9,en-US;q=0.8,en;q=0.7"
+        }
+    },
+    "gemini": {
+        # call_gemini_api regelt zelf de retries en backoff
+        "retries": Retry(total=1, connect=1, read=0, status=0),
+        "headers": {}
+    },
+    "google_maps": {
+        # Retries en throttling lopen via call_with_retries
+        "retries": Retry(total=1, connect=1, read=0, status=0),
+        "headers": {}
+    },
+}
+
+# Per host een semafoor en het aantal threads dat hem gebruikt of erop wacht
+_host_semaphores = {}
+_host_semaphores_lock = threading.Lock()
+
+@contextmanager
+def host_slot(url):
+    """
+    Beperkt het aantal gelijktijdige verzoeken naar de host van `url`.
+
+    Een semafoor bestaat alleen zolang er verzoeken naar de host lopen of wachten,
+    zodat het aantal bewaarde semaforen niet groeit met elke host die ooit bezocht is.
+    """
+    host = (urlparse(url).hostname or "").lower()
+    with _host_semaphores_lock:
+        entry = _host_semaphores.get(host)
+        if entry is None:
+            entry = _host_semaphores[host] = [threading.BoundedSemaphore(PER_HOST_LIMIT), 0]
+        entry[1] += 1
+    try:
+        with entry[0]:
+            yield
+    finally:
+        with _host_semaphores_lock:
+            entry[1] -= 1
+            if entry[1] == 0:
+                del _host_semaphores[host]
+
+_sessions = {}
+_gmaps_clients = {}
+_twilio_http_client = None
+_lock = threading.Lock()
+
+def _build_session(name):
+    profile = _SESSION_PROFILES.get(name, _SESSION_PROFILES["web"])
+    session = requests.Session()
+    adapter = HTTPAdapter(
+        pool_connections=POOL_CONNECTIONS,
+        pool_maxsize=POOL_MAXSIZE,
+        max_retries=profile["retries"]
+    )
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    session.headers.update(profile["headers"])
+    return session
+
+def get_session(name="web"):
+    """
+    Geeft een gedeelde requests.Session terug voor het opgegeven soort verkeer.
+
+    Sessies worden één keer per proces aangemaakt en hergebruiken TCP- en
+    TLS-connecties via een connectiepool.
+    """
+    session = _sessions.get(name)
+    if session is None:
+        with _lock:
+            session = _sessions.get(name)
+            if session is None:
+                session = _build_session(name)
+                _sessions[name] = session
+    return session
+
+def get_gmaps_client(api_key):
+    """Geeft een gedeelde googlemaps.Client per API-sleutel terug."""
+    client = _gmaps_clients.get(api_key)
+    if client is None:
+        with _lock:
+            client = _gmaps_clients.get(api_key)
+            if client is None:
+                options = {"base_url": GOOGLE_MAPS_BASE_URL} if GOOGLE_MAPS_BASE_URL else {}
+                # OVER_QUERY_LIMIT niet in de client afhandelen, maar doorgeven aan
+                # call_with_retries, zodat de rate limiter van google_maps pauzeert
+                client = googlemaps.Client(
+                    key=api_key,
+                    requests_session=_build_session("google_maps"),
+                    retry_over_query_limit=False,
+                    retry_timeout=GOOGLE_MAPS_RETRY_TIMEOUT,
+                    **options
+                )
+                _gmaps_clients[api_key] = client
+    return client
+
+def get_twilio_http_client():
+    """Geeft een gedeelde Twilio HTTP-client met connectiepool terug."""
+    global _twilio_http_client
+    if _twilio_http_client is None:
+        with _lock:
+            if _twilio_http_client is None:
+                # Pas hier importeren, zodat processen die alleen scrapen Twilio niet laden
+                from twilio.http.http_client import TwilioHttpClient
+                _twilio_http_client = TwilioHttpClient(pool_connections=True, timeout=10, max_retries=2)
+    return _twilio_http_client
+
+def _content_type_and_charset(headers):
+    content_type = headers.get("Content-Type", "")
+    mime, _, params = content_type.partition(";")
+    charset = None
+    for param in params.split(";"):
+        key, _, value = param.strip().partition("=")
+        if key.lower() == "charset" and value:
+            charset = value.strip("\"' ")
+    return mime.strip().lower(), charset
+
+# Resultaat van fetch_page; `html` is None bij 304 Not Modified of als de response geen HTML is
+FetchedPage = namedtuple("FetchedPage", ["html", "status", "etag", "last_modified"])
+
+def fetch_page(url, timeout=10, max_bytes=MAX_PAGE_BYTES, etag=None, last_modified=None):
+    """
+    Haalt een HTML-pagina begrensd op via de gedeelde web-sessie.
+
+    De body wordt gestreamd en incrementeel gedecodeerd; na `max_bytes` bytes wordt
+    gestopt en de tot dan toe gelezen HTML teruggegeven. Responses die volgens hun
+    Content-Type geen HTML zijn (PDF, afbeeldingen, ...) worden overgeslagen voordat
+    de body gelezen wordt. Met `etag` of `last_modified` wordt het verzoek conditioneel;
+    een 304 levert een FetchedPage zonder HTML en met de oude validators op.
+
+    Returns:
+        FetchedPage: De (mogelijk afgekapte) HTML, de statuscode en de validators.
+    """
+    headers = {}
+    if etag:
+        headers["If-None-Match"] = etag
+    if last_modified:
+        headers["If-Modified-Since"] = last_modified
+
+    with get_session("web").get(url, timeout=timeout, stream=True, headers=headers) as resp:
+        if resp.status_code == 304:
+            return FetchedPage(None, 304, etag, last_modified)
+        resp.raise_for_status()
+        new_etag = resp.headers.get("ETag")
+        new_last_modified = resp.headers.get("Last-Modified")
+        mime, charset = _content_type_and_charset(resp.headers)
+        if mime and mime not in HTML_CONTENT_TYPES:
+            logger.info(f"Overgeslagen: {url} is geen HTML ({mime})")
+            return FetchedPage(None, resp.status_code, new_etag, new_last_modified)
+
+        try:
+            decoder = codecs.getincrementaldecoder(charset or "utf-8")(errors="replace")
+        except LookupError:
+            decoder = codecs.getincrementaldecoder("utf-8")(errors="replace")
+
+        parts = []
+        received = 0
+        for chunk in resp.iter_content(chunk_size=FETCH_CHUNK_SIZE):
+            if received + len(chunk) > max_bytes:
+                chunk = chunk[:max_bytes - received]
+            received += len(chunk)
+            parts.append(decoder.decode(chunk))
+            if received >= max_bytes:
+                logger.info(f"Pagina afgekapt na {max_bytes} bytes: {url}")
+                break
+        parts.append(decoder.decode(b"", final=True))
+        return FetchedPage("".join(parts), resp.status_code, new_etag, new_last_modified)
+
+def fetch_html(url, timeout=10, max_bytes=MAX_PAGE_BYTES):
+    """
+    Haalt een HTML-pagina begrensd op; zie `fetch_page`.
+
+    Returns:
+        str: De (mogelijk afgekapte) HTML, of None als de response geen HTML is.
+    """
+    return fetch_page(url, timeout=timeout, max_bytes=max_bytes).html
+
+def close_sessions():
+    """Sluit alle gedeelde sessies, bijvoorbeeld bij het afsluiten van een worker."""
+    with _lock:
+        for session in _sessions.values():
+            session.close()
+        _sessions.clear()
+        _gmaps_clients.clear()
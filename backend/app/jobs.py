@@ -0,0 +1,197 @@
+# ai-contact-finder/backend/app/jobs.py
+
+import os
+import time
+import uuid
+import socket
+import logging
+import threading
+from datetime import datetime, timedelta
+from concurrent.futures import ThreadPoolExecutor
+from sqlalchemy import or_
+from . import db
+from .models import SearchJob
+from .scraper import hybrid_scraper, search_criteria
+from .storage import store_companies, load_enrichment_state
+from .records import COMPANY_RESPONSE_FIELDS
+from .serialization import dumps, loads
+from .metrics import Trace, use_trace, current_trace_id, stage
+
+logger = logging.getLogger(__name__)
+
+# Aantal zoekopdrachten dat tegelijk uitgevoerd wordt
+SEARCH_JOB_WORKERS = int(os.getenv("SEARCH_JOB_WORKERS", 2))
+# Minimale tijd in seconden tussen twee voortgangsupdates in de database
+PROGRESS_INTERVAL = float(os.getenv("SEARCH_JOB_PROGRESS_INTERVAL", 1.0))
+
+# Interval (seconden) waarmee een proces de heartbeat van zijn lopende jobs bijwerkt, en de
+# tijd zonder heartbeat waarna een job als verweesd geldt en opnieuw ingepland wordt
+HEARTBEAT_INTERVAL = float(os.getenv("SEARCH_JOB_HEARTBEAT_INTERVAL", 15))
+STALE_AFTER = float(os.getenv("SEARCH_JOB_STALE_AFTER", 60))
+
+# Identificeert dit proces in `SearchJob.worker_id`
+WORKER_ID = f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:8]}"
+
+_app = None
+_executor = None
+# Job-ID's die in dit proces ingepland zijn maar nog niet afgerond
+_submitted = set()
+_submitted_lock = threading.Lock()
+
+def init_search_jobs(app):
+    """
+    Start de worker pool en een heartbeat-thread. Moet binnen een app context aangeroepen worden.
+
+    Een lopende job wordt alleen opnieuw ingepland als zijn heartbeat langer dan
+    `STALE_AFTER` seconden oud is, dus als het proces dat hem uitvoerde niet meer leeft.
+    Zo zetten meerdere processen (gunicorn-workers, de reloader) elkaars jobs niet terug.
+    """
+    global _app, _executor
+    _app = app
+    _executor = ThreadPoolExecutor(max_workers=SEARCH_JOB_WORKERS, thread_name_prefix="search-job")
+    _recover_jobs()
+    threading.Thread(target=_heartbeat_loop, name="search-job-heartbeat", daemon=True).start()
+
+def _submit(job_id):
+    with _submitted_lock:
+        if job_id in _submitted:
+            return
+        _submitted.add(job_id)
+    _executor.submit(_run_search_job, job_id)
+
+def _recover_jobs():
+    cutoff = datetime.utcnow() - timedelta(seconds=STALE_AFTER)
+    stale = [job_id for (job_id,) in db.session.query(SearchJob.id).filter(
+        SearchJob.status == 'running',
+        or_(SearchJob.heartbeat_at.is_(None), SearchJob.heartbeat_at < cutoff)
+    )]
+    for job_id in stale:
+        # Alleen terugzetten als de job nog steeds verweesd is; een ander proces kan hem al hebben
+        requeued = SearchJob.query.filter(
+            SearchJob.id == job_id,
+            SearchJob.status == 'running',
+            or_(SearchJob.heartbeat_at.is_(None), SearchJob.heartbeat_at < cutoff)
+        ).update({'status': 'queued', 'worker_id': None}, synchronize_session=False)
+        db.session.commit()
+        if requeued:
+            logger.info(f"Onderbroken zoekopdracht opnieuw ingepland: {job_id}")
+
+    # Wachtende jobs worden door elk proces ingepland; de claim in _execute_search_job
+    # zorgt dat er maar één ze uitvoert
+    for (job_id,) in db.session.query(SearchJob.id).filter(SearchJob.status == 'queued'):
+        _submit(job_id)
+
+def _heartbeat_loop():
+    while True:
+        time.sleep(HEARTBEAT_INTERVAL)
+        with _app.app_context():
+            try:
+                SearchJob.query.filter_by(worker_id=WORKER_ID, status='running').update(
+                    {'heartbeat_at': datetime.utcnow()}, synchronize_session=False)
+                db.session.commit()
+                _recover_jobs()
+            except Exception as e:
+                logger.error(f"Fout bij heartbeat van zoekopdrachten: {e}")
+                db.session.rollback()
+            finally:
+                db.session.remove()
+
+def enqueue_search_job(params):
+    job = SearchJob(id=uuid.uuid4().hex, status='queued', params=dumps(params),
+                    trace_id=current_trace_id())
+    db.session.add(job)
+    db.session.commit()
+    _submit(job.id)
+    logger.info(f"Zoekopdracht ingepland: {job.id}")
+    return job
+
+def _run_search_job(job_id):
+    with _app.app_context():
+        try:
+            _execute_search_job(job_id)
+        except Exception as e:
+            logger.error(f"Fout bij uitvoeren van zoekopdracht {job_id}: {e}")
+            db.session.rollback()
+            SearchJob.query.filter_by(id=job_id).update({'status': 'failed', 'error': str(e)})
+            db.session.commit()
+        finally:
+            db.session.remove()
+            with _submitted_lock:
+                _submitted.discard(job_id)
+
+def _execute_search_job(job_id):
+    # Claim de job, zodat een job nooit twee keer tegelijk draait
+    claimed = SearchJob.query.filter_by(id=job_id, status='queued').update(
+        {'status': 'running', 'worker_id': WORKER_ID, 'heartbeat_at': datetime.utcnow()})
+    db.session.commit()
+    if not claimed:
+        return
+    job = SearchJob.query.get(job_id)
+    # De job houdt de trace-ID van het verzoek dat hem inplande
+    with use_trace(Trace(job.trace_id or job.id)) as trace:
+        _scrape_and_store(job, trace)
+
+def _store_late_results(job_id, records, params):
+    """Werkt de bedrijven en het jobresultaat bij met verrijkingen die na de deadline klaar zijn."""
+    companies = store_companies(records, params['city'], params['industry'])
+    job = SearchJob.query.get(job_id)
+    if job is None or job.status != 'completed' or not job.results:
+        return
+    late = {company.id: company.to_dict(COMPANY_RESPONSE_FIELDS) for company in companies}
+    job.results = dumps([late.get(result['id'], result) for result in loads(job.results)])
+    db.session.commit()
+    logger.info(f"Zoekopdracht {job_id}: {len(companies)} bedrijven na de deadline verrijkt.")
+
+def _scrape_and_store(job, trace):
+    params = loads(job.params)
+    job_id = job.id
+    # Verrijkingen na de deadline wachten tot de job zijn eigen resultaten heeft opgeslagen
+    stored = threading.Event()
+
+    def on_late(batch):
+        stored.wait()
+        with _app.app_context():
+            try:
+                _store_late_results(job_id, [record for _, record in batch], params)
+            finally:
+                db.session.remove()
+
+    partial = []
+    last_flush = time.monotonic()
+
+    def on_result(record, done, total):
+        nonlocal last_flush
+        # Zelfde vorm als het eindresultaat, zodat GET /search/<id> tijdens de job niet verandert
+        partial.append(record.to_dict(COMPANY_RESPONSE_FIELDS))
+        now = time.monotonic()
+        if done == total or now - last_flush >= PROGRESS_INTERVAL:
+            job.processed = done
+            job.total = total
+            job.results = dumps(partial)
+            with stage("db_progress"):
+                db.session.commit()
+            last_flush = now
+
+    google_api_key = os.getenv("GOOGLE_API_KEY")
+    criteria = search_criteria(params['city'], params['industry'])
+    try:
+        companies_data = hybrid_scraper(
+            criteria, google_api_key, on_result=on_result,
+            company_types=params.get('company_types'), areas=params.get('areas'),
+            tiling=params.get('tiling'), lookup_previous=load_enrichment_state,
+            time_budget=params.get('time_budget'), on_late=on_late
+        )
+        results = companies_data.get("results") or []
+
+        companies = store_companies(results, params['city'], params['industry']) if results else []
+        if not companies:
+            logger.info(f"Geen bedrijven gevonden voor stad: {params['city']}, branche: {params['industry']}.")
+        job.status = 'completed'
+        job.processed = len(results)
+        job.total = len(results)
+        job.results = dumps([company.to_dict(COMPANY_RESPONSE_FIELDS) for company in companies])
+        job.timing = dumps(trace.to_dict())
+        db.session.commit()
+    finally:
+        stored.set()
+    logger.info(f"Zoekopdracht {job.id} afgerond met {len(companies)} bedrijven.")
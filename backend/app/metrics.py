@@ -0,0 +1,242 @@
+# ai-contact-finder/backend/app/metrics.py
+
+import os
+import re
+import time
+import uuid
+import logging
+import threading
+import contextvars
+from functools import wraps
+from contextlib import contextmanager
+from collections import defaultdict
+
+logger = logging.getLogger(__name__)
+
+# Grenzen (seconden) van de histogrambakjes voor stage- en verzoekduur
+DURATION_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+# Header waarmee een client een eigen trace-ID meegeeft; wordt ook in het antwoord gezet
+TRACE_HEADER = os.getenv("TRACE_HEADER", "X-Request-ID")
+_VALID_TRACE_ID = re.compile(r"^[A-Za-z0-9._-]{1,64}$")
+
+def _escape(value):
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+def _label_text(labels):
+    if not labels:
+        return ""
+    return "{" + ",".join(f'{key}="{_escape(value)}"' for key, value in labels) + "}"
+
+class Counter:
+    """Thread-safe teller met labels."""
+
+    def __init__(self, name, help_text, label_names=()):
+        self.name = name
+        self.help_text = help_text
+        self.label_names = tuple(label_names)
+        self._lock = threading.Lock()
+        self._values = defaultdict(float)
+
+    def inc(self, amount=1, **labels):
+        key = tuple((name, labels.get(name, "")) for name in self.label_names)
+        with self._lock:
+            self._values[key] += amount
+
+    def render(self):
+        lines = [f"# HELP {self.name} {self.help_text}", f"# TYPE {self.name} counter"]
+        with self._lock:
+            for key, value in sorted(self._values.items()):
+                lines.append(f"{self.name}{_label_text(key)} {value:g}")
+        return lines
+
+class Histogram:
+    """Thread-safe histogram met labels, in het Prometheus-formaat met cumulatieve bakjes."""
+
+    def __init__(self, name, help_text, label_names=(), buckets=DURATION_BUCKETS):
+        self.name = name
+        self.help_text = help_text
+        self.label_names = tuple(label_names)
+        self.buckets = tuple(buckets)
+        self._lock = threading.Lock()
+        self._series = {}
+
+    def observe(self, value, **labels):
+        key = tuple((name, labels.get(name, "")) for name in self.label_names)
+        with self._lock:
+            series = self._series.get(key)
+            if series is None:
+                series = self._series[key] = [[0] * len(self.buckets), 0.0, 0]
+            for i, bound in enumerate(self.buckets):
+                if value <= bound:
+                    series[0][i] += 1
+            series[1] += value
+            series[2] += 1
+
+    def render(self):
+        lines = [f"# HELP {self.name} {self.help_text}", f"# TYPE {self.name} histogram"]
+        with self._lock:
+            for key, (counts, total, count) in sorted(self._series.items()):
+                for bound, bucket_count in zip(self.buckets, counts):
+                    lines.append(f"{self.name}_bucket{_label_text(key + (('le', f'{bound:g}'),))} {bucket_count}")
+                lines.append(f"{self.name}_bucket{_label_text(key + (('le', '+Inf'),))} {count}")
+                lines.append(f"{self.name}_sum{_label_text(key)} {total:.6f}")
+                lines.append(f"{self.name}_count{_label_text(key)} {count}")
+        return lines
+
+STAGE_DURATION = Histogram(
+    "caesar_stage_duration_seconds", "Duur van een stap in de pipeline.", ("stage",))
+STAGE_ERRORS = Counter(
+    "caesar_stage_errors_total", "Aantal stappen dat met een fout eindigde.", ("stage",))
+REQUEST_DURATION = Histogram(
+    "caesar_http_request_duration_seconds", "Duur van HTTP-verzoeken per endpoint.", ("method", "endpoint"))
+REQUESTS = Counter(
+    "caesar_http_requests_total", "Aantal HTTP-verzoeken per endpoint en status.", ("method", "endpoint", "status"))
+
+_METRICS = [STAGE_DURATION, STAGE_ERRORS, REQUEST_DURATION, REQUESTS]
+
+def register(metric):
+    """Neemt een metric uit een andere module op in /metrics en geeft hem terug."""
+    _METRICS.append(metric)
+    return metric
+
+class Trace:
+    """Tijdsverdeling per stap voor één verzoek of zoekopdracht."""
+
+    def __init__(self, trace_id=None):
+        self.trace_id = trace_id or uuid.uuid4().hex
+        self.started = time.perf_counter()
+        self._lock = threading.Lock()
+        self._stages = {}
+
+    def add(self, stage, seconds):
+        with self._lock:
+            entry = self._stages.setdefault(stage, {"count": 0, "seconds": 0.0})
+            entry["count"] += 1
+            entry["seconds"] += seconds
+
+    def to_dict(self):
+        """
+        Geeft de tijdsverdeling terug. Stappen die parallel lopen tellen allemaal mee,
+        dus de som van de stappen kan groter zijn dan de totale duur.
+        """
+        with self._lock:
+            stages = {
+                stage: {"count": entry["count"], "seconds": round(entry["seconds"], 4)}
+                for stage, entry in sorted(self._stages.items())
+            }
+        return {
+            "trace_id": self.trace_id,
+            "total_seconds": round(time.perf_counter() - self.started, 4),
+            "stages": stages,
+        }
+
+_current_trace = contextvars.ContextVar("trace", default=None)
+
+def current_trace():
+    return _current_trace.get()
+
+def current_trace_id():
+    trace = _current_trace.get()
+    return trace.trace_id if trace else None
+
+@contextmanager
+def use_trace(trace):
+    """Maakt `trace` de actieve trace voor de huidige thread of context."""
+    token = _current_trace.set(trace)
+    try:
+        yield trace
+    finally:
+        _current_trace.reset(token)
+
+def traced(fn):
+    """
+    Bindt de actieve trace aan `fn`, zodat stappen in een worker thread meetellen.
+
+    Thread pools nemen de context van de aanroeper niet over; wikkel daarom
+    functies die aan een executor gegeven worden hierin.
+    """
+    trace = _current_trace.get()
+    if trace is None:
+        return fn
+
+    @wraps(fn)
+    def wrapper(*args, **kwargs):
+        with use_trace(trace):
+            return fn(*args, **kwargs)
+    return wrapper
+
+@contextmanager
+def stage(name):
+    """Meet de duur van een stap voor /metrics en voor de actieve trace."""
+    start = time.perf_counter()
+    try:
+        yield
+    except Exception:
+        STAGE_ERRORS.inc(stage=name)
+        raise
+    finally:
+        elapsed = time.perf_counter() - start
+        STAGE_DURATION.observe(elapsed, stage=name)
+        trace = _current_trace.get()
+        if trace is not None:
+            trace.add(name, elapsed)
+
+def timed(name):
+    """Decorator-variant van `stage`."""
+    def decorator(fn):
+        @wraps(fn)
+        def wrapper(*args, **kwargs):
+            with stage(name):
+                return fn(*args, **kwargs)
+        return wrapper
+    return decorator
+
+def _cache_lines():
+    from .cache import stats
+    lines = [
+        "# HELP caesar_cache_requests_total Aantal opvragingen uit de responscache.",
+        "# TYPE caesar_cache_requests_total counter",
+    ]
+    for namespace, counts in stats.snapshot().items():
+        for result, key in (("hit", "hits"), ("miss", "misses")):
+            labels = _label_text((("namespace", namespace), ("result", result)))
+            lines.append(f"caesar_cache_requests_total{labels} {counts[key]}")
+    return lines
+
+def render_metrics():
+    """Alle metrics in het Prometheus-tekstformaat."""
+    lines = []
+    for metric in _METRICS:
+        lines.extend(metric.render())
+    lines.extend(_cache_lines())
+    return "\n".join(lines) + "\n"
+
+def init_metrics(app):
+    """Registreert per-verzoek trace-ID's en verzoekmetrics op de Flask-app."""
+    from flask import g, request
+
+    @app.before_request
+    def _start_trace():
+        trace_id = request.headers.get(TRACE_HEADER, "")
+        g.trace = Trace(trace_id if _VALID_TRACE_ID.match(trace_id) else None)
+        g.trace_token = _current_trace.set(g.trace)
+
+    @app.after_request
+    def _finish_trace(response):
+        trace = g.get("trace")
+        if trace is not None:
+            endpoint = request.url_rule.rule if request.url_rule else "onbekend"
+            REQUEST_DURATION.observe(time.perf_counter() - trace.started, method=request.method, endpoint=endpoint)
+            REQUESTS.inc(method=request.method, endpoint=endpoint, status=response.status_code)
+            response.headers[TRACE_HEADER] = trace.trace_id
+        return response
+
+    @app.teardown_request
+    def _reset_trace(exc):
+        token = g.pop("trace_token", None)
+        if token is not None:
+            try:
+                _current_trace.reset(token)
+            except ValueError:
+                # Gestreamde responses eindigen in een andere context
+                _current_trace.set(None)
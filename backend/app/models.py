@@ -1,18 +1,50 @@
 from . import db
 
 class Company(db.Model):
+    # Voor GET /companies: filteren op stad en/of branche met keyset-paginering op id
+    __table_args__ = (
+        db.Index('ix_company_city_industry_id', 'city', 'industry', 'id'),
+        db.Index('ix_company_city_id', 'city', 'id'),
+        db.Index('ix_company_industry_id', 'industry', 'id'),
+    )
+
     id = db.Column(db.Integer, primary_key=True)
-    name = db.Column(db.String(100), nullable=False)
+    place_id = db.Column(db.String(255), nullable=True, unique=True, index=True)  # Google Places ID
+    name = db.Column(db.String(100), nullable=False, index=True)
     contact = db.Column(db.String(100), nullable=True)  # Telefoonnummer of e-mailadres
     contact_form_url = db.Column(db.String(255), nullable=True)
     linkedin_profile = db.Column(db.String(255), nullable=True)
     twitter_handle = db.Column(db.String(100), nullable=True)
     telegram_handle = db.Column(db.String(100), nullable=True)
     live_chat_url = db.Column(db.String(255), nullable=True)
+    website = db.Column(db.String(255), nullable=True)
+    website_etag = db.Column(db.String(255), nullable=True)  # Validators voor conditionele verzoeken
+    website_last_modified = db.Column(db.String(64), nullable=True)
+    content_hash = db.Column(db.String(64), nullable=True)  # Hash van de verrijkte velden
+    last_enriched_at = db.Column(db.DateTime, nullable=True, index=True)
+    city = db.Column(db.String(100), nullable=True)  # Genormaliseerd (kleine letters) uit de zoekopdracht
+    industry = db.Column(db.String(100), nullable=True)
 
 class Contact(db.Model):
     id = db.Column(db.Integer, primary_key=True)
     company_id = db.Column(db.Integer, db.ForeignKey('company.id'), nullable=False)
     method = db.Column(db.String(50), nullable=False)
-    status = db.Column(db.String(50), nullable=False)
+    status = db.Column(db.String(50), nullable=False)  # Queued, Sending, Initiated of Failed
+    batch_id = db.Column(db.String(32), nullable=True, index=True)  # Bulkverzoek waar de poging bij hoort
+    error = db.Column(db.Text, nullable=True)
     timestamp = db.Column(db.DateTime, default=db.func.current_timestamp())
+
+class SearchJob(db.Model):
+    id = db.Column(db.String(32), primary_key=True)
+    status = db.Column(db.String(20), nullable=False, default='queued')  # queued, running, completed of failed
+    params = db.Column(db.Text, nullable=False)  # JSON met de zoekcriteria
+    processed = db.Column(db.Integer, nullable=False, default=0)
+    total = db.Column(db.Integer, nullable=True)
+    results = db.Column(db.Text, nullable=True)  # JSON met gedeeltelijke of definitieve resultaten
+    error = db.Column(db.Text, nullable=True)
+    trace_id = db.Column(db.String(64), nullable=True)  # Trace-ID van het verzoek dat de job inplande
+    timing = db.Column(db.Text, nullable=True)  # JSON met de tijdsverdeling per stap
+    worker_id = db.Column(db.String(128), nullable=True)  # Proces dat de job uitvoert
+    heartbeat_at = db.Column(db.DateTime, nullable=True)  # Laatste teken van leven van dat proces
+    created_at = db.Column(db.DateTime, default=db.func.current_timestamp())
+    updated_at = db.Column(db.DateTime, default=db.func.current_timestamp(), onupdate=db.func.current_timestamp())
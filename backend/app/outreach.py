@@ -0,0 +1,201 @@
+# ai-contact-finder/backend/app/outreach.py
+
+import os
+import time
+import uuid
+import logging
+import requests
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from sqlalchemy import insert, update
+from . import db
+from .models import Company, Contact
+from .records import CompanyRecord
+from .storage import _chunks
+from .contact_tools import initiate_contact, METHOD_CHANNELS
+from .rate_limit import call_with_retries, classify_error
+from .metrics import stage, traced
+
+logger = logging.getLogger(__name__)
+
+# Aantal bulkverzoeken dat tegelijk verwerkt wordt, en het aantal berichten per verzoek dat tegelijk uitgaat
+OUTREACH_BATCH_WORKERS = int(os.getenv("OUTREACH_BATCH_WORKERS", 2))
+OUTREACH_DISPATCH_WORKERS = int(os.getenv("OUTREACH_DISPATCH_WORKERS", 16))
+# Pogingen per bericht bij tijdelijke fouten of throttling van het kanaal
+OUTREACH_RETRIES = int(os.getenv("OUTREACH_RETRIES", 3))
+# Minimale tijd in seconden tussen twee statusupdates in de database
+OUTREACH_FLUSH_INTERVAL = float(os.getenv("OUTREACH_FLUSH_INTERVAL", 1.0))
+
+QUEUED = 'Queued'
+SENDING = 'Sending'
+INITIATED = 'Initiated'
+FAILED = 'Failed'
+
+_app = None
+_executor = None
+
+def init_outreach(app):
+    """
+    Start de worker pool en plant bulkverzoeken opnieuw in die door een herstart zijn onderbroken.
+    Moet binnen een app context aangeroepen worden.
+    """
+    global _app, _executor
+    _app = app
+    _executor = ThreadPoolExecutor(max_workers=OUTREACH_BATCH_WORKERS, thread_name_prefix="outreach")
+
+    batch_ids = [
+        batch_id for (batch_id,) in
+        db.session.query(Contact.batch_id).filter(Contact.status == QUEUED, Contact.batch_id.isnot(None)).distinct()
+    ]
+    for batch_id in batch_ids:
+        logger.info(f"Onderbroken outreach opnieuw ingepland: {batch_id}")
+        _executor.submit(_run_batch, batch_id)
+
+    # Berichten die tijdens een onderbreking werden verstuurd zijn mogelijk al verzonden;
+    # die worden bewust niet opnieuw verstuurd
+    sending = Contact.query.filter(Contact.status == SENDING).count()
+    if sending:
+        logger.warning(f"{sending} outreach-berichten staan nog op '{SENDING}' na een onderbreking; "
+                       "controleer ze handmatig.")
+
+def enqueue_outreach(company_ids, methods):
+    """
+    Legt voor elke combinatie van bedrijf en methode een Contact-rij aan en plant de verzending in.
+
+    Alle rijen worden met één bulk-insert aangemaakt, met status 'Queued'.
+
+    Returns:
+        tuple: (batch_id, aantal ingeplande berichten, lijst van onbekende bedrijf-ID's).
+    """
+    found = set()
+    for chunk in _chunks(set(company_ids)):
+        found.update(company_id for (company_id,) in
+                     db.session.query(Company.id).filter(Company.id.in_(chunk)))
+    missing = [company_id for company_id in dict.fromkeys(company_ids) if company_id not in found]
+
+    batch_id = uuid.uuid4().hex
+    rows = [
+        {'company_id': company_id, 'method': method, 'status': QUEUED, 'batch_id': batch_id}
+        for company_id in dict.fromkeys(company_ids) if company_id in found
+        for method in dict.fromkeys(methods)
+    ]
+    if rows:
+        with stage("db_contact"):
+            db.session.execute(insert(Contact), rows)
+            db.session.commit()
+        _executor.submit(_run_batch, batch_id)
+        logger.info(f"Outreach ingepland: {batch_id} met {len(rows)} berichten")
+    return batch_id, len(rows), missing
+
+def _classify_outreach(exc):
+    # Versturen is niet idempotent: een timeout of 5xx kan betekenen dat het bericht al
+    # verstuurd is. Alleen throttling (429) en fouten vóór het versturen (geen verbinding
+    # kunnen opzetten) worden opnieuw geprobeerd. Twilio-fouten hebben een HTTP-status.
+    status = getattr(exc, "status", None)
+    if isinstance(status, int):
+        return status == 429, status == 429, None
+    if isinstance(exc, requests.exceptions.ConnectTimeout):
+        return True, False, None
+    _, throttled, retry_after = classify_error(exc)
+    return throttled, throttled, retry_after
+
+def _dispatch(record, method):
+    channel = METHOD_CHANNELS[method]
+    with stage(f"outreach_{channel}"):
+        call_with_retries(channel, lambda: initiate_contact(record, method),
+                          retries=OUTREACH_RETRIES, classify=_classify_outreach)
+
+def _flush(updates):
+    if not updates:
+        return
+    # ORM bulk update op primaire sleutel: één executemany voor alle rijen
+    with stage("db_contact"):
+        db.session.execute(update(Contact), updates)
+        db.session.commit()
+    updates.clear()
+
+def _run_batch(batch_id):
+    with _app.app_context():
+        try:
+            _dispatch_batch(batch_id)
+        except Exception as e:
+            logger.error(f"Fout bij verwerken van outreach {batch_id}: {e}")
+            db.session.rollback()
+        finally:
+            db.session.remove()
+
+def _dispatch_batch(batch_id):
+    # Claim de hele batch in één UPDATE, zodat een batch nooit door twee processen
+    # (bijv. meerdere workers die bij het starten dezelfde batch inplannen) verstuurd wordt
+    claimed = (
+        Contact.query.filter(Contact.batch_id == batch_id, Contact.status == QUEUED)
+        .update({'status': SENDING}, synchronize_session=False)
+    )
+    db.session.commit()
+    if not claimed:
+        return
+    rows = (
+        db.session.query(Contact.id, Contact.method, Company)
+        .join(Company, Company.id == Contact.company_id)
+        .filter(Contact.batch_id == batch_id, Contact.status == SENDING)
+        .all()
+    )
+    # Gegevens vooraf uitlezen, zodat de workers de databasesessie niet nodig hebben
+    tasks = [(contact_id, method, CompanyRecord.from_company(company)) for contact_id, method, company in rows]
+    db.session.commit()
+    if not tasks:
+        return
+
+    updates = []
+    last_flush = time.monotonic()
+    sent = failed = 0
+    workers = min(OUTREACH_DISPATCH_WORKERS, len(tasks))
+    with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="outreach-send") as executor:
+        futures = {
+            executor.submit(traced(_dispatch), record, method): (contact_id, method, record)
+            for contact_id, method, record in tasks
+        }
+        for future in as_completed(futures):
+            contact_id, method, record = futures[future]
+            try:
+                future.result()
+                updates.append({'id': contact_id, 'status': INITIATED, 'error': None})
+                sent += 1
+            except Exception as e:
+                logger.error(f"Fout bij contact via {method} met '{record.name}': {e}")
+                updates.append({'id': contact_id, 'status': FAILED, 'error': str(e)})
+                failed += 1
+            # Statussen gebundeld wegschrijven zodra ze binnenkomen
+            if time.monotonic() - last_flush >= OUTREACH_FLUSH_INTERVAL:
+                _flush(updates)
+                last_flush = time.monotonic()
+    _flush(updates)
+    logger.info(f"Outreach {batch_id} afgerond: {sent} gestart, {failed} mislukt")
+
+def outreach_status(batch_id):
+    """
+    Geeft de voortgang van een bulkverzoek terug, of None als het niet bestaat.
+
+    Returns:
+        dict: Aantallen per status en per bericht de status en eventuele fout.
+    """
+    contacts = Contact.query.filter_by(batch_id=batch_id).order_by(Contact.id).all()
+    if not contacts:
+        return None
+    counts = {}
+    for contact in contacts:
+        counts[contact.status] = counts.get(contact.status, 0) + 1
+    return {
+        'batch_id': batch_id,
+        'done': counts.get(QUEUED, 0) == 0 and counts.get(SENDING, 0) == 0,
+        'counts': counts,
+        'contacts': [
+            {
+                'id': contact.id,
+                'company_id': contact.company_id,
+                'method': contact.method,
+                'status': contact.status,
+                'error': contact.error
+            }
+            for contact in contacts
+        ]
+    }
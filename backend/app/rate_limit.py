@@ -0,0 +1,159 @@
+# ai-contact-finder/backend/app/rate_limit.py
+
+import os
+import time
+import random
+import logging
+import threading
+from email.utils import parsedate_to_datetime
+import requests
+from googlemaps import exceptions as gmaps_exceptions
+
+logger = logging.getLogger(__name__)
+
+# Standaardinstellingen per provider: verzoeken per seconde, burst, basis- en maximale backoff.
+# Elke waarde is te overschrijven met bijv. GEMINI_RATE_PER_SEC of GOOGLE_SEARCH_BURST.
+PROVIDER_DEFAULTS = {
+    "gemini": {"rate": 2.0, "burst": 2, "base_delay": 1.0, "max_delay": 30.0},
+    "google_maps": {"rate": 10.0, "burst": 10, "base_delay": 0.5, "max_delay": 30.0},
+    "google_search": {"rate": 0.5, "burst": 2, "base_delay": 2.0, "max_delay": 120.0},
+    # Uitgaande contactkanalen voor bulk-outreach
+    "twilio": {"rate": 1.0, "burst": 5, "base_delay": 1.0, "max_delay": 60.0},
+    "email": {"rate": 5.0, "burst": 10, "base_delay": 1.0, "max_delay": 60.0},
+    "linkedin": {"rate": 0.2, "burst": 2, "base_delay": 5.0, "max_delay": 300.0},
+    "twitter": {"rate": 0.5, "burst": 2, "base_delay": 5.0, "max_delay": 300.0},
+    "telegram": {"rate": 1.0, "burst": 5, "base_delay": 1.0, "max_delay": 60.0},
+    "web": {"rate": 10.0, "burst": 10, "base_delay": 0.5, "max_delay": 30.0},
+}
+# Een Retry-After wordt gerespecteerd tot maximaal dit aantal seconden
+MAX_RETRY_AFTER = float(os.getenv("RATE_LIMIT_MAX_RETRY_AFTER", 300))
+
+class RateLimiter:
+    """
+    Token bucket per provider met gedeelde pauze na throttling.
+
+    `acquire()` blokkeert tot er een token vrij is. Na een 429 of Retry-After pauzeert
+    de hele provider, zodat andere threads niet direct opnieuw tegen de limiet lopen.
+    """
+
+    def __init__(self, name, rate, burst, base_delay, max_delay):
+        self.name = name
+        self.rate = rate
+        self.burst = burst
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self._tokens = float(burst)
+        self._updated = time.monotonic()
+        self._blocked_until = 0.0
+        self._lock = threading.Lock()
+
+    def acquire(self):
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+                self._updated = now
+                wait = self._blocked_until - now
+                if wait <= 0:
+                    if self._tokens >= 1:
+                        self._tokens -= 1
+                        return
+                    wait = (1 - self._tokens) / self.rate
+            time.sleep(wait)
+
+    def backoff_delay(self, attempt, base_delay=None):
+        """Exponentiële backoff met jitter: tussen de helft en het geheel van de backoff."""
+        base = self.base_delay if base_delay is None else base_delay
+        delay = min(self.max_delay, base * (2 ** attempt))
+        return delay / 2 + random.uniform(0, delay / 2)
+
+    def pause(self, delay):
+        """Pauzeert alle verzoeken naar deze provider gedurende `delay` seconden."""
+        with self._lock:
+            self._blocked_until = max(self._blocked_until, time.monotonic() + delay)
+
+_limiters = {}
+_limiters_lock = threading.Lock()
+
+def _provider_setting(provider, key, default):
+    value = os.getenv(f"{provider.upper()}_{'RATE_PER_SEC' if key == 'rate' else key.upper()}")
+    return type(default)(value) if value else default
+
+def get_limiter(provider):
+    limiter = _limiters.get(provider)
+    if limiter is None:
+        with _limiters_lock:
+            limiter = _limiters.get(provider)
+            if limiter is None:
+                defaults = PROVIDER_DEFAULTS.get(provider, PROVIDER_DEFAULTS["google_maps"])
+                settings = {key: _provider_setting(provider, key, value) for key, value in defaults.items()}
+                limiter = RateLimiter(provider, **settings)
+                _limiters[provider] = limiter
+    return limiter
+
+def parse_retry_after(value):
+    """Zet een Retry-After-header (seconden of HTTP-datum) om naar seconden."""
+    if not value:
+        return None
+    try:
+        seconds = float(value)
+    except ValueError:
+        try:
+            seconds = parsedate_to_datetime(value).timestamp() - time.time()
+        except (TypeError, ValueError):
+            return None
+    return min(max(seconds, 0.0), MAX_RETRY_AFTER)
+
+def classify_error(exc):
+    """
+    Bepaalt of een fout opnieuw geprobeerd mag worden.
+
+    Returns:
+        tuple: (retryable, throttled, retry_after). `throttled` betekent dat de provider
+        zelf om vertraging vraagt (429 / OVER_QUERY_LIMIT).
+    """
+    if isinstance(exc, requests.exceptions.HTTPError) and exc.response is not None:
+        status = exc.response.status_code
+        retry_after = parse_retry_after(exc.response.headers.get("Retry-After"))
+        if status == 429:
+            return True, True, retry_after
+        return status >= 500, False, retry_after
+    if isinstance(exc, (requests.exceptions.Timeout, requests.exceptions.ConnectionError)):
+        return True, False, None
+    if isinstance(exc, gmaps_exceptions.ApiError):
+        if exc.status == "OVER_QUERY_LIMIT":
+            return True, True, None
+        return exc.status in ("UNKNOWN_ERROR",), False, None
+    if isinstance(exc, gmaps_exceptions.HTTPError):
+        status = exc.status_code
+        return status == 429 or status >= 500, status == 429, None
+    if isinstance(exc, (gmaps_exceptions.Timeout, gmaps_exceptions.TransportError)):
+        return True, False, None
+    return False, False, None
+
+def call_with_retries(provider, fn, retries=3, base_delay=None, classify=classify_error):
+    """
+    Voert `fn()` uit via de rate limiter van `provider`, met retries volgens `classify`.
+
+    Bij throttling pauzeert de hele provider (Retry-After of backoff); bij andere
+    tijdelijke fouten wacht alleen deze aanroep met jittered exponentiële backoff.
+    De laatste fout wordt doorgegeven als alle pogingen mislukken.
+    """
+    limiter = get_limiter(provider)
+    attempts = max(retries, 1)
+    for attempt in range(attempts):
+        limiter.acquire()
+        try:
+            return fn()
+        except Exception as e:
+            retryable, throttled, retry_after = classify(e)
+            if not retryable or attempt == attempts - 1:
+                raise
+            delay = retry_after if retry_after is not None else limiter.backoff_delay(attempt, base_delay)
+            if throttled:
+                logger.warning(f"Rate limit bereikt bij {provider}. Wachten {delay:.1f} seconden...")
+                limiter.pause(delay)
+            else:
+                logger.warning(f"Tijdelijke fout bij {provider} (poging {attempt + 1} van {attempts}): {e}. "
+                               f"Opnieuw proberen in {delay:.1f} seconden...")
+                time.sleep(delay)
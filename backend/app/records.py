@@ -0,0 +1,67 @@
+# ai-contact-finder/backend/app/records.py
+
+from dataclasses import dataclass, fields as dataclass_fields, replace
+from datetime import datetime
+from typing import Optional
+
+@dataclass(slots=True)
+class CompanyRecord:
+    """
+    Eén bedrijf zoals het door de scraper, de opslag en de API loopt.
+
+    Ontbrekende waarden zijn None (nooit NaN), zodat een record zonder opschoning
+    naar JSON en naar de database kan. `contact` is het telefoonnummer uit Google Places.
+    """
+    name: Optional[str] = None
+    place_id: Optional[str] = None
+    address: Optional[str] = None
+    rating: Optional[float] = None
+    contact: Optional[str] = None
+    website: Optional[str] = None
+    contact_form_url: Optional[str] = None
+    linkedin_profile: Optional[str] = None
+    twitter_handle: Optional[str] = None
+    telegram_handle: Optional[str] = None
+    live_chat_url: Optional[str] = None
+    website_etag: Optional[str] = None
+    website_last_modified: Optional[str] = None
+    # 'cached', 'not_modified', 'full' of 'failed'; None als het record niet verrijkt is
+    enrichment: Optional[str] = None
+    # True als de verrijking door de deadline van de zoekopdracht niet (volledig) is uitgevoerd
+    incomplete: bool = False
+    # Alleen gevuld voor records uit de database
+    id: Optional[int] = None
+    last_enriched_at: Optional[datetime] = None
+
+    def updated(self, **changes):
+        """Een kopie met de gegeven velden gewijzigd; het record zelf blijft ongewijzigd."""
+        return replace(self, **changes)
+
+    def to_dict(self, fields=None):
+        """Het record als dictionary, optioneel beperkt tot `fields`."""
+        return {field: getattr(self, field) for field in fields or RECORD_FIELDS}
+
+    @classmethod
+    def from_company(cls, company, **extra):
+        """Bouwt een record uit een `Company`-rij; `extra` vult velden die niet in de tabel staan."""
+        return cls(**{field: getattr(company, field) for field in MODEL_FIELDS}, **extra)
+
+    def to_company(self, **extra):
+        """Bouwt een nieuwe `Company`-rij uit het record; `extra` vult overige kolommen (bijv. city)."""
+        from .models import Company
+        values = {field: getattr(self, field) for field in MODEL_FIELDS if field != 'id'}
+        values.update(extra)
+        return Company(**values)
+
+RECORD_FIELDS = tuple(field.name for field in dataclass_fields(CompanyRecord))
+# Velden van het record die als kolom in de Company-tabel staan
+MODEL_FIELDS = (
+    'id', 'place_id', 'name', 'contact', 'website', 'contact_form_url', 'linkedin_profile',
+    'twitter_handle', 'telegram_handle', 'live_chat_url', 'website_etag', 'website_last_modified',
+    'last_enriched_at',
+)
+# Velden waarmee een opgeslagen bedrijf in API-antwoorden terugkomt
+COMPANY_RESPONSE_FIELDS = (
+    'id', 'name', 'contact', 'contact_form_url', 'linkedin_profile', 'twitter_handle',
+    'telegram_handle', 'live_chat_url', 'incomplete',
+)
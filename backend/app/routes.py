@@ -1,19 +1,36 @@
 # ai-contact-finder/backend/app/routes.py
 
-from flask import request, jsonify
+from flask import Blueprint, current_app, request, jsonify, Response, stream_with_context, g
 from . import db
-from .models import Company, Contact
-from .scraper import hybrid_scraper
-from .contact_tools import initiate_contact
+from .models import Company, Contact, SearchJob
+from .jobs import enqueue_search_job
+from .outreach import enqueue_outreach, outreach_status
+from .scraper import iter_hybrid_scraper, search_criteria, parse_user_inputs
+from .storage import (
+    store_companies, load_enrichment_state, list_companies, LISTING_FIELDS, CHANNEL_COLUMNS
+)
+from .records import CompanyRecord, COMPANY_RESPONSE_FIELDS
+from .export import iter_export, table_columns, parquet_available, EXPORT_TABLES, EXPORT_MIMETYPES
+from .serialization import dumps, loads
+from .contact_tools import initiate_contact, CONTACT_METHODS
+from .metrics import render_metrics, use_trace, stage
 from datetime import datetime
 import logging
 import os
 
 logger = logging.getLogger(__name__)
 
-@app.route('/search', methods=['POST'])
-def search():
-    data = request.get_json()
+# Alle endpoints; wordt in create_app op de app geregistreerd
+bp = Blueprint('api', __name__)
+
+# Maximale tijdsbudget (seconden) dat een client aan een zoekopdracht kan meegeven
+MAX_TIME_BUDGET = int(os.getenv("SEARCH_MAX_TIME_BUDGET", 300))
+
+def _wants_timing():
+    return request.args.get('timing', '').lower() in ('1', 'true', 'yes')
+
+def _validate_search(data):
+    """Geeft een foutmelding terug als de zoekcriteria ongeldig zijn, anders None."""
     city = data.get('city')
     industry = data.get('industry')
     company_types = data.get('company_types', [])
@@ -21,24 +38,36 @@ def search():
 
     # Validatie van verplichte velden
     if not city or not industry:
-        logger.warning("Stad en branche zijn vereist.")
-        return jsonify({'error': 'Stad en branche zijn vereist.'}), 400
+        return 'Stad en branche zijn vereist.'
 
     # Validatie van company_types en areas als lijsten
     if not isinstance(company_types, list):
-        logger.warning("company_types moet een lijst zijn.")
-        return jsonify({'error': 'company_types moet een lijst zijn.'}), 400
+        return 'company_types moet een lijst zijn.'
     if not isinstance(areas, list):
-        logger.warning("areas moet een lijst zijn.")
-        return jsonify({'error': 'areas moet een lijst zijn.'}), 400
+        return 'areas moet een lijst zijn.'
 
     # Validatie van de inhoud van company_types en areas
     if not all(isinstance(ct, str) and ct.strip() for ct in company_types):
-        logger.warning("Alle company_types moeten niet-lege strings zijn.")
-        return jsonify({'error': 'Alle company_types moeten niet-lege strings zijn.'}), 400
+        return 'Alle company_types moeten niet-lege strings zijn.'
     if not all(isinstance(ar, str) and ar.strip() for ar in areas):
-        logger.warning("Alle areas moeten niet-lege strings zijn.")
-        return jsonify({'error': 'Alle areas moeten niet-lege strings zijn.'}), 400
+        return 'Alle areas moeten niet-lege strings zijn.'
+    if data.get('tiling') is not None and not isinstance(data.get('tiling'), bool):
+        return 'tiling moet een boolean zijn.'
+    time_budget = data.get('time_budget')
+    if time_budget is not None:
+        if isinstance(time_budget, bool) or not isinstance(time_budget, (int, float)):
+            return 'time_budget moet een getal zijn.'
+        if not 0 < time_budget <= MAX_TIME_BUDGET:
+            return f'time_budget moet tussen 0 en {MAX_TIME_BUDGET} seconden liggen.'
+    return None
+
+@bp.route('/search', methods=['POST'])
+def search():
+    data = request.get_json() or {}
+    error = _validate_search(data)
+    if error:
+        logger.warning(error)
+        return jsonify({'error': error}), 400
 
     # Scrape bedrijven op basis van stad, branche, bedrijfstypes en gebieden
     google_api_key = os.getenv("GOOGLE_API_KEY")
@@ -46,60 +75,232 @@ def search():
         logger.error("Geen Google API-sleutel gevonden.")
         return jsonify({'error': 'Interne serverfout.'}), 500
 
-    companies_data = hybrid_scraper(city, industry, google_api_key)
+    # Plan de zoekopdracht in; de worker pool voert de scraper op de achtergrond uit
+    job = enqueue_search_job({
+        'city': data['city'],
+        'industry': data['industry'],
+        'company_types': data.get('company_types', []),
+        'areas': data.get('areas', []),
+        'tiling': data.get('tiling'),
+        'time_budget': data.get('time_budget')
+    })
+    return jsonify({'job_id': job.id, 'status': job.status, 'trace_id': job.trace_id}), 202
+
+def _stream_event(payload, stream_format):
+    body = dumps(payload)
+    if stream_format == 'sse':
+        return f"event: {payload['type']}\ndata: {body}\n\n"
+    return body + "\n"
+
+@bp.route('/search/stream', methods=['POST'])
+def search_stream():
+    data = request.get_json() or {}
+    error = _validate_search(data)
+    if error:
+        logger.warning(error)
+        return jsonify({'error': error}), 400
 
-    if not companies_data.get("results"):
-        logger.info(f"Geen bedrijven gevonden voor stad: {city}, branche: {industry}.")
-        return jsonify({'message': 'Geen bedrijven gevonden met de opgegeven criteria.'}), 404
+    stream_format = request.args.get('format', 'ndjson')
+    if stream_format not in {'ndjson', 'sse'}:
+        return jsonify({'error': f'Ongeldig streamformaat: {stream_format}.'}), 400
 
-    companies = []
-    for company_info in companies_data["results"]:
+    google_api_key = os.getenv("GOOGLE_API_KEY")
+    if not google_api_key:
+        logger.error("Geen Google API-sleutel gevonden.")
+        return jsonify({'error': 'Interne serverfout.'}), 500
+
+    criteria = search_criteria(data['city'], data['industry'])
+    trace = g.trace
+    include_timing = _wants_timing()
+    app = current_app._get_current_object()
+
+    def store_late(batch):
+        # Verrijkingen die na de deadline klaar zijn werken de al gestreamde, onvolledige rijen bij
+        with app.app_context():
+            try:
+                store_companies([record for _, record in batch], data['city'], data['industry'])
+            finally:
+                db.session.remove()
+
+    def generate():
+        with use_trace(trace):
+            yield from _generate()
+
+    def _generate():
+        count = incomplete = 0
         try:
-            # Controleer of het bedrijf al bestaat in de database
-            existing_company = Company.query.filter_by(name=company_info.get('name')).first()
-            if not existing_company:
-                # Voeg nieuw bedrijf toe aan de database
-                new_company = Company(
-                    name=company_info.get('name'),
-                    contact=company_info.get('contact'),
-                    contact_form_url=company_info.get('contact_form_url'),
-                    linkedin_profile=company_info.get('linkedin_profile'),
-                    twitter_handle=company_info.get('twitter_handle'),
-                    telegram_handle=company_info.get('telegram_handle'),
-                    live_chat_url=company_info.get('live_chat_url')
-                )
-                db.session.add(new_company)
-                db.session.commit()
-                companies.append({
-                    'id': new_company.id,
-                    'name': new_company.name,
-                    'contact': new_company.contact,
-                    'contact_form_url': new_company.contact_form_url,
-                    'linkedin_profile': new_company.linkedin_profile,
-                    'twitter_handle': new_company.twitter_handle,
-                    'telegram_handle': new_company.telegram_handle,
-                    'live_chat_url': new_company.live_chat_url
-                })
-                logger.info(f"Nieuw bedrijf toegevoegd: {new_company.name}")
-            else:
-                companies.append({
-                    'id': existing_company.id,
-                    'name': existing_company.name,
-                    'contact': existing_company.contact,
-                    'contact_form_url': existing_company.contact_form_url,
-                    'linkedin_profile': existing_company.linkedin_profile,
-                    'twitter_handle': existing_company.twitter_handle,
-                    'telegram_handle': existing_company.telegram_handle,
-                    'live_chat_url': existing_company.live_chat_url
-                })
-                logger.info(f"Bedrijf al bestaand: {existing_company.name}")
+            for event in iter_hybrid_scraper(criteria, google_api_key,
+                                             company_types=data.get('company_types'),
+                                             areas=data.get('areas'),
+                                             tiling=data.get('tiling'),
+                                             lookup_previous=load_enrichment_state,
+                                             time_budget=data.get('time_budget'),
+                                             on_late=store_late):
+                if event['event'] == 'start':
+                    yield _stream_event({'type': 'start', 'total': event['total']}, stream_format)
+                    continue
+                # Sla elke batch afgeronde bedrijven op en stuur ze direct door
+                companies = store_companies([record for _, record in event['results']],
+                                            data['city'], data['industry'])
+                for company in companies:
+                    count += 1
+                    incomplete += company.incomplete
+                    yield _stream_event({'type': 'company', 'company': company.to_dict(COMPANY_RESPONSE_FIELDS)}, stream_format)
         except Exception as e:
-            logger.error(f"Fout bij verwerken van bedrijf '{company_info.get('name', 'onbekend')}': {e}")
-            continue
+            logger.error(f"Fout tijdens streamen van zoekresultaten: {e}")
+            yield _stream_event({'type': 'error', 'error': 'Zoekopdracht mislukt.'}, stream_format)
+            return
+        done = {'type': 'done', 'count': count, 'incomplete': incomplete}
+        if include_timing:
+            done['timing'] = trace.to_dict()
+        yield _stream_event(done, stream_format)
+
+    mimetype = 'text/event-stream' if stream_format == 'sse' else 'application/x-ndjson'
+    return Response(
+        stream_with_context(generate()),
+        mimetype=mimetype,
+        headers={'Cache-Control': 'no-cache', 'X-Accel-Buffering': 'no'}
+    )
+
+@bp.route('/search/<job_id>', methods=['GET'])
+def search_status(job_id):
+    job = SearchJob.query.get(job_id)
+    if not job:
+        logger.warning(f"Zoekopdracht niet gevonden: {job_id}")
+        return jsonify({'error': 'Zoekopdracht niet gevonden.'}), 404
+
+    response = {
+        'job_id': job.id,
+        'status': job.status,
+        'progress': {'processed': job.processed, 'total': job.total}
+    }
+    results = loads(job.results) if job.results else []
+    if job.status == 'completed':
+        if not results:
+            response['message'] = 'Geen bedrijven gevonden met de opgegeven criteria.'
+        response['companies'] = results
+        # Bedrijven die door het tijdsbudget niet (volledig) verrijkt zijn
+        response['incomplete'] = sum(1 for company in results if company.get('incomplete'))
+    elif job.status == 'failed':
+        response['error'] = 'Zoekopdracht mislukt.'
+    else:
+        response['partial_results'] = results
+    if _wants_timing():
+        response['trace_id'] = job.trace_id
+        response['timing'] = loads(job.timing) if job.timing else None
+    return jsonify(response), 200
+
+@bp.route('/metrics', methods=['GET'])
+def metrics():
+    return Response(render_metrics(), mimetype='text/plain; version=0.0.4')
 
-    return jsonify({'companies': companies}), 200
+# Standaard- en maximale paginagrootte voor GET /companies
+COMPANIES_PAGE_SIZE = 50
+MAX_COMPANIES_PAGE_SIZE = 500
 
-@app.route('/contact', methods=['POST'])
+def _csv_arg(name):
+    return [value.strip() for value in request.args.get(name, '').split(',') if value.strip()]
+
+@bp.route('/companies', methods=['GET'])
+def companies():
+    fields = _csv_arg('fields') or list(LISTING_FIELDS)
+    unknown = sorted(set(fields) - set(LISTING_FIELDS))
+    if unknown:
+        return jsonify({'error': f"Onbekende velden: {', '.join(unknown)}."}), 400
+    channels = _csv_arg('has')
+    unknown = sorted(set(channels) - set(CHANNEL_COLUMNS))
+    if unknown:
+        return jsonify({'error': f"Onbekende kanalen: {', '.join(unknown)}."}), 400
+
+    try:
+        limit = int(request.args.get('limit', COMPANIES_PAGE_SIZE))
+        after = request.args.get('after')
+        after = int(after) if after else None
+    except ValueError:
+        return jsonify({'error': 'limit en after moeten gehele getallen zijn.'}), 400
+    if not 1 <= limit <= MAX_COMPANIES_PAGE_SIZE:
+        return jsonify({'error': f'limit moet tussen 1 en {MAX_COMPANIES_PAGE_SIZE} liggen.'}), 400
+
+    results, next_cursor = list_companies(
+        city=request.args.get('city'),
+        industry=request.args.get('industry'),
+        name_prefix=request.args.get('name'),
+        channels=channels,
+        fields=fields,
+        limit=limit,
+        after=after
+    )
+    return jsonify({'companies': results, 'next_cursor': next_cursor}), 200
+
+@bp.route('/export/<table>', methods=['GET'])
+def export(table):
+    if table not in EXPORT_TABLES:
+        return jsonify({'error': f'Onbekende tabel: {table}.'}), 404
+    export_format = request.args.get('format', 'csv')
+    if export_format not in EXPORT_MIMETYPES:
+        return jsonify({'error': f'Ongeldig exportformaat: {export_format}.'}), 400
+    if export_format == 'parquet' and not parquet_available():
+        logger.error("Parquet-export gevraagd, maar pyarrow is niet geïnstalleerd.")
+        return jsonify({'error': 'Parquet-export is niet beschikbaar.'}), 501
+
+    columns = table_columns(table)
+    fields = _csv_arg('fields') or columns
+    unknown = sorted(set(fields) - set(columns))
+    if unknown:
+        return jsonify({'error': f"Onbekende velden: {', '.join(unknown)}."}), 400
+
+    if table == 'companies':
+        channels = _csv_arg('has')
+        unknown = sorted(set(channels) - set(CHANNEL_COLUMNS))
+        if unknown:
+            return jsonify({'error': f"Onbekende kanalen: {', '.join(unknown)}."}), 400
+        filters = {
+            'city': request.args.get('city'),
+            'industry': request.args.get('industry'),
+            'name': request.args.get('name'),
+            'has': channels
+        }
+    else:
+        filters = {
+            'method': request.args.get('method'),
+            'status': request.args.get('status'),
+            'batch_id': request.args.get('batch_id')
+        }
+        try:
+            company_id = request.args.get('company_id')
+            filters['company_id'] = int(company_id) if company_id else None
+            since = request.args.get('since')
+            filters['since'] = datetime.fromisoformat(since) if since else None
+        except ValueError:
+            return jsonify({'error': 'company_id moet een geheel getal en since een ISO-datum zijn.'}), 400
+
+    return Response(
+        stream_with_context(iter_export(table, export_format, fields, filters)),
+        mimetype=EXPORT_MIMETYPES[export_format],
+        headers={'Content-Disposition': f'attachment; filename={table}.{export_format}',
+                 'X-Accel-Buffering': 'no'}
+    )
+
+# Maximaal aantal zoekteksten per batchverzoek
+MAX_PARSE_BATCH = 50
+
+@bp.route('/parse/batch', methods=['POST'])
+def parse_batch():
+    data = request.get_json() or {}
+    queries = data.get('queries')
+
+    if not isinstance(queries, list) or not queries:
+        logger.warning("queries moet een niet-lege lijst zijn.")
+        return jsonify({'error': 'queries moet een niet-lege lijst zijn.'}), 400
+    if not all(isinstance(q, str) and q.strip() for q in queries):
+        logger.warning("Alle queries moeten niet-lege strings zijn.")
+        return jsonify({'error': 'Alle queries moeten niet-lege strings zijn.'}), 400
+    if len(queries) > MAX_PARSE_BATCH:
+        return jsonify({'error': f'Maximaal {MAX_PARSE_BATCH} queries per verzoek.'}), 400
+
+    return jsonify({'results': parse_user_inputs(queries)}), 200
+
+@bp.route('/contact', methods=['POST'])
 def contact():
     data = request.get_json()
     company_id = data.get('company_id')
@@ -116,9 +317,8 @@ def contact():
         return jsonify({'error': 'Bedrijf niet gevonden.'}), 404
 
     # Validatie van contact_method
-    allowed_methods = {'email', 'whatsapp', 'call', 'contact_form', 'linkedin', 'twitter', 'sms', 'telegram', 'live_chat'}
     contact_method_lower = contact_method.lower()
-    if contact_method_lower not in allowed_methods:
+    if contact_method_lower not in CONTACT_METHODS:
         logger.warning(f"Ongeldige contactmethode: {contact_method}")
         return jsonify({'error': f'Ongeldige contactmethode: {contact_method}.'}), 400
 
@@ -132,13 +332,7 @@ def contact():
             logger.info(f"Contactformulier of live chat beschikbaar via {contact_url}")
             return jsonify({'status': 'Contactformulier of Live Chat beschikbaar.', 'contact_url': contact_url}), 200
         else:
-            initiate_contact({
-                'name': company.name,
-                'contact': company.contact,
-                'linkedin_profile': company.linkedin_profile,
-                'twitter_handle': company.twitter_handle,
-                'telegram_handle': company.telegram_handle
-            }, contact_method_lower)
+            initiate_contact(CompanyRecord.from_company(company), contact_method_lower)
             logger.info(f"Contactpoging gestart voor bedrijf ID: {company_id} via {contact_method_lower}")
     except Exception as e:
         logger.error(f"Fout bij het initiëren van contact voor bedrijf ID {company_id}: {e}")
@@ -153,9 +347,49 @@ def contact():
             timestamp=datetime.utcnow()
         )
         db.session.add(contact_log)
-        db.session.commit()
+        with stage("db_contact"):
+            db.session.commit()
         logger.info(f"Contactpoging gelogd voor bedrijf ID: {company_id} via {contact_method_lower}")
     except Exception as e:
         logger.error(f"Fout bij het loggen van contactpoging voor bedrijf ID {company_id}: {e}")
 
     return jsonify({'status': 'Contactpoging succesvol gestart.'}), 200
+
+# Maximaal aantal berichten (bedrijven maal methodes) per bulkverzoek
+MAX_BULK_CONTACTS = int(os.getenv("MAX_BULK_CONTACTS", 1000))
+
+@bp.route('/contact/bulk', methods=['POST'])
+def contact_bulk():
+    data = request.get_json() or {}
+    company_ids = data.get('company_ids')
+    methods = data.get('contact_methods')
+
+    if not isinstance(company_ids, list) or not company_ids:
+        return jsonify({'error': 'company_ids moet een niet-lege lijst zijn.'}), 400
+    if not all(isinstance(company_id, int) and not isinstance(company_id, bool) for company_id in company_ids):
+        return jsonify({'error': 'Alle company_ids moeten gehele getallen zijn.'}), 400
+    if not isinstance(methods, list) or not methods:
+        return jsonify({'error': 'contact_methods moet een niet-lege lijst zijn.'}), 400
+    if not all(isinstance(method, str) for method in methods):
+        return jsonify({'error': 'Alle contact_methods moeten strings zijn.'}), 400
+
+    methods = [method.lower() for method in methods]
+    invalid = sorted(set(methods) - CONTACT_METHODS)
+    if invalid:
+        logger.warning(f"Ongeldige contactmethodes: {invalid}")
+        return jsonify({'error': f"Ongeldige contactmethodes: {', '.join(invalid)}."}), 400
+    if len(set(company_ids)) * len(set(methods)) > MAX_BULK_CONTACTS:
+        return jsonify({'error': f'Maximaal {MAX_BULK_CONTACTS} berichten per verzoek.'}), 400
+
+    batch_id, queued, missing = enqueue_outreach(company_ids, methods)
+    if not queued:
+        return jsonify({'error': 'Geen van de bedrijven gevonden.', 'missing_company_ids': missing}), 404
+    return jsonify({'batch_id': batch_id, 'queued': queued, 'missing_company_ids': missing}), 202
+
+@bp.route('/contact/bulk/<batch_id>', methods=['GET'])
+def contact_bulk_status(batch_id):
+    status = outreach_status(batch_id)
+    if status is None:
+        logger.warning(f"Outreach niet gevonden: {batch_id}")
+        return jsonify({'error': 'Outreach niet gevonden.'}), 404
+    return jsonify(status), 200
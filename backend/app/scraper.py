@@ -1,19 +1,85 @@
 # ai-contact-finder/backend/app/scraper.py
 
 import os
-import time
+import re
+import math
 import json
+import time
 import logging
+import threading
 import requests
-import googlemaps
+from googlemaps import exceptions as gmaps_exceptions
 from bs4 import BeautifulSoup
-from urllib.parse import urljoin
-from functools import lru_cache
+from functools import partial
+from collections import deque
+from datetime import datetime, timedelta
+from concurrent.futures import ThreadPoolExecutor, as_completed, wait, FIRST_COMPLETED
+from .cache import cached_call, peek, store, SingleFlight
+from .http_client import get_session, get_gmaps_client, host_slot
+from .crawler import crawl_site, site_key, CrawlResult, CONTACT_FIELDS
+from .host_health import HostUnavailable
+from .rate_limit import call_with_retries, classify_error
+from .records import CompanyRecord
+from .metrics import stage, traced
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
-def call_gemini_api(prompt, retries=3, backoff=5):
+# Maximaal aantal bedrijven dat tegelijk verrijkt wordt
+ENRICH_MAX_WORKERS = int(os.getenv("SCRAPER_MAX_WORKERS", 8))
+
+# Bewaartermijnen (seconden) voor gecachete Google-responses
+GEOCODE_CACHE_TTL = int(os.getenv("GEOCODE_CACHE_TTL", 30 * 24 * 3600))
+PLACES_CACHE_TTL = int(os.getenv("PLACES_CACHE_TTL", 24 * 3600))
+PLACE_DETAILS_CACHE_TTL = int(os.getenv("PLACE_DETAILS_CACHE_TTL", 7 * 24 * 3600))
+SEARCH_CACHE_TTL = int(os.getenv("SEARCH_CACHE_TTL", 7 * 24 * 3600))
+PARSE_CACHE_TTL = int(os.getenv("PARSE_CACHE_TTL", 30 * 24 * 3600))
+WEBSITE_CACHE_TTL = int(os.getenv("WEBSITE_CACHE_TTL", 24 * 3600))
+
+# Zoekstraal (meters) rond een gebied binnen de stad, en het aantal gelijktijdige Places-zoekopdrachten
+AREA_RADIUS = int(os.getenv("PLACES_AREA_RADIUS", 2000))
+FANOUT_MAX_WORKERS = int(os.getenv("PLACES_FANOUT_WORKERS", 4))
+# Aantal gelijktijdige place_details-aanroepen, los van het aantal zoekopdrachten
+DETAILS_MAX_WORKERS = int(os.getenv("PLACES_DETAILS_WORKERS", 8))
+
+# Tegelmodus: de stad-viewport wordt in een raster verdeeld en verzadigde tegels worden gesplitst
+PLACES_TILING = os.getenv("PLACES_TILING", "False") == "True"
+TILING_INITIAL_GRID = int(os.getenv("PLACES_TILING_GRID", 2))
+TILING_MAX_DEPTH = int(os.getenv("PLACES_TILING_MAX_DEPTH", 3))
+TILING_MAX_TILES = int(os.getenv("PLACES_TILING_MAX_TILES", 64))
+TILING_WORKERS = int(os.getenv("PLACES_TILING_WORKERS", 4))
+# places_nearby levert maximaal 3 pagina's van 20 resultaten en accepteert een straal tot 50 km
+PLACES_RESULT_CAP = 60
+MAX_PLACES_RADIUS = 50000
+METERS_PER_DEGREE = 111320
+
+# Trefwoorden waarmee links uit de zoekresultaten aan een veld gekoppeld worden
+SEARCH_FIELD_KEYWORDS = {
+    "linkedin_profile": ("linkedin",),
+    "twitter_handle": ("twitter",),
+    "telegram_handle": ("telegram",),
+    "live_chat_url": ("livechat", "live-chat"),
+}
+# Velden die via Google Search aangevuld worden als de website ze niet oplevert
+HYBRID_SEARCH_FIELDS = ("linkedin_profile", "twitter_handle", "telegram_handle")
+COMPANY_SEARCH_FIELDS = HYBRID_SEARCH_FIELDS + ("live_chat_url",)
+
+# Zonder eerdere metingen: geschatte duur (seconden) van de verrijking van één plaats. Met een
+# deadline wordt geen nieuwe plaats gestart als de resterende tijd kleiner is dan de (gemeten) duur.
+ENRICH_ESTIMATE = float(os.getenv("ENRICH_ESTIMATE", 1.0))
+ENRICH_ESTIMATE_ALPHA = 0.3
+
+# Bedrijven die korter dan dit aantal seconden geleden verrijkt zijn worden niet opnieuw opgehaald
+ENRICH_MAX_AGE = int(os.getenv("ENRICH_MAX_AGE", 7 * 24 * 3600))
+
+# Zoekpagina voor de Google Search-fallback; te overschrijven voor een lokale stand-in
+GOOGLE_SEARCH_URL = os.getenv("GOOGLE_SEARCH_URL", "https://www.google.com/search")
+
+# Aantal pogingen en basisinterval (seconden) bij het peilen van een next_page_token
+PAGE_TOKEN_POLLS = int(os.getenv("PAGE_TOKEN_POLLS", 6))
+PAGE_TOKEN_POLL_DELAY = float(os.getenv("PAGE_TOKEN_POLL_DELAY", 0.5))
+
+def call_gemini_api(prompt, retries=3, backoff=None, max_tokens=150):
     gemini_api_key = os.getenv("GEMINI_API_KEY")
     gemini_endpoint = os.getenv("GEMINI_ENDPOINT", "https://api.gemini.example.com/v1/generate")
 
@@ -29,29 +95,89 @@ def call_gemini_api(prompt, retries=3, backoff=5):
     payload = {
         "prompt": prompt,
         "model": "gemini-1.5-pro",
-        "max_tokens": 150
+        "max_tokens": max_tokens
     }
 
-    for attempt in range(retries):
-        try:
-            response = requests.post(gemini_endpoint, headers=headers, json=payload, timeout=10)
-            response.raise_for_status()
-            return response.text
-        except requests.exceptions.Timeout:
-            logger.warning(f"Timeout bij poging {attempt + 1} van {retries}. Opnieuw proberen in {backoff} seconden...")
-        except requests.exceptions.RequestException as e:
-            if hasattr(e, 'response') and e.response and e.response.status_code == 429:
-                retry_after = int(e.response.headers.get("Retry-After", backoff))
-                logger.warning(f"Rate limit bereikt. Wachten {retry_after} seconden...")
-                time.sleep(retry_after)
-            else:
-                logger.error(f"RequestException: {e}. Poging {attempt + 1} van {retries}.")
-        time.sleep(backoff)
-
-    logger.error("Alle pogingen om de Gemini API te bereiken zijn mislukt.")
-    return "{}"
+    def request():
+        response = get_session("gemini").post(gemini_endpoint, headers=headers, json=payload, timeout=10)
+        response.raise_for_status()
+        return response.text
 
-def parse_user_input(user_input):
+    try:
+        with stage("gemini"):
+            # Zonder `backoff` geldt de base_delay van de provider (zie rate_limit.PROVIDER_DEFAULTS)
+            return call_with_retries("gemini", request, retries=retries, base_delay=backoff)
+    except requests.exceptions.RequestException as e:
+        logger.error(f"Alle pogingen om de Gemini API te bereiken zijn mislukt: {e}")
+        return "{}"
+
+def search_criteria(city, industry, area=None):
+    """
+    Bouwt de zoekopdracht voor `hybrid_scraper` uit losse, al gevalideerde velden.
+
+    De velden gaan ongewijzigd door; alleen vrije tekst wordt met `parse_user_input`
+    ontleed, zodat een branche als 'bakkers, slagers' niet bij de komma afgekapt wordt.
+    """
+    return {"city": city, "industry": industry, "area": area or "onbekend"}
+
+UNKNOWN_INPUT = {"city": "onbekend", "industry": "onbekend", "area": "onbekend"}
+
+# "<branche> in <stad>" of "<branche> in <stad>, <gebied>"; de stad zonder spaties of na een komma
+_STRUCTURED_INPUT = re.compile(
+    r"^\s*(?P<industry>[^,]+?)\s+in\s+(?P<city>[^\s,]+|[^,]+(?=,))\s*(?:,\s*(?P<area>[^,]+?))?\s*$",
+    re.IGNORECASE
+)
+# "stad: Utrecht, branche: bakkers, gebied: centrum" (ook met = of ; en Engelse sleutels)
+_KEY_VALUE_INPUT = re.compile(r"(?P<key>[a-z]+)\s*[:=]\s*(?P<value>[^,;]+)", re.IGNORECASE)
+_INPUT_KEYS = {
+    "stad": "city", "city": "city",
+    "branche": "industry", "industry": "industry",
+    "gebied": "area", "area": "area",
+}
+
+def normalize_user_input(user_input):
+    """Normaliseert zoektekst voor de cache: kleine letters, enkele spaties, zonder leestekens aan de randen."""
+    return " ".join((user_input or "").lower().split()).strip(" .!?")
+
+def parse_structured_input(user_input):
+    """
+    Ontleedt invoer die al gestructureerd is zonder LLM.
+
+    Returns:
+        dict: `{city, industry, area}`, of None als de invoer niet eenduidig is.
+    """
+    text = (user_input or "").strip()
+    pairs = {
+        _INPUT_KEYS[m.group("key").lower()]: m.group("value").strip()
+        for m in _KEY_VALUE_INPUT.finditer(text)
+        if m.group("key").lower() in _INPUT_KEYS
+    }
+    if "city" in pairs and "industry" in pairs:
+        return {**UNKNOWN_INPUT, **pairs}
+
+    match = _STRUCTURED_INPUT.match(text)
+    if match:
+        return {
+            "city": match.group("city").strip(),
+            "industry": match.group("industry").strip(),
+            "area": (match.group("area") or "onbekend").strip()
+        }
+    return None
+
+def _parsed_from_json(data):
+    if not isinstance(data, dict):
+        return dict(UNKNOWN_INPUT)
+    return {
+        "city": data.get("city", "onbekend"),
+        "industry": data.get("industry", "onbekend"),
+        "area": data.get("area", "onbekend")
+    }
+
+def _is_parsed(parsed):
+    # Alleen succesvol ontlede invoer wordt gecachet
+    return parsed["city"] != "onbekend" or parsed["industry"] != "onbekend"
+
+def _parse_with_gemini(user_input):
     try:
         full_prompt = (
             f"Ontleed de volgende tekst:\n"
@@ -64,28 +190,181 @@ def parse_user_input(user_input):
             "}"
         )
         response = call_gemini_api(full_prompt)
-        data = json.loads(response)
-        return {
-            "city": data.get("city", "onbekend"),
-            "industry": data.get("industry", "onbekend"),
-            "area": data.get("area", "onbekend")
-        }
+        return _parsed_from_json(json.loads(response))
     except Exception as e:
         logger.error(f"Fout bij parse_user_input: {e}")
-        return {"city": "onbekend", "industry": "onbekend", "area": "onbekend"}
+        return dict(UNKNOWN_INPUT)
 
-@lru_cache(maxsize=100)
-def geocode_city(city, api_key):
-    gmaps_client = googlemaps.Client(key=api_key)
+def parse_user_input(user_input):
+    structured = parse_structured_input(user_input)
+    if structured:
+        return structured
+    return cached_call("parse_input", (normalize_user_input(user_input),), PARSE_CACHE_TTL,
+                       lambda: _parse_with_gemini(user_input), should_cache=_is_parsed)
+
+def parse_user_inputs(user_inputs):
+    """
+    Ontleedt meerdere zoekteksten met hooguit één Gemini-aanroep.
+
+    Gestructureerde invoer en gecachete resultaten worden lokaal afgehandeld; de overige
+    unieke teksten gaan samen in één prompt. De resultaten komen in dezelfde volgorde terug.
+
+    Args:
+        user_inputs (list): Lijst van zoekteksten.
+
+    Returns:
+        list: Per zoektekst een dictionary met `city`, `industry` en `area`.
+    """
+    resolved = {}
+    pending = []
+    for user_input in user_inputs:
+        key = normalize_user_input(user_input)
+        if key in resolved or key in pending:
+            continue
+        parsed = parse_structured_input(user_input) or peek("parse_input", key)
+        if parsed:
+            resolved[key] = parsed
+        else:
+            pending.append(key)
+
+    if pending:
+        originals = {}
+        for user_input in user_inputs:
+            originals.setdefault(normalize_user_input(user_input), user_input)
+        lines = "\n".join(f"{i + 1}. \"{originals[key]}\"" for i, key in enumerate(pending))
+        prompt = (
+            "Ontleed elk van de volgende teksten:\n"
+            f"{lines}\n"
+            "Formatteer als JSON-lijst, in dezelfde volgorde, met per tekst:\n"
+            "{\"city\": \"...\", \"industry\": \"...\", \"area\": \"...\"}"
+        )
+        try:
+            data = json.loads(call_gemini_api(prompt, max_tokens=60 * len(pending) + 50))
+            if isinstance(data, dict):
+                data = data.get("results", [])
+        except Exception as e:
+            logger.error(f"Fout bij parse_user_inputs: {e}")
+            data = []
+        for i, key in enumerate(pending):
+            parsed = _parsed_from_json(data[i]) if i < len(data) else dict(UNKNOWN_INPUT)
+            if _is_parsed(parsed):
+                store("parse_input", (key,), parsed, PARSE_CACHE_TTL)
+            resolved[key] = parsed
+
+    return [resolved[normalize_user_input(user_input)] for user_input in user_inputs]
+
+def _geocode(city, api_key):
+    gmaps_client = get_gmaps_client(api_key)
     try:
-        geocode_result = gmaps_client.geocode(city)
+        with stage("geocode"):
+            geocode_result = call_with_retries("google_maps", lambda: gmaps_client.geocode(city))
         if not geocode_result:
             return None
-        return geocode_result[0]["geometry"]["location"]
+        return geocode_result[0]["geometry"]
     except Exception as e:
         logger.error(f"Fout bij geocoding: {e}")
         return None
 
+def geocode_geometry(city, api_key):
+    """Geeft de geometrie (location en viewport) van een plaatsnaam terug, gecachet."""
+    # De cachesleutel bevat bewust geen API-sleutel
+    return cached_call("geocode_geometry", (city.strip().lower(),), GEOCODE_CACHE_TTL,
+                       lambda: _geocode(city, api_key))
+
+def geocode_city(city, api_key):
+    geometry = geocode_geometry(city, api_key)
+    return geometry.get("location") if geometry else None
+
+def _page_token_classify(exc):
+    # Een next_page_token is pas na korte tijd geldig; tot dan geeft Google INVALID_REQUEST
+    if isinstance(exc, gmaps_exceptions.ApiError) and exc.status == "INVALID_REQUEST":
+        return True, False, None
+    return classify_error(exc)
+
+class _PartialPlaces(list):
+    """Resultaten van een places_nearby-zoekopdracht waarvan een volgende pagina mislukte."""
+
+def _places_nearby_all(gmaps_client, latlng, radius, industry):
+    """
+    Haalt alle pagina's van een places_nearby-zoekopdracht op.
+
+    Mislukt een volgende pagina, dan komen de tot dan opgehaalde resultaten als `_PartialPlaces` terug.
+    """
+    places = []
+    with stage("places_nearby"):
+        places_response = call_with_retries("google_maps", lambda: gmaps_client.places_nearby(
+            location=latlng, radius=radius, keyword=industry
+        ))
+    while True:
+        places.extend(places_response.get("results", []))
+
+        next_token = places_response.get("next_page_token")
+        if not next_token:
+            break
+        logger.info("Ophalen van volgende pagina resultaten...")
+
+        try:
+            # Peil tot de token geldig is in plaats van een vaste tijd te wachten
+            with stage("places_nearby_page"):
+                places_response = call_with_retries(
+                    "google_maps",
+                    lambda: gmaps_client.places_nearby(
+                        location=latlng,
+                        radius=radius,
+                        keyword=industry,
+                        page_token=next_token
+                    ),
+                    retries=PAGE_TOKEN_POLLS,
+                    base_delay=PAGE_TOKEN_POLL_DELAY,
+                    classify=_page_token_classify
+                )
+        except Exception as e:
+            logger.error(f"Fout bij volgende pagina: {e}")
+            return _PartialPlaces(places)
+    return places
+
+def _place_details(gmaps_client, place_id):
+    with stage("place_details"):
+        return call_with_retries("google_maps", lambda: gmaps_client.place(place_id=place_id)).get("result", {})
+
+def _nearby_places(gmaps_client, latlng, radius, keyword):
+    """
+    Geeft de ruwe (gecachete) places_nearby-resultaten voor een locatie en trefwoord terug.
+
+    Ook een lege lijst wordt gecachet, zodat lege tegels niet bij elke zoekopdracht opnieuw
+    opgevraagd worden; onvolledige resultaten (zie `_places_nearby_all`) niet.
+    """
+    return cached_call(
+        "places_nearby", (latlng, radius, keyword), PLACES_CACHE_TTL,
+        lambda: _places_nearby_all(gmaps_client, latlng, radius, keyword),
+        should_cache=lambda places: not isinstance(places, _PartialPlaces)
+    )
+
+def _place_record(gmaps_client, place):
+    place_id = place.get("place_id")
+    name = place.get("name")
+    address = place.get("vicinity")
+    rating = place.get("rating")
+    try:
+        details = cached_call(
+            "place_details", (place_id,), PLACE_DETAILS_CACHE_TTL,
+            lambda: _place_details(gmaps_client, place_id)
+        )
+        phone = details.get("formatted_phone_number") or None
+        website = details.get("website") or None
+    except Exception as e:
+        logger.error(f"Fout bij het ophalen van details voor '{name}': {e}")
+        phone, website = None, None
+
+    return CompanyRecord(
+        name=name,
+        place_id=place_id,
+        address=address,
+        rating=rating,
+        contact=phone,
+        website=website
+    )
+
 def scrape_google_places(city, industry, api_key, radius=5000):
     if not api_key:
         logger.warning("Geen Google Places API key.")
@@ -97,122 +376,240 @@ def scrape_google_places(city, industry, api_key, radius=5000):
 
     latlng = (location["lat"], location["lng"])
 
-    results = []
+    gmaps_client = get_gmaps_client(api_key)
     try:
-        gmaps_client = googlemaps.Client(key=api_key)
-        places_response = gmaps_client.places_nearby(
-            location=latlng, radius=radius, keyword=industry
-        )
+        places = _nearby_places(gmaps_client, latlng, radius, industry)
     except Exception as e:
         logger.error(f"Fout bij places_nearby: {e}")
         return []
 
-    while True:
-        for place in places_response.get("results", []):
-            place_id = place.get("place_id")
-            name = place.get("name")
-            address = place.get("vicinity")
-            rating = place.get("rating") or float('nan')
+    if not places:
+        return []
+    workers = min(DETAILS_MAX_WORKERS, len(places))
+    with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="place-details") as executor:
+        return list(executor.map(traced(partial(_place_record, gmaps_client)), places))
+
+def _query_places(gmaps_client, api_key, location_name, radius, keyword):
+    location = geocode_city(location_name, api_key)
+    if not location:
+        logger.error(f"Geocoding mislukt voor locatie: {location_name}")
+        return []
+    return _nearby_places(gmaps_client, (location["lat"], location["lng"]), radius, keyword)
+
+def _split_bbox(bbox, parts):
+    south, west, north, east = bbox
+    lat_step = (north - south) / parts
+    lng_step = (east - west) / parts
+    return [
+        (south + i * lat_step, west + j * lng_step, south + (i + 1) * lat_step, west + (j + 1) * lng_step)
+        for i in range(parts) for j in range(parts)
+    ]
+
+def _tile_circle(bbox):
+    """Geeft het middelpunt en de straal (meters) van de cirkel om een tegel terug."""
+    south, west, north, east = bbox
+    center_lat = (south + north) / 2
+    center_lng = (west + east) / 2
+    height = (north - south) * METERS_PER_DEGREE
+    width = (east - west) * METERS_PER_DEGREE * math.cos(math.radians(center_lat))
+    radius = min(int(math.ceil(math.hypot(height, width) / 2)), MAX_PLACES_RADIUS)
+    # Afgeronde middelpunten geven stabiele cachesleutels, zodat alleen verlopen tegels opnieuw opgehaald worden
+    return (round(center_lat, 6), round(center_lng, 6)), radius
+
+def _tile_places(gmaps_client, bbox, keyword):
+    latlng, radius = _tile_circle(bbox)
+    try:
+        return _nearby_places(gmaps_client, latlng, radius, keyword)
+    except Exception as e:
+        logger.error(f"Fout bij places_nearby voor tegel {latlng}: {e}")
+        return []
+
+def tiled_nearby_places(gmaps_client, api_key, city, keyword):
+    """
+    Doorzoekt de viewport van een stad in tegels, om voorbij de limiet van 60 resultaten te komen.
+
+    De viewport uit de geocoding wordt in een raster verdeeld. Tegels die de resultaatlimiet
+    halen worden in vier kleinere tegels gesplitst (quadtree), tot `TILING_MAX_DEPTH` of
+    `TILING_MAX_TILES` bereikt is. Elke laag tegels wordt parallel opgevraagd en de resultaten
+    worden op `place_id` samengevoegd. Tegelresultaten lopen via de places_nearby-cache.
+
+    Returns:
+        list: Unieke ruwe places_nearby-resultaten, in tegelvolgorde.
+    """
+    geometry = geocode_geometry(city, api_key)
+    if not geometry:
+        logger.error(f"Geocoding mislukt voor stad: {city}")
+        return []
+    viewport = geometry.get("viewport") or geometry.get("bounds")
+    if not viewport:
+        location = geometry["location"]
+        return _nearby_places(gmaps_client, (location["lat"], location["lng"]), 5000, keyword)
+
+    bbox = (viewport["southwest"]["lat"], viewport["southwest"]["lng"],
+            viewport["northeast"]["lat"], viewport["northeast"]["lng"])
+    frontier = _split_bbox(bbox, TILING_INITIAL_GRID)
+    seen = {}
+    tiles_used = 0
+    depth = 0
+    with ThreadPoolExecutor(max_workers=TILING_WORKERS, thread_name_prefix="tiles") as executor:
+        while frontier and tiles_used < TILING_MAX_TILES:
+            frontier = frontier[:TILING_MAX_TILES - tiles_used]
+            tiles_used += len(frontier)
+            results = executor.map(traced(lambda tile: _tile_places(gmaps_client, tile, keyword)), frontier)
+
+            next_frontier = []
+            for tile, places in zip(frontier, results):
+                for place in places:
+                    place_id = place.get("place_id")
+                    if place_id and place_id not in seen:
+                        seen[place_id] = place
+                if len(places) >= PLACES_RESULT_CAP and depth < TILING_MAX_DEPTH:
+                    next_frontier.extend(_split_bbox(tile, 2))
+            frontier = next_frontier
+            depth += 1
+    logger.info(f"Tiling voor {city} ({keyword}): {tiles_used} tegels, {len(seen)} plaatsen")
+    return list(seen.values())
+
+def search_places(city, industry, api_key, company_types=None, areas=None, radius=5000, tiling=None):
+    """
+    Zoekt plaatsen voor elke combinatie van gebied en bedrijfstype, gelijktijdig.
+
+    Elk gebied wordt binnen de stad gegeocodeerd (via de geocode-cache) en met een kleinere
+    straal doorzocht; zonder gebieden wordt rond het stadscentrum gezocht, of met `tiling`
+    de hele viewport van de stad in tegels. Zonder bedrijfstypes wordt op de branche gezocht.
+    Overlappende resultaten worden op `place_id` ontdubbeld terwijl ze binnenkomen, en details
+    worden alleen voor nieuwe plaatsen opgehaald.
+
+    Args:
+        city (str): De stad waarin gezocht wordt.
+        industry (str): De branche waarin gezocht wordt.
+        api_key (str): API-sleutel voor Google Maps/Places.
+        company_types (list): Optionele bedrijfstypes, elk als eigen trefwoord.
+        areas (list): Optionele gebieden binnen de stad.
+        radius (int): Zoekstraal rond het stadscentrum in meters.
+        tiling (bool): Tegelmodus voor drukke steden; standaard `PLACES_TILING`.
+
+    Returns:
+        list: Unieke plaatsen, geordend op de eerste zoekopdracht en positie waarin ze voorkwamen.
+    """
+    tiling = PLACES_TILING if tiling is None else tiling
+    keywords = [t.strip() for t in company_types or [] if t and t.strip()] or [industry]
+    area_names = [a.strip() for a in areas or [] if a and a.strip()]
+    if not area_names and len(keywords) == 1 and not tiling:
+        return scrape_google_places(city, keywords[0], api_key, radius)
+    if not api_key:
+        logger.warning("Geen Google Places API key.")
+        return []
+
+    gmaps_client = get_gmaps_client(api_key)
+    if area_names:
+        queries = [
+            (f"{area}, {city} ({keyword})",
+             partial(_query_places, gmaps_client, api_key, f"{area}, {city}", AREA_RADIUS, keyword))
+            for area in area_names for keyword in keywords
+        ]
+    elif tiling:
+        queries = [
+            (f"{city} ({keyword})", partial(tiled_nearby_places, gmaps_client, api_key, city, keyword))
+            for keyword in keywords
+        ]
+    else:
+        queries = [
+            (f"{city} ({keyword})", partial(_query_places, gmaps_client, api_key, city, radius, keyword))
+            for keyword in keywords
+        ]
+
+    first_seen = {}
+    records = {}
+    workers = min(FANOUT_MAX_WORKERS, len(queries))
+    # Details in een eigen pool: met één zoekopdracht zou de gedeelde pool maar één worker hebben
+    with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="places") as executor, \
+            ThreadPoolExecutor(max_workers=DETAILS_MAX_WORKERS, thread_name_prefix="place-details") as details:
+        query_futures = {executor.submit(traced(query)): index for index, (_, query) in enumerate(queries)}
+        for future in as_completed(query_futures):
+            query_index = query_futures[future]
             try:
-                details = gmaps_client.place(place_id=place_id).get("result", {})
-                phone = details.get("formatted_phone_number") or float('nan')
-                website = details.get("website") or float('nan')
+                places = future.result()
             except Exception as e:
-                logger.error(f"Fout bij het ophalen van details voor '{name}': {e}")
-                phone, website = float('nan'), float('nan')
-
-            results.append({
-                "name": name,
-                "address": address,
-                "rating": rating,
-                "phone": phone,
-                "website": website,
-                "place_id": place_id
-            })
+                logger.error(f"Fout bij places_nearby voor {queries[query_index][0]}: {e}")
+                continue
+            for position, place in enumerate(places):
+                place_id = place.get("place_id")
+                if not place_id:
+                    continue
+                order = (query_index, position)
+                if place_id in first_seen:
+                    first_seen[place_id] = min(first_seen[place_id], order)
+                    continue
+                first_seen[place_id] = order
+                # Details direct ophalen zodra een nieuwe plaats binnenkomt
+                records[place_id] = details.submit(traced(_place_record), gmaps_client, place)
 
-        next_token = places_response.get("next_page_token")
-        if not next_token:
-            break
-        logger.info("Ophalen van volgende pagina resultaten...")
-        time.sleep(2)  # Wachten op de volgende pagina token
+        ordered = sorted(first_seen, key=first_seen.get)
+        return [records[place_id].result() for place_id in ordered]
 
-        try:
-            places_response = gmaps_client.places_nearby(
-                location=latlng,
-                radius=radius,
-                keyword=industry,
-                page_token=next_token
-            )
-        except Exception as e:
-            if isinstance(e, requests.exceptions.HTTPError) and e.response.status_code == 429:
-                retry_after = int(e.response.headers.get("Retry-After", 60))
-                logger.warning(f"Rate limit bereikt. Wachten {retry_after} seconden...")
-                time.sleep(retry_after)
-            else:
-                logger.error(f"Fout bij volgende pagina: {e}")
-            break
-    return results
+# Gelijktijdige crawls van dezelfde website (ketens, of meerdere zoekopdrachten tegelijk) delen één verzoek
+_website_flights = SingleFlight()
+
+def _crawl_shared(url, max_pages=None, etag=None, last_modified=None):
+    """
+    Crawlt een website hooguit één keer tegelijk en hergebruikt recente resultaten.
+
+    Resultaten worden onder `site_key(url)` in de responscache bewaard. Een gecachet resultaat
+    gaat ook voor op een conditioneel verzoek, omdat het recenter is dan de opgeslagen validators.
+    Een 304 wordt niet gecachet: die zegt alleen iets over de validators van deze aanroeper.
+    """
+    key = (site_key(url), max_pages)
+    cached = peek("website", *key)
+    if cached is not None:
+        return CrawlResult(**cached)
 
-def scrape_website(url):
+    def crawl():
+        result = crawl_site(url, max_pages=max_pages, etag=etag, last_modified=last_modified)
+        if not result.not_modified:
+            store("website", key, result._asdict(), WEBSITE_CACHE_TTL)
+        return result
+    return _website_flights.do(key + (etag, last_modified), crawl)
+
+def _scrape_site(url, max_pages=None, etag=None, last_modified=None):
+    """
+    Geeft (gevonden contactvelden, CrawlResult) terug; het CrawlResult is None zonder URL of
+    bij een fout. Velden die niet gevonden zijn ontbreken in de dictionary.
+    """
     if not url:
-        return {
-            "contact_form_url": float('nan'),
-            "linkedin_profile": float('nan'),
-            "twitter_handle": float('nan'),
-            "telegram_handle": float('nan'),
-            "live_chat_url": float('nan')
-        }
+        return {}, None
     try:
-        resp = requests.get(url, timeout=10)
-        resp.raise_for_status()
-        soup = BeautifulSoup(resp.text, "html.parser")
-        data = {
-            "contact_form_url": float('nan'),
-            "linkedin_profile": float('nan'),
-            "twitter_handle": float('nan'),
-            "telegram_handle": float('nan'),
-            "live_chat_url": float('nan')
-        }
-        for link in soup.find_all("a", href=True):
-            href = link["href"]
-            lower_href = href.lower()
-            text_lower = (link.text or "").lower()
-
-            if "contact" in lower_href and ("form" in lower_href or "contact" in text_lower):
-                data["contact_form_url"] = urljoin(url, href)
-            if "linkedin.com" in lower_href:
-                data["linkedin_profile"] = urljoin(url, href)
-            if "twitter.com" in lower_href:
-                data["twitter_handle"] = urljoin(url, href)
-            if "t.me" in lower_href or "telegram.me" in lower_href:
-                data["telegram_handle"] = urljoin(url, href)
-            if "livechat" in lower_href or "live-chat" in lower_href:
-                data["live_chat_url"] = urljoin(url, href)
-
-        return data
+        # De landingspagina plus, binnen het domeinbudget, waarschijnlijke contactpagina's
+        with stage("scrape_website"):
+            crawl = _crawl_shared(url, max_pages=max_pages, etag=etag, last_modified=last_modified)
+        return crawl.found, crawl
+    except HostUnavailable as e:
+        logger.info(f"Website overgeslagen: {e}")
+        return {}, None
     except Exception as e:
         logger.error(f"Fout bij het scrapen van {url}: {e}")
-        return {
-            "contact_form_url": float('nan'),
-            "linkedin_profile": float('nan'),
-            "twitter_handle": float('nan'),
-            "telegram_handle": float('nan'),
-            "live_chat_url": float('nan')
-        }
+        return {}, None
+
+def scrape_website(url, max_pages=None):
+    """Geeft per contactveld de gevonden waarde of None terug."""
+    found, _ = _scrape_site(url, max_pages=max_pages)
+    return {field: found.get(field) for field in CONTACT_FIELDS}
+
+def _search_page(session, params):
+    with host_slot(GOOGLE_SEARCH_URL):
+        r = session.get(GOOGLE_SEARCH_URL, params=params, timeout=10)
+    r.raise_for_status()
+    return r
 
 def google_search(query, num_pages=1):
-    session = requests.Session()
-    session.headers.update({
-        "User-Agent": "Mozilla/5.0",
-        "Accept-Language": "nl-NL,nl;q=0.9,en-US;q=0.8,en;q=0.7"
-    })
+    session = get_session("search")
     results = []
     for page in range(num_pages):
         params = {"q": query, "start": page * 10}
         try:
             logger.info(f"Google zoeken: {query}, pagina {page + 1}")
-            r = session.get("https://www.google.com/search", params=params, timeout=10)
-            r.raise_for_status()
+            with stage("google_search"):
+                r = call_with_retries("google_search", lambda: _search_page(session, params))
             soup = BeautifulSoup(r.text, "html.parser")
             for g in soup.select("div.g"):
                 link = g.select_one("a")
@@ -231,35 +628,273 @@ def find_extras_by_search(name, field):
     for link in links:
         if field in link.lower():
             return link
-    return float('nan')
+    return None
+
+def _is_missing(value):
+    return value is None or value == ""
+
+def search_company_links(name):
+    """Voert één gecombineerde zoekopdracht per bedrijf uit, gememoiseerd op bedrijfsnaam."""
+    query = f'{name} (linkedin OR twitter OR telegram OR "live chat")'
+    return cached_call("company_search", (name.strip().lower(),), SEARCH_CACHE_TTL,
+                       lambda: google_search(query, num_pages=1))
+
+def classify_search_links(links, fields):
+    """Koppelt per veld de eerste link uit de zoekresultaten die bij dat veld past."""
+    found = {}
+    for link in links:
+        lower_link = link.lower()
+        for field in fields:
+            if field not in found and any(keyword in lower_link for keyword in SEARCH_FIELD_KEYWORDS[field]):
+                found[field] = link
+    return found
+
+def find_extras_combined(name, fields):
+    """
+    Zoekt alle ontbrekende velden van een bedrijf met één zoekopdracht.
+
+    Args:
+        name (str): De naam van het bedrijf.
+        fields (list): De ontbrekende velden, bijv. ['linkedin_profile', 'twitter_handle'].
 
-def hybrid_scraper(user_input, google_api_key, scrape_search=True):
-    parsed = parse_user_input(user_input)
+    Returns:
+        dict: Per gevraagd veld de gevonden link of None.
+    """
+    if not name or not fields:
+        return {}
+    found = classify_search_links(search_company_links(name), fields)
+    return {field: found.get(field) for field in fields}
+
+def _result_or_fallback(future, place):
+    try:
+        return future.result()
+    except Exception as e:
+        logger.error(f"Fout bij het verrijken van '{place.name}': {e}")
+        return place
+
+def enrich_places(places, enrich, max_workers=None, on_result=None, priority=None, deadline=None,
+                  on_late=None):
+    """
+    Verrijkt de plaatsen gelijktijdig met `enrich` in een begrensde thread pool.
+
+    De resultaten komen terug in dezelfde volgorde als `places`. Als de verrijking
+    van een plaats mislukt, wordt de plaats zonder websitegegevens teruggegeven
+    zodat de rest van de batch gewoon doorloopt. `on_result(record, done, total)`
+    wordt, indien opgegeven, voor elk afgerond resultaat aangeroepen, in volgorde van
+    afronding. Zie `iter_enrich_places` voor `priority`, `deadline` en `on_late`.
+    """
+    final_data = [None] * len(places)
+    done = 0
+    for batch in iter_enrich_places(places, enrich, max_workers, priority, deadline, on_late):
+        for index, record in batch:
+            final_data[index] = record
+            done += 1
+            if on_result:
+                on_result(record, done, len(places))
+    return final_data
+
+def _finish_late(pending, places, on_late):
+    """Wacht op verrijkingen die na de deadline doorlopen en geeft ze per afgeronde lijst aan `on_late`."""
+    while pending:
+        done, _ = wait(pending, return_when=FIRST_COMPLETED)
+        batch = []
+        for future in done:
+            index = pending.pop(future)
+            batch.append((index, _result_or_fallback(future, places[index])))
+        batch.sort(key=lambda item: item[0])
+        try:
+            on_late(batch)
+        except Exception as e:
+            logger.error(f"Fout bij het verwerken van verrijkingen na de deadline: {e}")
+
+def iter_enrich_places(places, enrich, max_workers=None, priority=None, deadline=None, on_late=None):
+    """
+    Generator-variant van `enrich_places`.
+
+    Levert lijsten van `(index, record)` op zodra de verrijking ervan klaar is, in
+    volgorde van afronding; alles wat tegelijk klaar is komt in dezelfde lijst.
+
+    Plaatsen worden pas gestart als er een worker vrij is, in de volgorde van
+    `priority(place)` (laagste eerst). Met `deadline` (een `time.monotonic()`-tijdstip)
+    wordt geen nieuwe plaats meer gestart als de gemeten duur van een verrijking niet
+    meer past, en wordt bij de deadline niet langer gewacht: de overige plaatsen komen
+    in een laatste lijst terug als onverrijkte records met `incomplete=True`. Lopende
+    verrijkingen maken het op de achtergrond af, zodat hun websites en zoekresultaten
+    in de cache staan voor een volgende zoekopdracht; hetzelfde geldt als de generator
+    vroegtijdig gesloten wordt. Met `on_late` worden bij de deadline ook de plaatsen
+    uit de wachtrij nog gestart, en wordt `on_late(batch)` vanuit een achtergrondthread
+    aangeroepen met lijsten van `(index, record)` zodra die verrijkingen klaar zijn,
+    zodat de aanroeper de onvolledige records kan bijwerken.
+    """
+    if not places:
+        return
+    workers = min(max_workers or ENRICH_MAX_WORKERS, len(places))
+    enrich = traced(enrich)
+    order = range(len(places))
+    queue = deque(sorted(order, key=lambda index: priority(places[index])) if priority else order)
+    estimate = ENRICH_ESTIMATE
+    executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="enrich")
+    pending = {}
+    try:
+        while queue or pending:
+            # Nieuw werk starten zolang er een worker vrij is en het binnen de deadline past
+            while queue and len(pending) < workers and (
+                    deadline is None or deadline - time.monotonic() > estimate):
+                index = queue.popleft()
+                pending[executor.submit(enrich, places[index])] = (index, time.monotonic())
+            if not pending:
+                break
+            timeout = None if deadline is None else max(deadline - time.monotonic(), 0)
+            done, _ = wait(pending, timeout=timeout, return_when=FIRST_COMPLETED)
+            if not done:
+                break
+            batch = []
+            finished = time.monotonic()
+            for future in done:
+                index, started = pending.pop(future)
+                estimate = ENRICH_ESTIMATE_ALPHA * (finished - started) + (1 - ENRICH_ESTIMATE_ALPHA) * estimate
+                batch.append((index, _result_or_fallback(future, places[index])))
+            batch.sort(key=lambda item: item[0])
+            yield batch
+
+        remaining = sorted([index for index, _ in pending.values()] + list(queue))
+        if remaining:
+            logger.info(f"Deadline bereikt: {len(remaining)} van {len(places)} plaatsen niet (volledig) verrijkt")
+            if on_late is not None:
+                late = {future: index for future, (index, _) in pending.items()}
+                while queue:
+                    index = queue.popleft()
+                    late[executor.submit(enrich, places[index])] = index
+                threading.Thread(target=traced(_finish_late), args=(late, places, on_late),
+                                 name="enrich-late", daemon=True).start()
+            yield [(index, places[index].updated(incomplete=True)) for index in remaining]
+    finally:
+        executor.shutdown(wait=False)
+
+def _previous_fields(previous):
+    return {field: getattr(previous, field) or None for field in CONTACT_FIELDS}
+
+def _is_fresh(previous, now=None):
+    enriched_at = previous.last_enriched_at
+    if enriched_at is None:
+        return False
+    now = now or datetime.utcnow()
+    return now - enriched_at < timedelta(seconds=ENRICH_MAX_AGE)
+
+def _enrich_place(place, search_fields=(), previous=None):
+    """
+    Verrijkt een plaats met website- en zoekgegevens.
+
+    Met `previous` (de opgeslagen staat van het bedrijf, zie `storage.load_enrichment_state`)
+    wordt onnodig werk overgeslagen: is het bedrijf recent verrijkt en is de website niet
+    veranderd, dan worden de opgeslagen velden hergebruikt. Is het te oud, dan wordt de
+    landingspagina conditioneel opgehaald; bij een 304 blijven de opgeslagen velden staan.
+    Het veld `enrichment` geeft aan wat er gebeurd is: 'cached', 'not_modified', 'full' of
+    'failed' (de website kon niet opgehaald worden; de opgeslagen gegevens blijven dan staan).
+    """
+    website = place.website
+    etag = last_modified = None
+    if previous and previous.website == website:
+        if _is_fresh(previous):
+            return place.updated(**_previous_fields(previous), enrichment="cached")
+        etag = previous.website_etag
+        last_modified = previous.website_last_modified
+
+    found, crawl = _scrape_site(website, etag=etag, last_modified=last_modified)
+    validators = {
+        "website_etag": crawl.etag if crawl else None,
+        "website_last_modified": crawl.last_modified if crawl else None,
+    }
+    if crawl and crawl.not_modified:
+        logger.info(f"Website ongewijzigd sinds vorige verrijking: {website}")
+        return place.updated(**_previous_fields(previous), **validators, enrichment="not_modified")
+
+    # Zoek naar ontbrekende gegevens via één gecombineerde Google-zoekopdracht
+    missing_fields = [field for field in search_fields if _is_missing(found.get(field))]
+    missing = find_extras_combined(place.name, missing_fields)
+    status = "failed" if website and crawl is None else "full"
+    return place.updated(**{**found, **missing, **validators}, enrichment=status)
+
+def _enrich_priority(place, previous=None):
+    """
+    Sorteersleutel voor de verrijking (laagste eerst): eerst bedrijven die uit de opgeslagen
+    gegevens komen en dus (bijna) niets kosten, dan bedrijven met een website, daarna die
+    met de meeste ontbrekende contactvelden en ten slotte op beoordeling.
+    """
+    if previous and previous.website == place.website and _is_fresh(previous):
+        return (0, 0, 0, 0)
+    source = previous or place
+    missing = sum(1 for field in CONTACT_FIELDS if _is_missing(getattr(source, field)))
+    return (1, 0 if place.website else 1, -missing, -(place.rating or 0))
+
+def _hybrid_places(user_input, google_api_key, company_types=None, areas=None, tiling=None):
+    if isinstance(user_input, dict):
+        parsed = {**UNKNOWN_INPUT, **user_input}
+    else:
+        parsed = parse_user_input(user_input)
     city = parsed["city"]
     industry = parsed["industry"]
-    places_data = scrape_google_places(city, industry, google_api_key)
-    final_data = []
-    for place in places_data:
-        website_data = scrape_website(place.get("website"))
-        missing = {}
-        for key, val in website_data.items():
-            if not val:
-                if key == "linkedin_profile":
-                    found = find_extras_by_search(place["name"], "linkedin")
-                    missing[key] = found if found else float('nan')
-                if key == "twitter_handle":
-                    found = find_extras_by_search(place["name"], "twitter")
-                    missing[key] = found if found else float('nan')
-                if key == "telegram_handle":
-                    found = find_extras_by_search(place["name"], "telegram")
-                    missing[key] = found if found else float('nan')
-        combined = {**place, **website_data, **missing}
-        final_data.append(combined)
+    if not areas and parsed.get("area", "onbekend") != "onbekend":
+        areas = [parsed["area"]]
+    return parsed, search_places(city, industry, google_api_key, company_types, areas, tiling=tiling)
+
+def _hybrid_enricher(scrape_search, places, lookup_previous=None):
+    """
+    Bouwt de verrijkingsfunctie en de prioriteit (zie `_enrich_priority`) voor de hybride scraper.
+
+    `lookup_previous(place_ids)` geeft per place_id de opgeslagen staat terug; het wordt hier,
+    in de aanroepende thread, één keer voor alle plaatsen aangeroepen.
+    """
+    search_fields = HYBRID_SEARCH_FIELDS if scrape_search else ()
+    if lookup_previous is None:
+        return partial(_enrich_place, search_fields=search_fields), _enrich_priority
+    previous = lookup_previous([place.place_id for place in places if place.place_id])
+
+    def enrich(place):
+        return _enrich_place(place, search_fields, previous.get(place.place_id))
+
+    def priority(place):
+        return _enrich_priority(place, previous.get(place.place_id))
+    return enrich, priority
+
+def _deadline(time_budget):
+    return time.monotonic() + time_budget if time_budget else None
+
+def hybrid_scraper(user_input, google_api_key, scrape_search=True, on_result=None,
+                   company_types=None, areas=None, tiling=None, lookup_previous=None, time_budget=None,
+                   on_late=None):
+    """
+    Zoekt en verrijkt bedrijven voor een zoektekst of een zoekopdracht uit `search_criteria`.
+
+    Met `time_budget` (seconden, gerekend vanaf de aanroep) wordt de verrijking op tijd
+    afgebroken; bedrijven die niet verrijkt zijn hebben `incomplete=True`. Hun verrijking
+    loopt op de achtergrond door en komt via `on_late` binnen (zie `iter_enrich_places`).
+    """
+    deadline = _deadline(time_budget)
+    parsed, places_data = _hybrid_places(user_input, google_api_key, company_types, areas, tiling)
+    enrich, priority = _hybrid_enricher(scrape_search, places_data, lookup_previous)
+    final_data = enrich_places(places_data, enrich, on_result=on_result, priority=priority, deadline=deadline,
+                               on_late=on_late)
     return {
         "parsed_input": parsed,
         "results": final_data
     }
 
+def iter_hybrid_scraper(user_input, google_api_key, scrape_search=True, company_types=None, areas=None,
+                        tiling=None, lookup_previous=None, time_budget=None, on_late=None):
+    """
+    Generator-variant van `hybrid_scraper` voor streaming.
+
+    Levert eerst `{"event": "start", "parsed_input": ..., "total": ...}` op en daarna
+    `{"event": "results", "results": [(index, record), ...]}` zodra bedrijven verrijkt zijn.
+    """
+    deadline = _deadline(time_budget)
+    parsed, places_data = _hybrid_places(user_input, google_api_key, company_types, areas, tiling)
+    enrich, priority = _hybrid_enricher(scrape_search, places_data, lookup_previous)
+    yield {"event": "start", "parsed_input": parsed, "total": len(places_data)}
+    for batch in iter_enrich_places(places_data, enrich, priority=priority, deadline=deadline, on_late=on_late):
+        yield {"event": "results", "results": batch}
+
 def scrape_companies(city, industry, company_types, areas, google_api_key):
     """
     Scrapes company information based on the provided search criteria.
@@ -272,32 +907,12 @@ def scrape_companies(city, industry, company_types, areas, google_api_key):
         google_api_key (str): API-sleutel voor Google Maps/Places.
 
     Returns:
-        list: Een lijst van dictionaries met bedrijfsinformatie.
-    """
-    # Scrape bedrijven via Google Places API
-    places_data = scrape_google_places(city, industry, google_api_key)
-    final_data = []
-    for place in places_data:
-        website_data = scrape_website(place.get("website"))
-        # Zoek naar ontbrekende gegevens via Google Search
-        missing = {}
-        if not website_data.get("linkedin_profile"):
-            found = find_extras_by_search(place.get("name"), "linkedin")
-            missing["linkedin_profile"] = found
-        if not website_data.get("twitter_handle"):
-            found = find_extras_by_search(place.get("name"), "twitter")
-            missing["twitter_handle"] = found
-        if not website_data.get("telegram_handle"):
-            found = find_extras_by_search(place.get("name"), "telegram")
-            missing["telegram_handle"] = found
-        if not website_data.get("live_chat_url"):
-            found = find_extras_by_search(place.get("name"), "live chat")
-            missing["live_chat_url"] = found
-
-        # Combineer de gegevens
-        combined = {**place, **website_data, **missing}
-        final_data.append(combined)
-    return final_data
+        list: Een lijst van CompanyRecords met bedrijfsinformatie.
+    """
+    # Scrape bedrijven via Google Places API, per gebied en bedrijfstype
+    places_data = search_places(city, industry, google_api_key, company_types, areas)
+    # Verrijk de bedrijven gelijktijdig met website- en zoekgegevens
+    return enrich_places(places_data, partial(_enrich_place, search_fields=COMPANY_SEARCH_FIELDS))
 
 def scrape_companies_wrapper(city, industry, company_types, areas):
     """
@@ -310,7 +925,7 @@ def scrape_companies_wrapper(city, industry, company_types, areas):
         areas (list): Lijst van gebieden binnen de stad.
 
     Returns:
-        list: Een lijst van dictionaries met bedrijfsinformatie.
+        list: Een lijst van CompanyRecords met bedrijfsinformatie.
     """
     google_api_key = os.getenv("GOOGLE_API_KEY")
     return scrape_companies(city, industry, company_types, areas, google_api_key)
@@ -0,0 +1,54 @@
+# ai-contact-finder/backend/app/serialization.py
+
+import json
+import logging
+from datetime import datetime, date
+from .records import CompanyRecord
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+logger = logging.getLogger(__name__)
+
+def _default(value):
+    if isinstance(value, CompanyRecord):
+        return value.to_dict()
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    raise TypeError(f"Type {type(value).__name__} is niet naar JSON te serialiseren")
+
+def dumps(value):
+    """
+    Serialiseert naar een JSON-string, met orjson als dat geïnstalleerd is.
+
+    orjson serialiseert CompanyRecords (dataclasses) en datetimes zelf; de standaard-json
+    valt terug op `_default`, zodat beide dezelfde uitvoer geven.
+    """
+    if orjson is not None:
+        return orjson.dumps(value, default=_default, option=orjson.OPT_NON_STR_KEYS).decode("utf-8")
+    return json.dumps(value, default=_default, separators=(",", ":"))
+
+def loads(text):
+    if orjson is not None:
+        return orjson.loads(text)
+    return json.loads(text)
+
+def init_json(app):
+    """Laat `jsonify` en `request.get_json` via `dumps` en `loads` lopen."""
+    from flask.json.provider import DefaultJSONProvider
+
+    class FastJSONProvider(DefaultJSONProvider):
+        # Sleutels in invoegvolgorde laten; sorteren kost tijd bij grote resultaten
+        sort_keys = False
+
+        def dumps(self, obj, **kwargs):
+            return dumps(obj)
+
+        def loads(self, s, **kwargs):
+            return loads(s)
+
+    app.json = FastJSONProvider(app)
+    if orjson is None:
+        logger.info("orjson niet geïnstalleerd; JSON loopt via de standaard json-module.")
@@ -0,0 +1,247 @@
+# ai-contact-finder/backend/app/storage.py
+
+import json
+import hashlib
+import logging
+from datetime import datetime
+from sqlalchemy.exc import IntegrityError
+from . import db
+from .models import Company
+from .records import CompanyRecord
+from .metrics import timed
+
+logger = logging.getLogger(__name__)
+
+# Maximaal aantal waarden per IN-clausule (SQLite staat standaard 999 parameters toe)
+IN_CHUNK_SIZE = 500
+
+def _chunks(values, size=IN_CHUNK_SIZE):
+    values = list(values)
+    for i in range(0, len(values), size):
+        yield values[i:i + size]
+
+# Velden die de verrijking oplevert; hierover wordt de content_hash berekend
+ENRICHED_FIELDS = (
+    'contact_form_url',
+    'linkedin_profile',
+    'twitter_handle',
+    'telegram_handle',
+    'live_chat_url',
+)
+# Records met deze markering zijn opnieuw gecontroleerd en krijgen een nieuwe last_enriched_at
+REFRESHED = ('full', 'not_modified')
+
+def content_hash(record):
+    """Stabiele hash van de verrijkte velden, om gewijzigde records te herkennen."""
+    values = [getattr(record, field) for field in ENRICHED_FIELDS]
+    return hashlib.sha256(json.dumps(values).encode('utf-8')).hexdigest()
+
+@timed("db_lookup")
+def load_enrichment_state(place_ids):
+    """
+    Haalt de opgeslagen verrijking op voor de gegeven place_ids.
+
+    Geeft CompanyRecords terug in plaats van modelobjecten, zodat de scraper ze buiten
+    de databasesessie (in worker threads) kan gebruiken.
+
+    Returns:
+        dict: Per place_id een CompanyRecord met de contactvelden, website, validators en `last_enriched_at`.
+    """
+    state = {}
+    for chunk in _chunks(set(place_ids)):
+        for company in Company.query.filter(Company.place_id.in_(chunk)):
+            state[company.place_id] = CompanyRecord.from_company(company)
+    return state
+
+def _apply_enrichment(company, record, now):
+    # Alleen opnieuw gecontroleerde records bijwerken; gecachete records en
+    # foutresultaten zonder 'enrichment' laten de opgeslagen gegevens staan
+    if record.enrichment not in REFRESHED:
+        return
+    digest = content_hash(record)
+    if digest != company.content_hash:
+        for field in ENRICHED_FIELDS:
+            setattr(company, field, getattr(record, field))
+        company.content_hash = digest
+        logger.info(f"Bedrijf bijgewerkt: {company.name}")
+    company.website = record.website
+    company.website_etag = record.website_etag
+    company.website_last_modified = record.website_last_modified
+    company.last_enriched_at = now
+
+def _company_key(record):
+    # Deduplicatie op place_id; zonder place_id valt de naam terug als sleutel
+    return record.place_id or record.name
+
+def _find_existing(results):
+    place_ids = {r.place_id for r in results if r.place_id}
+    names = {r.name for r in results if r.name}
+
+    by_place_id = {}
+    for chunk in _chunks(place_ids):
+        for company in Company.query.filter(Company.place_id.in_(chunk)):
+            by_place_id[company.place_id] = company
+
+    # Bestaande rijen zonder place_id worden (zoals voorheen) op naam gematcht
+    by_name = {}
+    for chunk in _chunks(names):
+        for company in Company.query.filter(Company.name.in_(chunk), Company.place_id.is_(None)):
+            by_name.setdefault(company.name, company)
+    return by_place_id, by_name
+
+def normalize_label(value):
+    """Normaliseert een stad of branche voor opslag en filteren: kleine letters, enkele spaties."""
+    return " ".join(value.lower().split()) if value else None
+
+def _upsert_companies(results, city=None, industry=None):
+    by_place_id, by_name = _find_existing(results)
+    resolved = {}
+    ordered = []
+    now = datetime.utcnow()
+    for record in results:
+        key = _company_key(record)
+        if not key or key in resolved:
+            continue
+        place_id = record.place_id
+        company = by_place_id.get(place_id) if place_id else None
+        if company is None:
+            company = by_name.pop(record.name, None)
+            if company is not None and place_id:
+                company.place_id = place_id
+        if company is None:
+            # Voeg nieuw bedrijf toe aan de database
+            company = record.to_company(city=city, industry=industry)
+            if record.enrichment in REFRESHED:
+                company.content_hash = content_hash(record)
+                company.last_enriched_at = now
+            db.session.add(company)
+            logger.info(f"Nieuw bedrijf toegevoegd: {company.name}")
+        else:
+            logger.info(f"Bedrijf al bestaand: {company.name}")
+            _apply_enrichment(company, record, now)
+            # Oudere rijen zonder telefoonnummer, stad of branche krijgen die van de huidige zoekopdracht
+            company.contact = company.contact or record.contact
+            company.city = company.city or city
+            company.industry = company.industry or industry
+        resolved[key] = company
+        ordered.append((company, record.incomplete))
+
+    # Eén transactie voor de hele batch
+    db.session.commit()
+    return [CompanyRecord.from_company(company, incomplete=incomplete) for company, incomplete in ordered]
+
+@timed("db_store")
+def store_companies(results, city=None, industry=None):
+    """
+    Slaat de gescrapete bedrijven in één batch op en geeft ze terug zoals ze in de database staan.
+
+    Bestaande bedrijven worden met één set-gebaseerde lookup per batch gevonden, nieuwe bedrijven
+    worden samen ingevoegd en alles wordt in één transactie vastgelegd. Opnieuw verrijkte
+    bestaande bedrijven krijgen een nieuwe `last_enriched_at` en, als de content_hash
+    veranderd is, de nieuwe contactvelden. De unieke index op `place_id` bewaakt de
+    deduplicatie; botst een gelijktijdige zoekopdracht daarop, dan wordt de batch opnieuw
+    opgezocht en opgeslagen.
+
+    Args:
+        results (list): Verrijkte CompanyRecords uit de scraper.
+        city (str): De stad van de zoekopdracht, voor het filteren in GET /companies.
+        industry (str): De branche van de zoekopdracht.
+
+    Returns:
+        list: Een lijst van CompanyRecords met de opgeslagen bedrijven, inclusief `id` en `incomplete`.
+    """
+    results = [r for r in results if r.name]
+    if not results:
+        return []
+    city, industry = normalize_label(city), normalize_label(industry)
+    try:
+        return _upsert_companies(results, city, industry)
+    except IntegrityError:
+        db.session.rollback()
+        logger.warning("Gelijktijdige invoeging gedetecteerd, batch wordt opnieuw opgeslagen.")
+        return _upsert_companies(results, city, industry)
+
+# Kolommen die GET /companies kan teruggeven; `id` zit er altijd bij als cursor
+LISTING_FIELDS = (
+    'id', 'name', 'city', 'industry', 'contact', 'website', 'contact_form_url', 'linkedin_profile',
+    'twitter_handle', 'telegram_handle', 'live_chat_url', 'last_enriched_at'
+)
+# Contactkanalen waarop gefilterd kan worden, met de kolom die gevuld moet zijn
+CHANNEL_COLUMNS = {
+    'contact': 'contact',
+    'contact_form': 'contact_form_url',
+    'linkedin': 'linkedin_profile',
+    'twitter': 'twitter_handle',
+    'telegram': 'telegram_handle',
+    'live_chat': 'live_chat_url',
+}
+
+def _prefix_upper_bound(prefix):
+    """
+    De kleinste string die groter is dan alle strings met dit prefix: het laatste teken
+    één codepunt verder. Werkt ook voor tekens buiten het BMP (bijv. emoji); None als er
+    geen bovengrens is.
+    """
+    prefix = prefix.rstrip('\U0010ffff')
+    if not prefix:
+        return None
+    return prefix[:-1] + chr(ord(prefix[-1]) + 1)
+
+def filter_companies(query, city=None, industry=None, name_prefix=None, channels=()):
+    """Past de filters van GET /companies (zie `list_companies`) toe op een query over Company."""
+    if city:
+        query = query.filter(Company.city == normalize_label(city))
+    if industry:
+        query = query.filter(Company.industry == normalize_label(industry))
+    if name_prefix:
+        # Een bereik in plaats van LIKE, zodat de index op name gebruikt wordt (LIKE op een
+        # BINARY-kolom leidt in SQLite tot een volledige scan); hoofdlettergevoelig
+        query = query.filter(Company.name >= name_prefix)
+        upper = _prefix_upper_bound(name_prefix)
+        if upper is not None:
+            query = query.filter(Company.name < upper)
+    for channel in channels:
+        column = getattr(Company, CHANNEL_COLUMNS[channel])
+        query = query.filter(column.isnot(None), column != '')
+    return query
+
+def list_companies(city=None, industry=None, name_prefix=None, channels=(), fields=LISTING_FIELDS,
+                   limit=50, after=None):
+    """
+    Geeft een pagina opgeslagen bedrijven terug, gesorteerd op id.
+
+    Er wordt met keyset-paginering gewerkt (`id > after`) in plaats van OFFSET, zodat elke
+    pagina even snel is, en alleen de gevraagde kolommen worden opgehaald. Filters op stad
+    en branche gebruiken de samengestelde indexen op (city, industry, id), (city, id) en
+    (industry, id); het naamprefix de index op name.
+
+    Args:
+        city (str): Alleen bedrijven uit deze stad.
+        industry (str): Alleen bedrijven uit deze branche.
+        name_prefix (str): Alleen bedrijven waarvan de naam hiermee begint (hoofdlettergevoelig).
+        channels (list): Alleen bedrijven waarvoor al deze kanalen (zie CHANNEL_COLUMNS) bekend zijn.
+        fields (list): Kolommen uit LISTING_FIELDS die teruggegeven worden.
+        limit (int): Maximaal aantal bedrijven.
+        after (int): Het id van het laatste bedrijf van de vorige pagina.
+
+    Returns:
+        tuple: (lijst van dictionaries, cursor voor de volgende pagina of None).
+    """
+    fields = ['id'] + [field for field in dict.fromkeys(fields) if field != 'id']
+    query = db.session.query(*[getattr(Company, field) for field in fields])
+    query = filter_companies(query, city, industry, name_prefix, channels)
+    if after is not None:
+        query = query.filter(Company.id > after)
+
+    # Eén rij extra om te weten of er nog een volgende pagina is
+    rows = query.order_by(Company.id).limit(limit + 1).all()
+    has_more = len(rows) > limit
+    rows = rows[:limit]
+    companies = []
+    for row in rows:
+        company = dict(zip(fields, row))
+        if company.get('last_enriched_at') is not None:
+            company['last_enriched_at'] = company['last_enriched_at'].isoformat()
+        companies.append(company)
+    next_cursor = rows[-1][0] if has_more else None
+    return companies, next_cursor
@@ -0,0 +1,124 @@
+# ai-contact-finder/backend/benchmarks/bench_link_extraction.py
+"""
+Vergelijkt de link-extractie-engines met de oorspronkelijke BeautifulSoup-implementatie.
+
+Gebruik (vanuit de backend-map):
+    python -m benchmarks.bench_link_extraction [--corpus DIR] [--repeat N] [--synthetic N]
+
+Het corpus bestaat uit opgeslagen HTML-pagina's (*.html). Met --synthetic worden daarnaast
+grote homepagina's met N ankers gegenereerd, om het gedrag op zware pagina's te meten.
+"""
+
+import os
+import sys
+import time
+import argparse
+import statistics
+from urllib.parse import urljoin
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.extraction import ENGINES  # noqa: E402
+
+try:
+    from bs4 import BeautifulSoup
+except ImportError:
+    BeautifulSoup = None
+
+DEFAULT_CORPUS = os.path.join(os.path.dirname(os.path.abspath(__file__)), "corpus")
+BASE_URL = "https://www.voorbeeld.example/"
+
+def extract_links_legacy(html, url):
+    """De oorspronkelijke lus uit scrape_website, als referentie."""
+    soup = BeautifulSoup(html, "html.parser")
+    data = {}
+    for link in soup.find_all("a", href=True):
+        href = link["href"]
+        lower_href = href.lower()
+        text_lower = (link.text or "").lower()
+
+        if "contact" in lower_href and ("form" in lower_href or "contact" in text_lower):
+            data["contact_form_url"] = urljoin(url, href)
+        if "linkedin.com" in lower_href:
+            data["linkedin_profile"] = urljoin(url, href)
+        if "twitter.com" in lower_href:
+            data["twitter_handle"] = urljoin(url, href)
+        if "t.me" in lower_href or "telegram.me" in lower_href:
+            data["telegram_handle"] = urljoin(url, href)
+        if "livechat" in lower_href or "live-chat" in lower_href:
+            data["live_chat_url"] = urljoin(url, href)
+    return data
+
+def synthetic_page(anchors):
+    parts = ["<html><head><title>Synthetisch</title></head><body><nav>"]
+    for i in range(anchors):
+        parts.append(f'<div class="item"><a href="/producten/{i}?ref=menu">Product <b>{i}</b></a>'
+                     f"<p>Omschrijving van product {i} met wat tekst.</p></div>")
+    parts.append('<a href="/contact">Contact</a>')
+    parts.append('<a href="https://www.linkedin.com/company/synthetisch">LinkedIn</a>')
+    parts.append('<a href="https://twitter.com/synthetisch">Twitter</a>')
+    parts.append("</nav></body></html>")
+    return "".join(parts)
+
+def load_corpus(directory, synthetic):
+    pages = []
+    if os.path.isdir(directory):
+        for name in sorted(os.listdir(directory)):
+            if name.endswith((".html", ".htm")):
+                with open(os.path.join(directory, name), encoding="utf-8", errors="replace") as f:
+                    pages.append((name, f.read()))
+    if synthetic:
+        pages.append((f"synthetisch-{synthetic}", synthetic_page(synthetic)))
+    return pages
+
+def bench(extractor, pages, repeat):
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for _, html in pages:
+            extractor(html, BASE_URL)
+        timings.append(time.perf_counter() - start)
+    return timings
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--corpus", default=DEFAULT_CORPUS, help="Map met opgeslagen HTML-pagina's")
+    parser.add_argument("--repeat", type=int, default=20, help="Aantal herhalingen per engine")
+    parser.add_argument("--synthetic", type=int, default=2000,
+                        help="Aantal ankers in een gegenereerde grote pagina (0 om over te slaan)")
+    args = parser.parse_args()
+
+    pages = load_corpus(args.corpus, args.synthetic)
+    if not pages:
+        print(f"Geen pagina's gevonden in {args.corpus}")
+        return 1
+    total_bytes = sum(len(html.encode("utf-8")) for _, html in pages)
+    print(f"Corpus: {len(pages)} pagina's, {total_bytes / 1024:.0f} KiB, {args.repeat} herhalingen\n")
+
+    extractors = dict(ENGINES)
+    if BeautifulSoup is not None:
+        extractors = {"legacy-bs4": extract_links_legacy, **extractors}
+    else:
+        print("beautifulsoup4 niet geïnstalleerd; de oorspronkelijke implementatie wordt overgeslagen.\n")
+
+    # Controleer eerst dat alle engines dezelfde links vinden
+    reference_name, reference = next(iter(extractors.items()))
+    for name, html in pages:
+        expected = reference(html, BASE_URL)
+        for engine, extractor in extractors.items():
+            result = extractor(html, BASE_URL)
+            if result != expected:
+                print(f"VERSCHIL op {name}: {engine}={result} {reference_name}={expected}")
+
+    baseline = None
+    print(f"{'engine':<12} {'mediaan':>10} {'min':>10} {'pagina/s':>10} {'versnelling':>12}")
+    for engine, extractor in extractors.items():
+        timings = bench(extractor, pages, args.repeat)
+        median = statistics.median(timings)
+        baseline = baseline or median
+        print(f"{engine:<12} {median * 1000:>8.2f}ms {min(timings) * 1000:>8.2f}ms "
+              f"{len(pages) / median:>10.0f} {baseline / median:>11.1f}x")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
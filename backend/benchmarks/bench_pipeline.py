@@ -0,0 +1,332 @@
+# ai-contact-finder/backend/benchmarks/bench_pipeline.py
+"""
+Meet de scraper-pipeline en de Flask-endpoints tegen lokale stand-ins (zie benchmarks.fakes).
+
+Gebruik (vanuit de backend-map):
+    python -m benchmarks.bench_pipeline [--scenario website,pipeline,search,stream,parse]
+                                        [--runs N] [--concurrency N] [--places N] [--sites N]
+                                        [--profile DIENST:latency_ms=80,failure_rate=0.01]
+                                        [--time-budget SECONDEN]
+                                        [--json UIT.json] [--baseline VORIGE.json]
+
+Per scenario worden doorvoer, p50/p95/p99-latentie, de tijd in de database en het aantal
+verzoeken per nagebootste dienst gerapporteerd. Met --json wordt het resultaat bewaard, en
+met --baseline wordt het vergeleken met een eerdere run.
+
+Scenario's:
+    website   scrape_website op één bedrijfswebsite per run
+    pipeline  hybrid_scraper plus store_companies, zoals een zoekjob dat doet
+    search    POST /search en pollen van GET /search/<job_id> tot de job klaar is
+    stream    POST /search/stream, met de tijd tot het eerste bedrijf apart gemeten
+    parse     POST /parse/batch met vrije zoekteksten (via de Gemini-stand-in)
+"""
+
+import os
+import sys
+import json
+import time
+import logging
+import argparse
+import tempfile
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks.fakes import FakeServices, ServiceProfile, SERVICES, parse_profile  # noqa: E402
+
+SCENARIOS = ("website", "pipeline", "search", "stream", "parse")
+# Stand-ins reageren direct; zonder ruime limieten meet de benchmark de rate limiters
+BENCH_ENV_DEFAULTS = {
+    "SCRAPER_PER_HOST_LIMIT": "64",
+    # Alle nagebootste websites delen één host; de pool moet de limiet per host kunnen bevatten
+    "HTTP_POOL_MAXSIZE": "64",
+    "GEMINI_RATE_PER_SEC": "1000",
+    "GEMINI_BURST": "1000",
+    "GOOGLE_MAPS_RATE_PER_SEC": "1000",
+    "GOOGLE_MAPS_BURST": "1000",
+    "GOOGLE_SEARCH_RATE_PER_SEC": "1000",
+    "GOOGLE_SEARCH_BURST": "1000",
+    "SEARCH_JOB_PROGRESS_INTERVAL": "0.2",
+}
+POLL_INTERVAL = 0.02
+
+def percentile(values, pct):
+    """Percentiel met lineaire interpolatie over gesorteerde waarden."""
+    if not values:
+        return float("nan")
+    ordered = sorted(values)
+    rank = (len(ordered) - 1) * pct / 100
+    low = int(rank)
+    high = min(low + 1, len(ordered) - 1)
+    return ordered[low] + (ordered[high] - ordered[low]) * (rank - low)
+
+class DbTimer:
+    """Telt de tijd en het aantal queries op een SQLAlchemy-engine, over alle threads."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._local = threading.local()
+        self.seconds = 0.0
+        self.queries = 0
+
+    def attach(self, engine):
+        from sqlalchemy import event
+        event.listen(engine, "before_cursor_execute", self._before)
+        event.listen(engine, "after_cursor_execute", self._after)
+
+    def _before(self, conn, cursor, statement, parameters, context, executemany):
+        self._local.start = time.perf_counter()
+
+    def _after(self, conn, cursor, statement, parameters, context, executemany):
+        elapsed = time.perf_counter() - getattr(self._local, "start", time.perf_counter())
+        with self._lock:
+            self.seconds += elapsed
+            self.queries += 1
+
+    def reset(self):
+        with self._lock:
+            self.seconds = 0.0
+            self.queries = 0
+
+def run_scenario(name, task, runs, concurrency, services, db_timer):
+    """
+    Voert `task(i)` `runs` keer uit met `concurrency` threads.
+
+    `task` geeft optioneel een dictionary met extra metingen per run terug (bijv. 'first').
+    """
+    latencies = []
+    extra = {}
+    errors = 0
+    lock = threading.Lock()
+
+    def timed(i):
+        nonlocal errors
+        start = time.perf_counter()
+        try:
+            measured = task(i) or {}
+        except Exception as e:
+            logging.getLogger(__name__).warning(f"Fout in scenario {name}, run {i}: {e}")
+            with lock:
+                errors += 1
+            return
+        elapsed = time.perf_counter() - start
+        with lock:
+            latencies.append(elapsed)
+            for key, value in measured.items():
+                extra.setdefault(key, []).append(value)
+
+    services.reset()
+    db_timer.reset()
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency, thread_name_prefix=f"bench-{name}") as executor:
+        list(executor.map(timed, range(runs)))
+    wall = time.perf_counter() - start
+
+    result = {
+        "scenario": name,
+        "runs": runs,
+        "errors": errors,
+        "wall_s": wall,
+        "throughput": len(latencies) / wall if wall else 0.0,
+        "p50_ms": percentile(latencies, 50) * 1000,
+        "p95_ms": percentile(latencies, 95) * 1000,
+        "p99_ms": percentile(latencies, 99) * 1000,
+        "max_ms": max(latencies) * 1000 if latencies else float("nan"),
+        "db_s": db_timer.seconds,
+        "db_queries": db_timer.queries,
+        "requests": services.snapshot(),
+    }
+    for key, values in extra.items():
+        result[f"{key}_p50_ms"] = percentile(values, 50) * 1000
+        result[f"{key}_p95_ms"] = percentile(values, 95) * 1000
+    return result
+
+def build_tasks(app, services, args):
+    from app import db
+    from app.scraper import scrape_website, hybrid_scraper, search_criteria
+    from app.storage import store_companies, load_enrichment_state
+
+    api_key = os.environ["GOOGLE_API_KEY"]
+
+    def city(scenario, i):
+        # Elke run van elk scenario een eigen stad, zodat scenario's en runs elkaars opgeslagen
+        # plaatsen niet hergebruiken en de verrijking echt gemeten wordt
+        return "Benchstad" if args.same_city else f"Benchstad {scenario} {i}"
+
+    def search_payload(scenario, i):
+        payload = {"city": city(scenario, i), "industry": args.industry}
+        if args.time_budget:
+            payload["time_budget"] = args.time_budget
+        return payload
+
+    def website(i):
+        scrape_website(services.site_url(i))
+
+    def pipeline(i):
+        with app.app_context():
+            try:
+                data = hybrid_scraper(search_criteria(city("pipeline", i), args.industry), api_key,
+                                      lookup_previous=load_enrichment_state, time_budget=args.time_budget)
+                store_companies(data["results"], city("pipeline", i), args.industry)
+            finally:
+                db.session.remove()
+
+    def search(i):
+        client = app.test_client()
+        response = client.post("/search", json=search_payload("search", i))
+        if response.status_code != 202:
+            raise RuntimeError(f"POST /search gaf {response.status_code}")
+        job_id = response.get_json()["job_id"]
+        while True:
+            status = client.get(f"/search/{job_id}").get_json()
+            if status["status"] == "failed":
+                raise RuntimeError(status.get("error") or "job mislukt")
+            if status["status"] == "completed":
+                return
+            time.sleep(POLL_INTERVAL)
+
+    def stream(i):
+        client = app.test_client()
+        start = time.perf_counter()
+        first = None
+        response = client.post("/search/stream", json=search_payload("stream", i), buffered=False)
+        buffer = ""
+        try:
+            for chunk in response.response:
+                buffer += chunk.decode("utf-8") if isinstance(chunk, bytes) else chunk
+                lines = buffer.split("\n")
+                buffer = lines.pop()
+                for line in filter(str.strip, lines):
+                    event = json.loads(line)
+                    if event.get("type") == "company" and first is None:
+                        first = time.perf_counter() - start
+                    elif event.get("type") == "error":
+                        raise RuntimeError(event.get("error"))
+        finally:
+            response.close()
+        return {"first": first} if first is not None else {}
+
+    def parse(i):
+        inputs = [f"{args.industry} in Benchstad {i}-{n}, centrum" for n in range(args.parse_batch)]
+        response = app.test_client().post("/parse/batch", json={"queries": inputs})
+        if response.status_code != 200:
+            raise RuntimeError(f"POST /parse/batch gaf {response.status_code}")
+
+    return {"website": website, "pipeline": pipeline, "search": search, "stream": stream, "parse": parse}
+
+def print_results(results, baseline=None):
+    previous = {r["scenario"]: r for r in (baseline or {}).get("results", [])}
+    print(f"{'scenario':<10} {'runs':>5} {'fout':>5} {'per s':>8} {'p50':>9} {'p95':>9} {'p99':>9} "
+          f"{'db':>8} {'queries':>8}")
+    for r in results:
+        print(f"{r['scenario']:<10} {r['runs']:>5} {r['errors']:>5} {r['throughput']:>8.2f} "
+              f"{r['p50_ms']:>7.0f}ms {r['p95_ms']:>7.0f}ms {r['p99_ms']:>7.0f}ms "
+              f"{r['db_s']:>7.2f}s {r['db_queries']:>8}")
+        if "first_p50_ms" in r:
+            print(f"{'':<10} eerste bedrijf: p50 {r['first_p50_ms']:.0f}ms, p95 {r['first_p95_ms']:.0f}ms")
+        requests = ", ".join(f"{service}={count}" for service, count in sorted(r["requests"].items()))
+        print(f"{'':<10} verzoeken: {requests or 'geen'}")
+        old = previous.get(r["scenario"])
+        if old:
+            deltas = []
+            for key in ("throughput", "p50_ms", "p95_ms", "p99_ms", "db_s"):
+                if old.get(key):
+                    deltas.append(f"{key} {100 * (r[key] - old[key]) / old[key]:+.1f}%")
+            print(f"{'':<10} t.o.v. baseline: {', '.join(deltas)}")
+
+def parse_args():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--scenario", default=",".join(SCENARIOS),
+                        help="Kommagescheiden scenario's (standaard alle)")
+    parser.add_argument("--runs", type=int, default=10, help="Aantal runs per scenario")
+    parser.add_argument("--concurrency", type=int, default=2, help="Aantal gelijktijdige runs")
+    parser.add_argument("--places", type=int, default=20, help="Plaatsen per places_nearby-zoekopdracht (max. 60)")
+    parser.add_argument("--sites", type=int, default=50, help="Aantal verschillende bedrijfswebsites")
+    parser.add_argument("--industry", default="bakkers", help="Branche waarop gezocht wordt")
+    parser.add_argument("--parse-batch", type=int, default=10, help="Zoekteksten per /parse/batch-verzoek")
+    parser.add_argument("--time-budget", type=float,
+                        help="Tijdsbudget (seconden) per zoekopdracht in pipeline, search en stream")
+    parser.add_argument("--same-city", action="store_true",
+                        help="Alle runs in dezelfde stad, om caches en incrementeel scrapen te meten")
+    parser.add_argument("--latency-ms", type=float, default=20, help="Standaardlatentie van alle diensten")
+    parser.add_argument("--jitter-ms", type=float, default=5, help="Standaardjitter van alle diensten")
+    parser.add_argument("--failure-rate", type=float, default=0.0, help="Standaardaandeel 500-responses")
+    parser.add_argument("--throttle-rate", type=float, default=0.0, help="Standaardaandeel 429-responses")
+    parser.add_argument("--profile", action="append", default=[], metavar="DIENST:INSTELLINGEN",
+                        help=f"Profiel per dienst ({', '.join(SERVICES)}), bijv. sites:latency_ms=120")
+    parser.add_argument("--cache", default="none", choices=("none", "memory", "sqlite"),
+                        help="Responscache tijdens de benchmark")
+    parser.add_argument("--real-rate-limits", action="store_true",
+                        help="Gebruik de echte rate limits per provider in plaats van ruime limieten")
+    parser.add_argument("--json", help="Schrijf de resultaten als JSON naar dit bestand")
+    parser.add_argument("--baseline", help="Vergelijk met een eerder met --json bewaarde run")
+    parser.add_argument("--log-level", default="WARNING", help="Logniveau van de app tijdens de benchmark")
+    return parser.parse_args()
+
+def main():
+    args = parse_args()
+    scenarios = [s.strip() for s in args.scenario.split(",") if s.strip()]
+    unknown = set(scenarios) - set(SCENARIOS)
+    if unknown:
+        print(f"Onbekende scenario's: {', '.join(sorted(unknown))}")
+        return 1
+
+    # Vóór het importeren van de app, zodat de logging van de modules niet alles overstemt
+    logging.basicConfig(level=args.log_level)
+
+    default_profile = ServiceProfile(args.latency_ms, args.jitter_ms, args.failure_rate, args.throttle_rate)
+    profiles = {service: default_profile for service in SERVICES}
+    for spec in args.profile:
+        service, _, settings = spec.partition(":")
+        if service not in SERVICES:
+            print(f"Onbekende dienst: {service}")
+            return 1
+        profiles[service] = parse_profile(settings, base=default_profile)
+
+    workdir = tempfile.mkdtemp(prefix="bench-")
+    services = FakeServices(sites=args.sites, places_per_query=args.places, profiles=profiles).start()
+    try:
+        # De app leest zijn configuratie bij het importeren, dus de omgeving eerst instellen
+        os.environ.update(services.env())
+        os.environ["DATABASE_URL"] = f"sqlite:///{os.path.join(workdir, 'bench.sqlite')}"
+        os.environ["RESPONSE_CACHE_BACKEND"] = args.cache
+        os.environ["RESPONSE_CACHE_PATH"] = os.path.join(workdir, "cache.sqlite")
+        if not args.real_rate_limits:
+            for key, value in BENCH_ENV_DEFAULTS.items():
+                os.environ.setdefault(key, value)
+
+        from app import create_app, db
+        app = create_app()
+        db_timer = DbTimer()
+        with app.app_context():
+            db_timer.attach(db.engine)
+
+        tasks = build_tasks(app, services, args)
+        print(f"Stand-ins op {services.base_url}; {args.runs} runs per scenario, "
+              f"{args.concurrency} gelijktijdig, {args.places} plaatsen per zoekopdracht\n")
+        results = []
+        for name in scenarios:
+            results.append(run_scenario(name, tasks[name], args.runs, args.concurrency, services, db_timer))
+
+        baseline = None
+        if args.baseline:
+            with open(args.baseline, encoding="utf-8") as f:
+                baseline = json.load(f)
+        print_results(results, baseline)
+
+        if args.json:
+            report = {
+                "created_at": time.strftime("%Y-%m-%dT%H:%M:%S"),
+                "settings": {key: value for key, value in vars(args).items() if key not in ("json", "baseline")},
+                "results": results,
+            }
+            with open(args.json, "w", encoding="utf-8") as f:
+                json.dump(report, f, indent=2)
+            print(f"\nResultaten opgeslagen in {args.json}")
+    finally:
+        services.stop()
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
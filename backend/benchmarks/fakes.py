@@ -0,0 +1,325 @@
+# ai-contact-finder/backend/benchmarks/fakes.py
+"""
+Lokale stand-ins voor de externe diensten van de scraper, voor benchmarks zonder live API's.
+
+Eén HTTP-server bedient:
+    /maps/api/geocode/json             Geocoding (location en viewport)
+    /maps/api/place/nearbysearch/json  Places nearby, met pagina's van 20 en next_page_token
+    /maps/api/place/details/json       Place details, met een website op deze server
+    /gemini                            Gemini-endpoint dat de zoektekst als JSON teruggeeft
+    /search                            Google-zoekresultatenpagina met div.g-resultaten
+    /sites/<n>/...                     Bedrijfswebsites op basis van het HTML-corpus
+
+Per dienst ('maps', 'gemini', 'search', 'sites') zijn latentie, jitter, het aandeel
+serverfouten (500) en het aandeel throttling (429) in te stellen.
+"""
+
+import os
+import re
+import json
+import time
+import random
+import hashlib
+import threading
+from dataclasses import dataclass
+from collections import Counter
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlparse, parse_qs
+
+DEFAULT_CORPUS = os.path.join(os.path.dirname(os.path.abspath(__file__)), "corpus")
+SERVICES = ("maps", "gemini", "search", "sites")
+PAGE_SIZE = 20
+
+@dataclass
+class ServiceProfile:
+    """Gedrag van één nagebootste dienst."""
+    latency_ms: float = 0.0
+    jitter_ms: float = 0.0
+    failure_rate: float = 0.0
+    throttle_rate: float = 0.0
+
+    def delay(self):
+        jitter = random.uniform(-self.jitter_ms, self.jitter_ms) if self.jitter_ms else 0.0
+        return max(self.latency_ms + jitter, 0.0) / 1000
+
+    def injected_status(self):
+        roll = random.random()
+        if roll < self.throttle_rate:
+            return 429
+        if roll < self.throttle_rate + self.failure_rate:
+            return 500
+        return None
+
+def parse_profile(spec, base=None):
+    """
+    Leest een profiel als 'latency_ms=80,jitter_ms=20,failure_rate=0.01,throttle_rate=0'.
+
+    Ontbrekende waarden worden uit `base` overgenomen.
+    """
+    values = dict(vars(base)) if base else {}
+    for part in filter(None, (p.strip() for p in spec.split(","))):
+        key, _, value = part.partition("=")
+        if key not in ServiceProfile.__dataclass_fields__:
+            raise ValueError(f"Onbekende profielinstelling: {key}")
+        values[key] = float(value)
+    return ServiceProfile(**values)
+
+def _digest(*parts):
+    return hashlib.sha1("|".join(map(str, parts)).encode("utf-8")).hexdigest()
+
+def _load_corpus(directory):
+    pages = []
+    if os.path.isdir(directory):
+        for name in sorted(os.listdir(directory)):
+            if name.endswith((".html", ".htm")):
+                with open(os.path.join(directory, name), encoding="utf-8", errors="replace") as f:
+                    pages.append(f.read())
+    return pages or ['<html><body><a href="/contact">Contact</a></body></html>']
+
+_CONTACT_PAGE = """<!DOCTYPE html>
+<html lang="nl"><head><meta charset="utf-8"><title>Contact</title></head>
+<body>
+  <h1>Neem contact op</h1>
+  <a href="/sites/{n}/contactformulier">Contactformulier</a>
+  <a href="https://t.me/bedrijf{n}">Telegram</a>
+  <a href="/sites/{n}/live-chat">Live chat</a>
+</body></html>
+"""
+
+_SERP_RESULT = '<div class="g"><a href="{url}"><h3>{title}</h3></a></div>'
+
+class _Server(ThreadingHTTPServer):
+    daemon_threads = True
+    request_queue_size = 128
+
+class FakeServices:
+    """
+    Start de stand-ins op een vrije poort in een achtergrondthread.
+
+    Alle websites draaien op dezelfde host; zet daarom `SCRAPER_PER_HOST_LIMIT` en
+    `HTTP_POOL_MAXSIZE` ruim, anders meet de benchmark vooral de limiet per host en het
+    opnieuw opbouwen van verbindingen die niet in de pool passen.
+
+    Args:
+        sites (int): Aantal verschillende bedrijfswebsites.
+        places_per_query (int): Aantal resultaten per places_nearby-zoekopdracht (max. 60).
+        profiles (dict): `ServiceProfile` per dienst; ontbrekende diensten reageren direct.
+        corpus (str): Map met HTML-pagina's die als homepagina gebruikt worden.
+        host (str): Adres waarop de server luistert.
+    """
+
+    def __init__(self, sites=50, places_per_query=PAGE_SIZE, profiles=None, corpus=DEFAULT_CORPUS,
+                 host="127.0.0.1"):
+        self.sites = sites
+        self.places_per_query = min(places_per_query, 60)
+        self.profiles = {service: ServiceProfile() for service in SERVICES}
+        self.profiles.update(profiles or {})
+        self.corpus = _load_corpus(corpus)
+        self.requests = Counter()
+        self._lock = threading.Lock()
+        self._server = _Server((host, 0), _make_handler(self))
+        self._thread = None
+
+    @property
+    def base_url(self):
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def env(self):
+        """Omgevingsvariabelen waarmee de app deze stand-ins gebruikt."""
+        return {
+            "GOOGLE_API_KEY": "AIzaBenchmarkKey",
+            "GOOGLE_MAPS_BASE_URL": self.base_url,
+            "GEMINI_API_KEY": "benchmark",
+            "GEMINI_ENDPOINT": f"{self.base_url}/gemini",
+            "GOOGLE_SEARCH_URL": f"{self.base_url}/search",
+        }
+
+    def site_url(self, n):
+        return f"{self.base_url}/sites/{n % self.sites}/"
+
+    def start(self):
+        self._thread = threading.Thread(target=self._server.serve_forever, name="fake-services", daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._server.shutdown()
+        self._server.server_close()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
+
+    def count(self, service):
+        with self._lock:
+            self.requests[service] += 1
+
+    def snapshot(self):
+        with self._lock:
+            return dict(self.requests)
+
+    def reset(self):
+        with self._lock:
+            self.requests.clear()
+
+    # Antwoorden per dienst; elk geeft (status, content_type, body, extra headers) terug
+
+    def geocode(self, query):
+        address = query.get("address", [""])[0]
+        digest = int(_digest("geocode", address)[:8], 16)
+        lat = 51.5 + (digest % 10000) / 10000
+        lng = 4.0 + (digest // 10000 % 10000) / 5000
+        geometry = {
+            "location": {"lat": lat, "lng": lng},
+            "viewport": {
+                "northeast": {"lat": lat + 0.05, "lng": lng + 0.08},
+                "southwest": {"lat": lat - 0.05, "lng": lng - 0.08},
+            },
+        }
+        return self._json({"status": "OK", "results": [{"formatted_address": address, "geometry": geometry}]})
+
+    def nearby(self, query):
+        token = query.get("pagetoken", [None])[0]
+        if token:
+            location, keyword, offset = json.loads(bytes.fromhex(token).decode("utf-8"))
+        else:
+            location, keyword, offset = query.get("location", [""])[0], query.get("keyword", [""])[0], 0
+        prefix = _digest("nearby", location, keyword)[:12]
+        end = min(offset + PAGE_SIZE, self.places_per_query)
+        results = [
+            {
+                "place_id": f"fake-{prefix}-{i}",
+                "name": f"{keyword.title() or 'Bedrijf'} {prefix[:4]}-{i}",
+                "vicinity": f"Teststraat {i + 1}",
+                "rating": round(3 + (i % 20) / 10, 1),
+            }
+            for i in range(offset, end)
+        ]
+        response = {"status": "OK", "results": results}
+        if end < self.places_per_query:
+            response["next_page_token"] = json.dumps([location, keyword, end]).encode("utf-8").hex()
+        return self._json(response)
+
+    def details(self, query):
+        place_id = (query.get("placeid") or query.get("place_id") or [""])[0]
+        n = int(_digest("site", place_id)[:8], 16)
+        result = {
+            "place_id": place_id,
+            "formatted_phone_number": f"030 {n % 1000000:06d}",
+            # Een deel van de bedrijven heeft geen website, zoals in het echt
+            "website": self.site_url(n) if n % 10 else None,
+        }
+        return self._json({"status": "OK", "result": result})
+
+    def gemini(self, body):
+        prompt = json.loads(body or b"{}").get("prompt", "")
+        texts = re.findall(r'^\d+\. "(.*)"$', prompt, re.MULTILINE)
+        if not texts:
+            texts = re.findall(r'"(.*)"', prompt)[:1]
+            return self._json(self._parse_text(texts[0] if texts else ""))
+        return self._json([self._parse_text(text) for text in texts])
+
+    @staticmethod
+    def _parse_text(text):
+        industry, _, rest = text.partition(" in ")
+        city, _, area = rest.partition(",")
+        return {
+            "city": city.strip() or "Utrecht",
+            "industry": industry.strip() or "bedrijven",
+            "area": area.strip() or "onbekend",
+        }
+
+    def serp(self, query):
+        q = query.get("q", [""])[0]
+        slug = _digest("serp", q)[:8]
+        links = [
+            (f"https://www.linkedin.com/company/{slug}", "LinkedIn"),
+            (f"https://twitter.com/{slug}", "Twitter"),
+            (f"https://t.me/{slug}", "Telegram"),
+            (f"https://www.voorbeeld.example/{slug}", "Website"),
+        ]
+        results = "".join(_SERP_RESULT.format(url=url, title=title) for url, title in links)
+        return 200, "text/html; charset=utf-8", f"<html><body>{results}</body></html>".encode("utf-8"), {}
+
+    def site(self, path, headers):
+        parts = path.strip("/").split("/", 2)
+        n = int(parts[1]) if len(parts) > 1 and parts[1].isdigit() else 0
+        etag = f'"site-{n}"'
+        if len(parts) > 2 and parts[2]:
+            html = _CONTACT_PAGE.format(n=n)
+        else:
+            if headers.get("If-None-Match") == etag:
+                return 304, None, b"", {"ETag": etag}
+            # Maak absolute paden relatief aan de site, zodat de crawler binnen de site blijft
+            html = self.corpus[n % len(self.corpus)].replace('href="/', f'href="/sites/{n}/')
+        return 200, "text/html; charset=utf-8", html.encode("utf-8"), {"ETag": etag}
+
+    @staticmethod
+    def _json(data):
+        return 200, "application/json", json.dumps(data).encode("utf-8"), {}
+
+def _make_handler(services):
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+        # Headers en body gaan als aparte writes over een keep-alive-verbinding; met Nagle en
+        # delayed ACK kost dat ~40 ms per verzoek, wat de benchmark dan in plaats van de pipeline meet
+        disable_nagle_algorithm = True
+
+        def _route(self, body=None):
+            url = urlparse(self.path)
+            query = parse_qs(url.query)
+            if url.path.startswith("/maps/api/geocode/"):
+                return "maps", lambda: services.geocode(query)
+            if url.path.startswith("/maps/api/place/nearbysearch/"):
+                return "maps", lambda: services.nearby(query)
+            if url.path.startswith("/maps/api/place/details/"):
+                return "maps", lambda: services.details(query)
+            if url.path == "/gemini":
+                return "gemini", lambda: services.gemini(body)
+            if url.path == "/search":
+                return "search", lambda: services.serp(query)
+            if url.path.startswith("/sites/"):
+                return "sites", lambda: services.site(url.path, self.headers)
+            return None, None
+
+        def _handle(self, body=None):
+            service, respond = self._route(body)
+            if service is None:
+                return self._send(404, "text/plain", b"niet gevonden", {})
+            services.count(service)
+            profile = services.profiles[service]
+            delay = profile.delay()
+            if delay:
+                time.sleep(delay)
+            status = profile.injected_status()
+            if status == 429:
+                return self._send(429, "text/plain", b"te veel verzoeken", {"Retry-After": "1"})
+            if status:
+                return self._send(status, "text/plain", b"serverfout", {})
+            return self._send(*respond())
+
+        def _send(self, status, content_type, body, headers):
+            self.send_response(status)
+            if content_type:
+                self.send_header("Content-Type", content_type)
+            for key, value in headers.items():
+                self.send_header(key, value)
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            if body:
+                self.wfile.write(body)
+
+        def do_GET(self):
+            self._handle()
+
+        def do_POST(self):
+            length = int(self.headers.get("Content-Length") or 0)
+            self._handle(self.rfile.read(length) if length else b"")
+
+        def log_message(self, format, *args):
+            pass
+
+    return Handler
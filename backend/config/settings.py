@@ -1,26 +1,73 @@
 import os
 import json
+import logging
+import threading
+
+logger = logging.getLogger(__name__)
 
 # Pad naar secrets.json
-SECRETS_FILE = os.path.join(os.path.dirname(__file__), 'secrets.json')
+SECRETS_FILE = os.getenv('SECRETS_FILE', os.path.join(os.path.dirname(__file__), 'secrets.json'))
+# Met SECRETS_AUTO_RELOAD=True wordt het bestand opnieuw gelezen zodra het gewijzigd is
+SECRETS_AUTO_RELOAD = os.getenv('SECRETS_AUTO_RELOAD', 'False') == 'True'
+
+# Namen die als module-attribuut beschikbaar zijn, bijv. `from config.settings import TWILIO_SID`
+SECRET_NAMES = (
+    "TWILIO_SID",
+    "TWILIO_AUTH_TOKEN",
+    "TWILIO_PHONE_NUMBER",
+    "LINKEDIN_API_KEY",
+    "TWITTER_API_KEY",
+    "TELEGRAM_API_KEY",
+)
+
+_secrets = None
+_secrets_mtime = None
+_lock = threading.Lock()
+
+def _file_mtime():
+    try:
+        return os.path.getmtime(SECRETS_FILE)
+    except OSError:
+        return None
 
 def load_secrets():
+    """
+    Leest secrets.json. Een ontbrekend bestand levert een lege configuratie op, zodat
+    processen die geen secrets nodig hebben (zoals scrapers) gewoon starten.
+    """
     try:
         with open(SECRETS_FILE, 'r') as f:
             secrets = json.load(f)
         return secrets
     except FileNotFoundError:
-        raise Exception(f"Configuratiebestand niet gevonden: {SECRETS_FILE}")
+        logger.warning(f"Configuratiebestand niet gevonden: {SECRETS_FILE}")
+        return {}
     except json.JSONDecodeError as e:
         raise Exception(f"Fout bij het parsen van configuratiebestand: {e}")
 
-# Laden van secrets
-SECRETS = load_secrets()
+def get_secrets():
+    """Geeft de secrets terug; het bestand wordt pas bij het eerste gebruik gelezen."""
+    global _secrets, _secrets_mtime
+    if _secrets is not None and not (SECRETS_AUTO_RELOAD and _file_mtime() != _secrets_mtime):
+        return _secrets
+    with _lock:
+        if _secrets is None or (SECRETS_AUTO_RELOAD and _file_mtime() != _secrets_mtime):
+            _secrets_mtime = _file_mtime()
+            _secrets = load_secrets()
+    return _secrets
+
+def reload_secrets():
+    """Leest secrets.json opnieuw bij het volgende gebruik."""
+    global _secrets
+    with _lock:
+        _secrets = None
+
+def get_secret(name, default=None):
+    """Een secret uit de omgeving of, als die ontbreekt, uit secrets.json."""
+    return os.getenv(name) or get_secrets().get(name, default)
 
-# Toegang tot de API-sleutels en andere gevoelige gegevens
-TWILIO_SID = SECRETS.get("TWILIO_SID")
-TWILIO_AUTH_TOKEN = SECRETS.get("TWILIO_AUTH_TOKEN")
-TWILIO_PHONE_NUMBER = SECRETS.get("TWILIO_PHONE_NUMBER")
-LINKEDIN_API_KEY = SECRETS.get("LINKEDIN_API_KEY")
-TWITTER_API_KEY = SECRETS.get("TWITTER_API_KEY")
-TELEGRAM_API_KEY = SECRETS.get("TELEGRAM_API_KEY")
+def __getattr__(name):
+    # Toegang tot de API-sleutels en andere gevoelige gegevens, pas bij gebruik geladen
+    if name in SECRET_NAMES:
+        return get_secret(name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
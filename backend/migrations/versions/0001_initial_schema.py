@@ -0,0 +1,50 @@
+"""Basisschema: company en contact
+
+Revision ID: 0001
+Revises:
+Create Date: 2026-10-18 12:00:00
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '0001'
+down_revision = None
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # Databases die eerder met db.create_all() zijn aangemaakt hebben deze tabellen al
+    tables = sa.inspect(op.get_bind()).get_table_names()
+    if 'company' not in tables:
+        op.create_table(
+            'company',
+            sa.Column('id', sa.Integer(), nullable=False),
+            sa.Column('name', sa.String(length=100), nullable=False),
+            sa.Column('contact', sa.String(length=100), nullable=True),
+            sa.Column('contact_form_url', sa.String(length=255), nullable=True),
+            sa.Column('linkedin_profile', sa.String(length=255), nullable=True),
+            sa.Column('twitter_handle', sa.String(length=100), nullable=True),
+            sa.Column('telegram_handle', sa.String(length=100), nullable=True),
+            sa.Column('live_chat_url', sa.String(length=255), nullable=True),
+            sa.PrimaryKeyConstraint('id'),
+        )
+    if 'contact' not in tables:
+        op.create_table(
+            'contact',
+            sa.Column('id', sa.Integer(), nullable=False),
+            sa.Column('company_id', sa.Integer(), nullable=False),
+            sa.Column('method', sa.String(length=50), nullable=False),
+            sa.Column('status', sa.String(length=50), nullable=False),
+            sa.Column('timestamp', sa.DateTime(), nullable=True),
+            sa.ForeignKeyConstraint(['company_id'], ['company.id']),
+            sa.PrimaryKeyConstraint('id'),
+        )
+
+
+def downgrade():
+    op.drop_table('contact')
+    op.drop_table('company')
@@ -0,0 +1,111 @@
+"""place_id, verrijkingsstatus, stad/branche, contactbatches en de search_job-tabel
+
+Revision ID: 0002
+Revises: 0001
+Create Date: 2026-10-18 12:05:00
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '0002'
+down_revision = '0001'
+branch_labels = None
+depends_on = None
+
+# Functies in plaats van constanten: een Column hoort bij één tabel en wordt per gebruik opnieuw gebouwd
+def _company_columns():
+    return [
+        sa.Column('place_id', sa.String(length=255), nullable=True),
+        sa.Column('website', sa.String(length=255), nullable=True),
+        sa.Column('website_etag', sa.String(length=255), nullable=True),
+        sa.Column('website_last_modified', sa.String(length=64), nullable=True),
+        sa.Column('content_hash', sa.String(length=64), nullable=True),
+        sa.Column('last_enriched_at', sa.DateTime(), nullable=True),
+        sa.Column('city', sa.String(length=100), nullable=True),
+        sa.Column('industry', sa.String(length=100), nullable=True),
+    ]
+
+# (naam, kolommen, unique)
+COMPANY_INDEXES = (
+    ('ix_company_place_id', ['place_id'], True),
+    ('ix_company_name', ['name'], False),
+    ('ix_company_last_enriched_at', ['last_enriched_at'], False),
+    ('ix_company_city_industry_id', ['city', 'industry', 'id'], False),
+    ('ix_company_city_id', ['city', 'id'], False),
+    ('ix_company_industry_id', ['industry', 'id'], False),
+)
+
+def _contact_columns():
+    return [
+        sa.Column('batch_id', sa.String(length=32), nullable=True),
+        sa.Column('error', sa.Text(), nullable=True),
+    ]
+
+def _search_job_columns():
+    return [
+        sa.Column('trace_id', sa.String(length=64), nullable=True),
+        sa.Column('timing', sa.Text(), nullable=True),
+        sa.Column('worker_id', sa.String(length=128), nullable=True),
+        sa.Column('heartbeat_at', sa.DateTime(), nullable=True),
+    ]
+
+
+def _add_missing_columns(inspector, table, columns):
+    # db.create_all() kan de tabel al in een tussenliggende versie hebben aangemaakt
+    existing = {column['name'] for column in inspector.get_columns(table)}
+    for column in columns:
+        if column.name not in existing:
+            op.add_column(table, column)
+
+
+def _create_missing_indexes(inspector, table, indexes):
+    existing = {index['name'] for index in inspector.get_indexes(table)}
+    for name, columns, unique in indexes:
+        if name not in existing:
+            op.create_index(name, table, columns, unique=unique)
+
+
+def upgrade():
+    inspector = sa.inspect(op.get_bind())
+
+    _add_missing_columns(inspector, 'company', _company_columns())
+    _create_missing_indexes(inspector, 'company', COMPANY_INDEXES)
+
+    _add_missing_columns(inspector, 'contact', _contact_columns())
+    _create_missing_indexes(inspector, 'contact', (('ix_contact_batch_id', ['batch_id'], False),))
+
+    if 'search_job' in inspector.get_table_names():
+        _add_missing_columns(inspector, 'search_job', _search_job_columns())
+    else:
+        op.create_table(
+            'search_job',
+            sa.Column('id', sa.String(length=32), nullable=False),
+            sa.Column('status', sa.String(length=20), nullable=False),
+            sa.Column('params', sa.Text(), nullable=False),
+            sa.Column('processed', sa.Integer(), nullable=False),
+            sa.Column('total', sa.Integer(), nullable=True),
+            sa.Column('results', sa.Text(), nullable=True),
+            sa.Column('error', sa.Text(), nullable=True),
+            *_search_job_columns(),
+            sa.Column('created_at', sa.DateTime(), nullable=True),
+            sa.Column('updated_at', sa.DateTime(), nullable=True),
+            sa.PrimaryKeyConstraint('id'),
+        )
+
+
+def downgrade():
+    op.drop_table('search_job')
+
+    with op.batch_alter_table('contact') as batch_op:
+        batch_op.drop_index('ix_contact_batch_id')
+        for column in reversed(_contact_columns()):
+            batch_op.drop_column(column.name)
+
+    with op.batch_alter_table('company') as batch_op:
+        for name, _, _ in reversed(COMPANY_INDEXES):
+            batch_op.drop_index(name)
+        for column in reversed(_company_columns()):
+            batch_op.drop_column(column.name)
@@ -0,0 +1,33 @@
+from datetime import datetime
+
+import pytest
+
+from app.export import _csv_value, _iter_csv
+
+
+@pytest.mark.parametrize("value", [
+    "=HYPERLINK(\"http://voorbeeld.example\")",
+    "+31 30 123 4567",
+    "-2+3",
+    "@SUM(A1:A2)",
+    "\t=1+1",
+    "\r=1+1",
+])
+def test_csv_value_escapes_formula_prefixes(value):
+    assert _csv_value(value) == "'" + value
+
+
+@pytest.mark.parametrize("value, expected", [
+    ("Bakkerij de Korenbloem", "Bakkerij de Korenbloem"),
+    ("https://voorbeeld.example/contact", "https://voorbeeld.example/contact"),
+    (None, ""),
+    (42, 42),
+    (datetime(2024, 5, 1, 12, 30), "2024-05-01T12:30:00"),
+])
+def test_csv_value_leaves_other_values(value, expected):
+    assert _csv_value(value) == expected
+
+
+def test_iter_csv_escapes_only_cells():
+    chunks = list(_iter_csv(["name", "contact"], [[("=cmd", "+31 6"), ("Kapper", None)]]))
+    assert "".join(chunks) == "name,contact\r\n'=cmd,'+31 6\r\nKapper,\r\n"
@@ -0,0 +1,21 @@
+from app.storage import _prefix_upper_bound
+
+
+def _matches(name, prefix):
+    upper = _prefix_upper_bound(prefix)
+    return name >= prefix and (upper is None or name < upper)
+
+
+def test_prefix_upper_bound_increments_last_character():
+    assert _prefix_upper_bound("Bak") == "Bal"
+
+
+def test_prefix_range_includes_names_outside_the_bmp():
+    assert _matches("Bakker \U0001F950", "Bakker ")
+    assert _matches("Bakker\U0001F950", "Bakker")
+    assert not _matches("Bakkes", "Bakker")
+
+
+def test_prefix_upper_bound_without_successor():
+    assert _prefix_upper_bound("\U0010ffff") is None
+    assert _prefix_upper_bound("a\U0010ffff") == "b"
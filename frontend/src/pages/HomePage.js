@@ -1,7 +1,6 @@
 // ai-contact-finder/frontend/src/pages/HomePage.js
 import React, { useState } from 'react';
 import { useNavigate } from 'react-router-dom';
-import { searchCompanies } from '../utils/api';
 
 function HomePage() {
   const navigate = useNavigate();
@@ -12,7 +11,7 @@ function HomePage() {
   const [areas, setAreas] = useState('');
   const [error, setError] = useState('');
 
-  const handleSearch = async (e) => {
+  const handleSearch = (e) => {
     e.preventDefault();
     setError('');
 
@@ -24,25 +23,17 @@ function HomePage() {
       return;
     }
 
-    try {
-      const data = await searchCompanies({
-        city,
-        industry,
-        company_types: ctArr,
-        areas: arArr,
-      });
-
-      if (data.error) {
-        setError(data.error);
-      } else if (data.message) {
-        setError(data.message); // bijv. "Geen bedrijven gevonden..."
-      } else if (data.companies) {
-        localStorage.setItem('searchResults', JSON.stringify(data.companies));
-        navigate('/results');
-      }
-    } catch (err) {
-      setError('Er ging iets fout bij het zoeken.');
-    }
+    // De resultatenpagina streamt de bedrijven binnen zodra ze gevonden zijn
+    navigate('/results', {
+      state: {
+        search: {
+          city,
+          industry,
+          company_types: ctArr,
+          areas: arArr,
+        },
+      },
+    });
   };
 
   return (
@@ -1,18 +1,63 @@
 // ai-contact-finder/frontend/src/pages/ResultPage.js
 import React, { useState, useEffect } from 'react';
+import { useLocation } from 'react-router-dom';
 import ContactForm from '../components/ContactForm';
-import { contactCompany } from '../utils/api';
+import { contactCompany, streamSearch } from '../utils/api';
 
 function ResultPage() {
+  const location = useLocation();
+  const search = location.state && location.state.search;
+
   const [companies, setCompanies] = useState([]);
   const [feedback, setFeedback] = useState('');
+  const [loading, setLoading] = useState(false);
+  const [total, setTotal] = useState(null);
 
   useEffect(() => {
-    const stored = localStorage.getItem('searchResults');
-    if (stored) {
-      setCompanies(JSON.parse(stored));
+    if (!search) {
+      const stored = localStorage.getItem('searchResults');
+      if (stored) {
+        setCompanies(JSON.parse(stored));
+      }
+      return undefined;
     }
-  }, []);
+
+    // Toon elk bedrijf zodra de backend het heeft verrijkt
+    const controller = new AbortController();
+    const received = [];
+    setCompanies([]);
+    setLoading(true);
+
+    streamSearch(
+      search,
+      (event) => {
+        if (event.type === 'start') {
+          setTotal(event.total);
+        } else if (event.type === 'company') {
+          received.push(event.company);
+          setCompanies([...received]);
+        } else if (event.type === 'error') {
+          setFeedback(`Fout: ${event.error}`);
+        }
+      },
+      controller.signal
+    )
+      .then(() => {
+        localStorage.setItem('searchResults', JSON.stringify(received));
+      })
+      .catch((error) => {
+        if (!controller.signal.aborted) {
+          setFeedback(error.message || 'Er ging iets fout bij het zoeken.');
+        }
+      })
+      .finally(() => {
+        if (!controller.signal.aborted) {
+          setLoading(false);
+        }
+      });
+
+    return () => controller.abort();
+  }, [search]);
 
   const handleContact = async (companyId, method) => {
     setFeedback('');
@@ -37,6 +82,17 @@ function ResultPage() {
     }
   };
 
+  if (loading && companies.length === 0) {
+    return (
+      <div className="max-w-3xl mx-auto mt-10 bg-white p-6 rounded shadow">
+        <h2 className="text-xl font-semibold text-gray-800">
+          Bezig met zoeken...
+        </h2>
+        <p className="mt-2 text-gray-600">De eerste bedrijven verschijnen zodra ze gevonden zijn.</p>
+      </div>
+    );
+  }
+
   if (!companies || companies.length === 0) {
     return (
       <div className="max-w-3xl mx-auto mt-10 bg-white p-6 rounded shadow">
@@ -54,6 +110,13 @@ function ResultPage() {
         Gevonden Bedrijven
       </h2>
 
+      {loading && (
+        <p className="mb-4 text-gray-600">
+          Bezig met zoeken... {companies.length}
+          {total !== null ? ` van ${total}` : ''} bedrijven gevonden
+        </p>
+      )}
+
       {feedback && (
         <div className="mb-4 p-3 bg-green-50 border border-green-200 text-green-700 rounded">
           {feedback}
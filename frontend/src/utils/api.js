@@ -1,14 +1,71 @@
 // ai-contact-finder/frontend/src/utils/api.js
 import axios from 'axios';
 
+const BASE_URL = 'http://localhost:5000'; // pas aan indien nodig
+
 const API = axios.create({
-  baseURL: 'http://localhost:5000', // pas aan indien nodig
+  baseURL: BASE_URL,
 });
 
-export const searchCompanies = async (payload) => {
+const POLL_INTERVAL_MS = 2000;
+
+const sleep = (ms) => new Promise((resolve) => setTimeout(resolve, ms));
+
+export const getSearchJob = async (jobId) => {
+  const response = await API.get(`/search/${jobId}`);
+  return response.data;
+};
+
+export const searchCompanies = async (payload, onProgress) => {
   // payload = { city, industry, company_types, areas }
   const response = await API.post('/search', payload);
-  return response.data;
+  const { job_id: jobId } = response.data;
+  if (!jobId) {
+    return response.data;
+  }
+
+  // Peil de zoekopdracht tot deze klaar of mislukt is
+  for (;;) {
+    const job = await getSearchJob(jobId);
+    if (job.status === 'completed' || job.status === 'failed') {
+      return job;
+    }
+    if (onProgress) {
+      onProgress(job);
+    }
+    await sleep(POLL_INTERVAL_MS);
+  }
+};
+
+export const streamSearch = async (payload, onEvent, signal) => {
+  // Leest de NDJSON-stream van /search/stream en roept onEvent per regel aan
+  const response = await fetch(`${BASE_URL}/search/stream`, {
+    method: 'POST',
+    headers: { 'Content-Type': 'application/json' },
+    body: JSON.stringify(payload),
+    signal,
+  });
+  if (!response.ok) {
+    const data = await response.json().catch(() => ({}));
+    throw new Error(data.error || 'Er ging iets fout bij het zoeken.');
+  }
+
+  const reader = response.body.getReader();
+  const decoder = new TextDecoder();
+  let buffer = '';
+  for (;;) {
+    const { done, value } = await reader.read();
+    if (done) {
+      break;
+    }
+    buffer += decoder.decode(value, { stream: true });
+    const lines = buffer.split('\n');
+    buffer = lines.pop();
+    lines.filter(Boolean).forEach((line) => onEvent(JSON.parse(line)));
+  }
+  if (buffer.trim()) {
+    onEvent(JSON.parse(buffer));
+  }
 };
 
 export const contactCompany = async (payload) => {
@@ -16,3 +73,28 @@ export const contactCompany = async (payload) => {
   const response = await API.post('/contact', payload);
   return response.data;
 };
+
+export const contactCompanies = async (payload) => {
+  // payload = { company_ids: [...], contact_methods: [...] }
+  const response = await API.post('/contact/bulk', payload);
+  return response.data;
+};
+
+export const getOutreachStatus = async (batchId) => {
+  const response = await API.get(`/contact/bulk/${batchId}`);
+  return response.data;
+};
+
+export const listCompanies = async (params) => {
+  // params = { city, industry, name, has: 'linkedin,twitter', fields, limit, after }
+  const response = await API.get('/companies', { params });
+  return response.data;
+};
+
+export const getExportUrl = (table, params = {}) => {
+  // table = 'companies' of 'contacts'; params = { format: 'csv' | 'ndjson' | 'parquet', fields, ...filters }
+  const query = new URLSearchParams(
+    Object.entries(params).filter(([, value]) => value !== undefined && value !== null && value !== ''),
+  );
+  return `${BASE_URL}/export/${table}?${query}`;
+};